@@ -0,0 +1,121 @@
+import os
+import sys
+import json
+import timeit
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import codec
+
+
+def get_mappings(field_number):
+    '''
+
+    large index mapping, with text and keyword multi-fields
+
+    '''
+
+    return {
+        'properties': {
+            'field_{}'.format(x): {
+                'type': 'text',
+                'fields': {'keyword': {'type': 'keyword', 'ignore_above': 256}}
+            } for x in range(field_number)
+        }
+    }
+
+
+def get_monitors(monitor_number):
+    '''
+
+    monitor search response, as returned by get_monitor
+
+    '''
+
+    return {
+        'took': 3,
+        'hits': {
+            'total': {'value': monitor_number, 'relation': 'eq'},
+            'hits': [{
+                '_index': '.opendistro-alerting-config',
+                '_id': 'monitor_{}'.format(x),
+                '_source': {
+                    'monitor': {
+                        'name': 'monitor_{}'.format(x),
+                        'monitor_type': 'query_level_monitor',
+                        'inputs': [{'search': {'indices': ['logs'], 'query': get_mappings(10)}}]
+                    }
+                }
+            } for x in range(monitor_number)]
+        }
+    }
+
+
+def get_destinations(destination_number):
+    '''
+
+    destination listing, as returned by _plugins/_alerting/destinations
+
+    '''
+
+    return {
+        'totalDestinations': destination_number,
+        'destinations': [{
+            'id': 'destination_{}'.format(x),
+            'name': 'destination_{}'.format(x),
+            'type': 'sns',
+            'sns': {
+                'topic_arn': 'arn:aws:sns:us-east-1:123456789012:topic_{}'.format(x),
+                'role_arn': 'arn:aws:iam::123456789012:role/role_{}'.format(x)
+            }
+        } for x in range(destination_number)]
+    }
+
+
+def get_timing(function, number):
+    return min(timeit.repeat(function, number=number, repeat=5)) / number * 1e6
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='benchmark json codec used by the helpers')
+    parser.add_argument('--number', type=int, default=50, help='iterations per measurement')
+    parser.add_argument('--fields', type=int, default=5000, help='mapping field number')
+    parser.add_argument('--monitors', type=int, default=500, help='monitor number')
+    parser.add_argument('--destinations', type=int, default=1000, help='destination number')
+    args = parser.parse_args(argv)
+
+    payloads = {
+        'mappings': get_mappings(args.fields),
+        'monitors': get_monitors(args.monitors),
+        'destinations': get_destinations(args.destinations)
+    }
+
+    print('codec: {}'.format(codec.CODEC))
+    print('{:<14} {:>8} {:>14} {:>14} {:>14} {:>14}'.format(
+        'payload', 'kB', 'json dumps us', 'codec dumps us', 'json loads us', 'codec loads us'
+    ))
+
+    for name, payload in payloads.items():
+        content = json.dumps(payload).encode('utf-8')
+        print('{:<14} {:>8.1f} {:>14.1f} {:>14.1f} {:>14.1f} {:>14.1f}'.format(
+            name,
+            len(content) / 1024,
+            get_timing(lambda: json.dumps(payload).encode('utf-8'), args.number),
+            get_timing(lambda: codec.dumps(payload), args.number),
+            get_timing(lambda: json.loads(content), args.number),
+            get_timing(lambda: codec.loads(content), args.number)
+        ))
+
+    #
+    # get_alert_destination: previously decoded the response twice
+    #
+    content = json.dumps(payloads['destinations']).encode('utf-8')
+    print('destination lookup: double json decode {:.1f}us, single codec decode {:.1f}us'.format(
+        get_timing(lambda: 'destinations' in json.loads(content) and json.loads(content)['destinations'], args.number),
+        get_timing(lambda: codec.loads(content)['destinations'], args.number)
+    ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,272 @@
+import os
+import sys
+import time
+import json
+import argparse
+import statistics
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from codec import dumps, loads, encode_path, HEADERS
+from transport import session
+from synthetic_data import get_documents, get_seconds
+from get_configuration import get_count
+from set_configuration import set_new_index, set_bulk, build_monitor_query
+from delete_configuration import delete_index, delete_document
+
+#
+# default mappings, resembling the application logs monitored by set_monitor
+#
+MAPPINGS = {
+    'properties': {
+        'timestamp': {'type': 'date', 'format': 'epoch_millis'},
+        'status': {'type': 'keyword'},
+        'service': {'type': 'keyword'},
+        'latency': {'type': 'long'},
+        'message': {'type': 'text'}
+    }
+}
+
+
+def get_total(endpoint, index):
+    return get_count(endpoint, None, index, refresh=True) or 0
+
+
+def get_search(endpoint, index, payload, repeat):
+    '''
+
+    execute search repeatedly, with the request cache disabled, so every
+    execution is measured as a scheduled monitor execution
+
+    @return, (median took ms, median client ms, window document count)
+
+    '''
+
+    path = encode_path('{}/_search'.format(index), request_cache=False, filter_path='took,hits.total')
+    payload = dict(payload, track_total_hits=True)
+    took, elapsed, hits = [], [], 0
+
+    for x in range(repeat):
+        start = time.perf_counter()
+        r = session.post('{}/{}'.format(endpoint, path), data=dumps(payload), headers=HEADERS)
+        elapsed.append((time.perf_counter() - start) * 1000)
+
+        if not r.ok:
+            print('Notice (get_search): on {} returned {}'.format(path, r.status_code))
+            return None
+
+        response = loads(r.content)
+        took.append(response['took'])
+        hits = response['hits']['total']['value']
+
+    return statistics.median(took), statistics.median(elapsed), hits
+
+
+def set_load(endpoint, index, mappings, number, end, span, cardinality, batch, workers, seed):
+    '''
+
+    bulk load synthetic documents, where at most 'workers' batches are in
+    flight, so the generator is not consumed ahead of the cluster
+
+    '''
+
+    documents = get_documents(
+        mappings,
+        number=number,
+        span=span,
+        end=end,
+        cardinality=cardinality,
+        seed=seed
+    )
+    pending = set()
+    failed = 0
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        while True:
+            documents_batch = list(islice(documents, batch))
+
+            if not documents_batch:
+                break
+
+            if len(pending) >= workers:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                failed += sum(1 for x in done if not x.result())
+
+            pending.add(executor.submit(set_bulk, endpoint, None, index, documents_batch))
+
+        failed += sum(1 for x in wait(pending)[0] if not x.result())
+
+    return failed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description='measure monitor query, and range delete latency against a local opensearch'
+    )
+    parser.add_argument('--endpoint', default='http://localhost:9200', help='unauthenticated opensearch endpoint')
+    parser.add_argument('--index', default='monitor_load', help='benchmark index (deleted on completion)')
+    parser.add_argument('--mappings', help='mappings (json), or mappings file (default application logs)')
+    parser.add_argument('--documents', type=int, nargs='+', default=[1000000, 10000000, 100000000], help='document totals measured')
+    parser.add_argument('--span', default='30d', help='time span of the documents')
+    parser.add_argument('--cardinality', type=int, default=100, help='distinct values per field')
+    parser.add_argument('--intervals', type=int, nargs='+', default=[1, 5, 15, 60], help='monitor schedule intervals (minutes)')
+    parser.add_argument('--monitor-windows', nargs='+', default=['5m', '1h', '1d'], help='monitor range windows (MonitorRangeFrom)')
+    parser.add_argument('--windows', nargs='+', default=['1h', '1d', '7d'], help='range delete windows')
+    parser.add_argument('--terms', default='{"status": ["status_0"]}', help='monitor query terms (json)')
+    parser.add_argument('--shards', type=int, default=1, help='primary shard number')
+    parser.add_argument('--batch', type=int, default=5000, help='documents per bulk request')
+    parser.add_argument('--workers', type=int, default=4, help='concurrent bulk requests')
+    parser.add_argument('--repeat', type=int, default=5, help='executions per monitor query')
+    parser.add_argument('--seed', type=int, default=0, help='random seed')
+    parser.add_argument('--keep', action='store_true', help='keep benchmark index')
+    args = parser.parse_args(argv)
+
+    if args.mappings and os.path.exists(args.mappings):
+        with open(args.mappings) as f:
+            mappings = json.load(f)
+
+    else:
+        mappings = json.loads(args.mappings) if args.mappings else MAPPINGS
+
+    date_field = next((x for x, y in mappings['properties'].items() if y.get('type') == 'date'), None)
+    span = get_seconds(args.span)
+    windows = sorted(args.windows, key=get_seconds)
+    monitor_windows = sorted(args.monitor_windows, key=get_seconds)
+
+    if not date_field:
+        print('Error: mappings require a top-level date field')
+        return 1
+
+    if sum(get_seconds(x) for x in windows) > span:
+        print('Error: range delete windows exceed --span {}'.format(args.span))
+        return 1
+
+    #
+    # documents, monitor, and delete windows are anchored to a fixed end, so
+    #     measurements do not drift while large totals are loaded
+    #
+    end = time.time()
+    set_new_index(args.endpoint, None, args.index, args.shards, 0, mappings)
+    monitors, deletes = [], []
+
+    try:
+        for number in sorted(args.documents):
+            count = get_total(args.endpoint, args.index)
+            start = time.perf_counter()
+            failed = set_load(
+                args.endpoint,
+                args.index,
+                mappings,
+                max(0, number - count),
+                end,
+                span,
+                args.cardinality,
+                args.batch,
+                args.workers,
+                args.seed + number
+            )
+            count = get_total(args.endpoint, args.index)
+            print('Notice: {} documents loaded in {:.1f}s ({} batches failed)'.format(
+                count,
+                time.perf_counter() - start,
+                failed
+            ))
+
+            #
+            # monitor query: measured per range window, since the query cost
+            #     does not depend on the schedule interval, which only sets the
+            #     number of executions per day (see the interval x window table)
+            #
+            for window in monitor_windows:
+                result = get_search(
+                    args.endpoint,
+                    args.index,
+                    build_monitor_query(
+                        post_date_field=date_field,
+                        post_date_from=str(int((end - get_seconds(window)) * 1000)),
+                        post_date_to=str(int(end * 1000)),
+                        monitor_query_terms=json.loads(args.terms)
+                    ),
+                    args.repeat
+                )
+
+                if result:
+                    monitors.append((count, window) + result)
+
+            #
+            # range delete: disjoint windows starting at the oldest document,
+            #     where the next total is topped up across the whole span
+            #
+            window_start = end - span
+
+            for window in windows:
+                window_end = window_start + get_seconds(window)
+                before = get_total(args.endpoint, args.index)
+                start = time.perf_counter()
+                delete_document(args.endpoint, None, args.index, {
+                    date_field: {
+                        'gte': int(window_start * 1000),
+                        'lt': int(window_end * 1000),
+                        'format': 'epoch_millis'
+                    }
+                })
+                seconds = time.perf_counter() - start
+                deletes.append((
+                    count,
+                    window,
+                    before - get_total(args.endpoint, args.index),
+                    seconds
+                ))
+                window_start = window_end
+
+    finally:
+        if not args.keep:
+            delete_index(args.endpoint, None, args.index)
+
+    print('\n{:>12} {:>10} {:>12} {:>10} {:>10}'.format(
+        'documents', 'window', 'window docs', 'took ms', 'client ms'
+    ))
+
+    for count, window, took, elapsed, hits in monitors:
+        print('{:>12} {:>10} {:>12} {:>10.1f} {:>10.1f}'.format(
+            count,
+            window,
+            hits,
+            took,
+            elapsed
+        ))
+
+    print('\n{:>12} {:>10} {:>10} {:>10} {:>14}'.format(
+        'documents', 'window', 'interval', 'runs/day', 'search s/day'
+    ))
+
+    for count, window, took, elapsed, hits in monitors:
+        for interval in args.intervals:
+            print('{:>12} {:>10} {:>9}m {:>10} {:>14.1f}'.format(
+                count,
+                window,
+                interval,
+                1440 // interval,
+                took * (1440 // interval) / 1000
+            ))
+
+    print('\n{:>12} {:>10} {:>12} {:>10} {:>14}'.format(
+        'documents', 'window', 'deleted', 'seconds', 'docs/s'
+    ))
+
+    for count, window, deleted, seconds in deletes:
+        print('{:>12} {:>10} {:>12} {:>10.2f} {:>14.0f}'.format(
+            count,
+            window,
+            deleted,
+            seconds,
+            deleted / seconds if seconds else 0
+        ))
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
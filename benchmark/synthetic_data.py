@@ -0,0 +1,184 @@
+import os
+import sys
+import json
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import codec
+
+#
+# duration units accepted by get_seconds (i.e. '30m', '12h', '7d')
+#
+UNITS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400, 'w': 604800}
+
+
+def get_seconds(duration):
+    '''
+
+    convert duration (i.e. '7d', or number of seconds) into seconds
+
+    '''
+
+    if isinstance(duration, (int, float)):
+        return duration
+
+    duration = duration.strip()
+
+    if duration[-1] in UNITS:
+        return float(duration[:-1]) * UNITS[duration[-1]]
+
+    return float(duration)
+
+
+def get_fields(mappings, prefix=''):
+    '''
+
+    flatten mapping properties into (field path, field type) pairs, where
+    object properties are traversed, and multi-fields (i.e. keyword) are
+    skipped, since they are derived from the parent field
+
+    '''
+
+    fields = []
+
+    for name, attributes in mappings.get('properties', {}).items():
+        path = '{}{}'.format(prefix, name)
+
+        if 'properties' in attributes:
+            fields.extend(get_fields(attributes, '{}.'.format(path)))
+
+        else:
+            fields.append((path, attributes.get('type', 'object')))
+
+    return fields
+
+
+def get_value(field, field_type, cardinality, rng):
+    '''
+
+    random value for specified field type, where keyword, text, and numeric
+    fields are drawn from 'cardinality' distinct values
+
+    '''
+
+    x = rng.randrange(cardinality)
+
+    if field_type in ('keyword', 'constant_keyword', 'wildcard'):
+        return '{}_{}'.format(field.split('.')[-1], x)
+
+    if field_type in ('text', 'match_only_text'):
+        return ' '.join('word_{}'.format(rng.randrange(cardinality)) for y in range(8))
+
+    if field_type in ('long', 'integer', 'short', 'byte', 'unsigned_long'):
+        return x
+
+    if field_type in ('float', 'double', 'half_float', 'scaled_float'):
+        return x + rng.random()
+
+    if field_type == 'boolean':
+        return bool(x % 2)
+
+    if field_type == 'ip':
+        return '10.{}.{}.{}'.format(x // 65536 % 256, x // 256 % 256, x % 256)
+
+    if field_type == 'geo_point':
+        return {'lat': rng.uniform(-90, 90), 'lon': rng.uniform(-180, 180)}
+
+    return '{}_{}'.format(field.split('.')[-1], x)
+
+
+def set_value(document, field, value):
+    keys = field.split('.')
+
+    for key in keys[:-1]:
+        document = document.setdefault(key, {})
+
+    document[keys[-1]] = value
+
+
+def get_documents(
+    mappings,
+    number=None,
+    rate=None,
+    span='1d',
+    end=None,
+    cardinality=100,
+    date_field=None,
+    seed=None
+):
+    '''
+
+    generate synthetic time-series documents matching specified mappings,
+    where date fields are epoch milliseconds within [end - span, end]
+
+    @number, number of documents, otherwise derived from 'rate' and 'span'
+    @rate, documents per second, when 'number' is not provided
+    @end, epoch seconds of the latest document (default now), where a fixed
+        'end' allows documents to be generated in multiple batches
+    @cardinality, distinct values per keyword, text, and numeric field
+    @date_field, time-series field (default first date field), where other
+        date fields are offset by up to one minute
+
+    '''
+
+    fields = get_fields(mappings)
+    span = get_seconds(span)
+    end = time.time() if end is None else end
+    number = int(number if number is not None else (rate or 1) * span)
+    rng = random.Random(seed)
+    date_fields = [x for x, y in fields if y in ('date', 'date_nanos')]
+    date_field = date_field or (date_fields[0] if date_fields else None)
+
+    for x in range(number):
+        document = {}
+        timestamp = end - rng.random() * span
+
+        for field, field_type in fields:
+            if field == date_field:
+                set_value(document, field, int(timestamp * 1000))
+
+            elif field_type in ('date', 'date_nanos'):
+                set_value(document, field, int((timestamp + rng.random() * 60) * 1000))
+
+            else:
+                set_value(document, field, get_value(field, field_type, cardinality, rng))
+
+        yield document
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='generate synthetic documents matching mappings, as ndjson')
+    parser.add_argument('mappings', help='mappings (json), or mappings file')
+    parser.add_argument('--number', type=int, help='number of documents')
+    parser.add_argument('--rate', type=float, default=1.0, help='documents per second, when --number is not provided')
+    parser.add_argument('--span', default='1d', help='time span of generated documents (i.e. 30m, 12h, 7d)')
+    parser.add_argument('--cardinality', type=int, default=100, help='distinct values per field')
+    parser.add_argument('--date-field', help='time-series field (default first date field)')
+    parser.add_argument('--seed', type=int, help='random seed')
+    args = parser.parse_args(argv)
+
+    if os.path.exists(args.mappings):
+        with open(args.mappings) as f:
+            mappings = json.load(f)
+
+    else:
+        mappings = json.loads(args.mappings)
+
+    for document in get_documents(
+        mappings,
+        number=args.number,
+        rate=args.rate,
+        span=args.span,
+        cardinality=args.cardinality,
+        date_field=args.date_field,
+        seed=args.seed
+    ):
+        sys.stdout.write(codec.dumps(document).decode('utf-8'))
+        sys.stdout.write('\n')
+
+
+if __name__ == '__main__':
+    main()
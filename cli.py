@@ -0,0 +1,311 @@
+import os
+import sys
+import json
+import time
+import pstats
+import argparse
+import cProfile
+import importlib
+from concurrent.futures import ThreadPoolExecutor
+from transport import (
+    set_recording,
+    set_replay,
+    set_fixture,
+    get_rate_metrics
+)
+
+
+def load_manifest(file_path):
+    '''
+
+    load event or manifest file (yaml or json), and return list of events
+
+    A single event contains 'ResourceProperties' (i.e. a CloudFormation or
+    EventBridge event). Otherwise, the manifest has the following structure,
+    where each resource inherits (and overrides) the shared properties:
+
+        {
+            'RequestType': 'Create',
+            'Properties': {
+                'OpenSearchDomain': 'https://...',
+                'Region': 'us-east-1'
+            },
+            'Resources': [{
+                'OpenSearchIndex': 'logs',
+                'Mappings': {'properties': {'timestamp': {'type': 'date'}}},
+                'DocumentDeleteRange': {'timestamp': {'lte': 'now-30d'}}
+            }]
+        }
+
+    '''
+
+    with open(file_path) as f:
+        if file_path.endswith(('.yaml', '.yml')):
+            try:
+                import yaml
+
+            except ImportError:
+                print('Error (load_manifest): pyyaml required for {}'.format(file_path))
+                return []
+
+            manifest = yaml.safe_load(f)
+
+        else:
+            manifest = json.load(f)
+
+    if 'ResourceProperties' in manifest:
+        return [manifest]
+
+    return [{
+        'RequestType': manifest.get('RequestType', 'Create'),
+        'ResourceProperties': dict(manifest.get('Properties', {}), **x)
+    } for x in manifest.get('Resources', [])]
+
+
+def set_properties(event, endpoint=None, region=None):
+    '''
+
+    encode event properties as strings, matching CloudFormation custom resource
+    properties, optionally overriding the endpoint and region
+
+    '''
+
+    properties = dict(event.get('ResourceProperties', {}))
+
+    if endpoint:
+        properties['OpenSearchDomain'] = endpoint
+
+    if region:
+        properties['Region'] = region
+
+    for k, v in properties.items():
+        if isinstance(v, (dict, list)):
+            properties[k] = json.dumps(v)
+
+        elif not isinstance(v, str):
+            properties[k] = str(v)
+
+    return dict(event, ResourceProperties=properties)
+
+
+def get_plan(event):
+    '''
+
+    list steps lambda_handler would execute for specified event, without
+    sending any request
+
+    '''
+
+    properties = event['ResourceProperties']
+    request_type = event.get('RequestType')
+    data_stream = properties.get('DataStream', '').lower() == 'true'
+    steps = []
+
+    if request_type not in ('Create', 'Update'):
+        return steps
+
+    if properties.get('IndexTemplatePatterns') or data_stream:
+        steps.append('set_index_template')
+
+    if data_stream:
+        steps.append('set_data_stream')
+
+        if properties.get('DataStreamRollover'):
+            steps.append('set_rollover')
+
+        if properties.get('DataStreamRetentionDays', '0') != '0':
+            steps.append('expire_data_stream')
+
+    elif properties.get('ReindexRemote') and request_type == 'Create':
+        steps.append('remap_index (remote)')
+
+    elif properties.get('Mappings') and request_type == 'Create':
+        steps.append('remap_index_job' if properties.get('RemapMode') == 'job' else 'remap_index')
+
+    if properties.get('InitalizeDashboard', '').lower() == 'true':
+        steps.extend(['set_index_pattern', 'set_dashboard'])
+
+    if properties.get('RollupInterval'):
+        steps.append('rollup_index')
+
+    if properties.get('SavedObjects'):
+        steps.append('set_saved_objects')
+
+    if properties.get('SavedObjectsFile'):
+        steps.append('set_saved_objects_import')
+
+    if all(properties.get(x) for x in ('SnsAlertName', 'SnsTopicArn', 'SnsRoleArn')):
+        steps.append('set_alert_destination')
+
+    if properties.get('DocumentDeleteRange'):
+        steps.append('delete_document')
+
+    if properties.get('ForceMergeSegments', '0') != '0':
+        steps.append('set_forcemerge')
+
+    if properties.get('ShrinkIndex'):
+        steps.append('shrink_index')
+
+    if properties.get('CleanupPattern'):
+        steps.append('cleanup_indices (dry run)' if properties.get('CleanupDryRun', '').lower() == 'true' else 'cleanup_indices')
+
+    if properties.get('MonitorName') and properties.get('SnsAlertName') and properties.get('OpenSearchIndex'):
+        if properties.get('MonitorPreflight'):
+            steps.append('check_monitor_cost')
+        steps.append('set_monitor')
+
+    if properties.get('Warmup', '').lower() == 'true' or properties.get('WarmupQueries'):
+        steps.append('warm_index')
+
+    if properties.get('MappingAdvisor', '').lower() == 'true':
+        steps.append('check_mapping')
+
+    #
+    # lease lock: acquired around remap, deletion, and monitor steps only
+    #
+    if properties.get('LockTtl', '300') != '0' and properties.get('OpenSearchIndex'):
+        steps = ['{} (locked)'.format(x) if x.startswith((
+            'remap_index',
+            'expire_data_stream',
+            'delete_document',
+            'set_monitor'
+        )) else x for x in steps]
+
+    return steps
+
+
+def run_event(handler, event, timings=False, profile=False):
+    '''
+
+    execute lambda_handler for specified event outside lambda, where no
+    context is provided, so long-running steps are not bound by a timeout
+
+    @profile, profile the execution, where each worker thread requires its
+        own profiler (see main)
+
+    '''
+
+    profiler = cProfile.Profile() if profile else None
+    start = time.perf_counter()
+
+    if profiler:
+        profiler.enable()
+
+    result = handler(event, None)
+
+    if profiler:
+        profiler.disable()
+
+    elapsed = time.perf_counter() - start
+
+    if timings:
+        print('Timing: {} completed in {:.3f}s'.format(
+            event['ResourceProperties'].get('OpenSearchIndex'),
+            elapsed
+        ))
+
+    return {
+        'index': event['ResourceProperties'].get('OpenSearchIndex'),
+        'result': result,
+        'seconds': elapsed,
+        'profiler': profiler
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description='configure opensearch cluster using an event or manifest file'
+    )
+    parser.add_argument('manifest', help='event or manifest file (yaml or json)')
+    parser.add_argument('--endpoint', help='override OpenSearchDomain (i.e. https://domain)')
+    parser.add_argument('--region', help='override Region, used for request signing')
+    parser.add_argument('--request-type', choices=['Create', 'Update', 'Delete'], help='override RequestType')
+    parser.add_argument('--concurrency', type=int, default=1, help='number of resources executed in parallel')
+    parser.add_argument('--plan', action='store_true', help='list steps per resource without executing')
+    parser.add_argument('--timings', action='store_true', help='report elapsed time per resource')
+    parser.add_argument('--profile', nargs='?', const='-', help='profile execution, optionally into a file')
+    parser.add_argument('--record', help='record sanitized requests and responses into fixture file')
+    parser.add_argument('--replay', help='serve requests from fixture file, without network access')
+    parser.add_argument('--latency-scale', type=float, default=1.0, help='replayed latency multiplier (0 disables)')
+    args = parser.parse_args(argv)
+
+    events = [set_properties(x, args.endpoint, args.region) for x in load_manifest(args.manifest)]
+
+    if args.request_type:
+        events = [dict(x, RequestType=args.request_type) for x in events]
+
+    if args.plan:
+        for x in events:
+            print('{} ({}): {}'.format(
+                x['ResourceProperties'].get('OpenSearchIndex'),
+                x.get('RequestType'),
+                ', '.join(get_plan(x)) or 'no steps'
+            ))
+        return 0
+
+    if args.region:
+        os.environ.setdefault('AWS_REGION', args.region)
+
+    #
+    # replayed requests are not verified, but signing requires credentials
+    #
+    if args.replay:
+        os.environ.setdefault('AWS_ACCESS_KEY_ID', 'replay')
+        os.environ.setdefault('AWS_SECRET_ACCESS_KEY', 'replay')
+
+    recording = set_recording() if args.record else None
+    replay = set_replay(args.replay, args.latency_scale) if args.replay else None
+    handler = importlib.import_module('lambda').lambda_handler
+    start = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=max(1, args.concurrency)) as executor:
+        results = list(executor.map(
+            lambda x: run_event(handler, x, args.timings, bool(args.profile)),
+            events
+        ))
+
+    profilers = [x.pop('profiler') for x in results]
+
+    if args.profile and profilers:
+        stats = pstats.Stats(*profilers)
+
+        if args.profile == '-':
+            stats.sort_stats('cumulative').print_stats(30)
+
+        else:
+            stats.dump_stats(args.profile)
+
+    if args.timings:
+        print('Timing: {} resources completed in {:.3f}s'.format(
+            len(results),
+            time.perf_counter() - start
+        ))
+
+    if args.timings:
+        for key, metrics in get_rate_metrics().items():
+            print('Timing: {} rate limited {} requests, queue wait {:.3f}s (max {:.3f}s)'.format(
+                key,
+                metrics['requests'],
+                metrics['wait'],
+                metrics['max_wait']
+            ))
+
+    if recording:
+        print('Notice: {} requests recorded into {}'.format(
+            set_fixture(recording, args.record),
+            args.record
+        ))
+
+    if replay:
+        print('Notice: {} requests replayed, {} not recorded'.format(
+            replay.requests,
+            replay.misses
+        ))
+
+    print('Notice: overall results {}'.format(results))
+
+    return 0 if all(x['result'] is not False for x in results) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
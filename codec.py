@@ -0,0 +1,73 @@
+import os
+import json
+
+try:
+    import orjson
+
+except ImportError:
+    orjson = None
+
+
+#
+# json codec: orjson when available, unless JsonCodec=json is specified
+#
+CODEC = 'orjson' if orjson and os.getenv('JsonCodec', 'orjson').strip() == 'orjson' else 'json'
+
+
+def dumps(obj):
+    '''
+
+    serialize request body, where already serialized bodies (str or bytes)
+    are returned unchanged, so payloads can be serialized once and reused
+
+    '''
+
+    if isinstance(obj, (bytes, str)):
+        return obj
+
+    if CODEC == 'orjson':
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+
+    return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+
+
+def loads(data):
+    '''
+
+    deserialize response body (i.e. r.content), once per response
+
+    '''
+
+    if CODEC == 'orjson':
+        return orjson.loads(data)
+
+    return json.loads(data)
+
+
+def encode_path(path, **params):
+    '''
+
+    append query parameters to request path, where None parameters are
+    skipped, lists are comma separated, and booleans are lowercase
+
+        encode_path('logs/_doc/1', _source_includes=['status'], refresh=True)
+        'logs/_doc/1?_source_includes=status&refresh=true'
+
+    '''
+
+    query = '&'.join('{}={}'.format(
+        k,
+        ','.join(v) if isinstance(v, (list, tuple)) else str(v).lower() if isinstance(v, bool) else v
+    ) for k, v in params.items() if v is not None)
+
+    if not query:
+        return path
+
+    return '{}{}{}'.format(path, '&' if '?' in path else '?', query)
+
+
+#
+# default request headers: parsed once, shared by every helper
+#
+HEADERS = loads(os.getenv('Headers', '{"Content-Type": "application/json"}').strip())
+DASHBOARD_HEADERS = loads(os.getenv('Headers', '{"Content-Type": "application/json", "osd-xsrf": "true"}').strip())
@@ -1,13 +1,16 @@
-import os
-import json
-import requests
+from transport import session
+from codec import (
+    dumps,
+    encode_path,
+    HEADERS
+)
 
 
 def delete_index(
     endpoint,
     awsauth,
     index_name,
-    headers=json.loads(os.getenv('Headers', '{"Content-Type": "application/json"}').strip())
+    headers=HEADERS
 ):
     '''
 
@@ -16,7 +19,7 @@ def delete_index(
     '''
 
     try:
-        r = requests.delete(
+        r = session.delete(
             '{}/{}'.format(endpoint, index_name),
             auth=awsauth,
             headers=headers
@@ -38,12 +41,65 @@ def delete_index(
     return False
 
 
+def delete_indices(
+    endpoint,
+    awsauth,
+    indices,
+    batch_size=20,
+    headers=HEADERS
+):
+    '''
+
+    delete list of indices, using one request per batch of comma separated
+    index names, where wildcards are not expanded
+
+    @batch_size, maximum index names per request (limits the url length)
+
+    '''
+
+    if not indices or any('*' in x for x in indices):
+        print('Error (delete_indices): explicit index names must be provided')
+        return False
+
+    results = []
+
+    for x in range(0, len(indices), batch_size):
+        path = encode_path(
+            ','.join(indices[x:x + batch_size]),
+            expand_wildcards='none'
+        )
+
+        try:
+            r = session.delete(
+                '{}/{}'.format(endpoint, path),
+                auth=awsauth,
+                headers=headers
+            )
+
+            if r.ok:
+                print('Notice: {} indices deleted'.format(indices[x:x + batch_size]))
+
+            else:
+                print('Notice (delete_indices): on {} returned {}'.format(
+                    path,
+                    r.status_code
+                ))
+
+            results.append(r.ok)
+
+        except Exception as e:
+            print('Error (delete_indices): {}'.format(e))
+            results.append(False)
+
+    return all(results)
+
+
 def delete_document(
     endpoint,
     awsauth,
     index_name,
     index_range,
-    headers=json.loads(os.getenv('Headers', '{"Content-Type": "application/json"}').strip())
+    headers=HEADERS
 ):
     '''
 
@@ -68,10 +124,10 @@ def delete_document(
         return False
 
     try:
-        r = requests.post(
+        r = session.post(
             '{}/{}'.format(endpoint, path),
             auth=awsauth,
-            json=payload,
+            data=dumps(payload),
             headers=headers
         )
 
@@ -92,3 +148,373 @@ def delete_document(
         return False
 
     return False
+
+
+def delete_document_id(
+    endpoint,
+    awsauth,
+    index_name,
+    document_id,
+    if_seq_no=None,
+    if_primary_term=None,
+    refresh=False,
+    headers=HEADERS
+):
+    '''
+
+    delete single document by id
+
+    @if_seq_no, with if_primary_term, fails (409) unless the document was not
+        modified since it was read
+
+    '''
+
+    params = ['refresh=true'] if refresh else []
+
+    if if_seq_no is not None and if_primary_term is not None:
+        params.append('if_seq_no={}&if_primary_term={}'.format(if_seq_no, if_primary_term))
+
+    path = '{}/_doc/{}{}'.format(
+        index_name,
+        document_id,
+        '?{}'.format('&'.join(params)) if params else ''
+    )
+
+    try:
+        r = session.delete(
+            '{}/{}'.format(endpoint, path),
+            auth=awsauth,
+            headers=headers
+        )
+
+        if r.ok:
+            return True
+
+        print('Notice (delete_document_id): on {} returned {}'.format(
+            path,
+            r.status_code
+        ))
+
+    except Exception as e:
+        print('Error (delete_document_id): {}'.format(e))
+        return False
+
+    return False
+
+
+def delete_index_template(
+    endpoint,
+    awsauth,
+    template_name,
+    headers=HEADERS
+):
+    '''
+
+    delete specified composable index template
+
+    '''
+
+    path = '_index_template/{}'.format(template_name)
+
+    try:
+        r = session.delete(
+            '{}/{}'.format(endpoint, path),
+            auth=awsauth,
+            headers=headers
+        )
+
+        if r.ok:
+            print('Notice: {} index template deleted'.format(template_name))
+            return True
+
+        print('Notice (delete_index_template): on {} returned {}'.format(
+            path,
+            r.status_code
+        ))
+
+    except Exception as e:
+        print('Error (delete_index_template): {}'.format(e))
+        return False
+
+    return False
+
+
+def delete_component_template(
+    endpoint,
+    awsauth,
+    template_name,
+    headers=HEADERS
+):
+    '''
+
+    delete specified component template
+
+    Note: a component template referenced by an index template 'composed_of'
+          cannot be deleted until the index template is deleted
+
+    '''
+
+    path = '_component_template/{}'.format(template_name)
+
+    try:
+        r = session.delete(
+            '{}/{}'.format(endpoint, path),
+            auth=awsauth,
+            headers=headers
+        )
+
+        if r.ok:
+            print('Notice: {} component template deleted'.format(template_name))
+            return True
+
+        print('Notice (delete_component_template): on {} returned {}'.format(
+            path,
+            r.status_code
+        ))
+
+    except Exception as e:
+        print('Error (delete_component_template): {}'.format(e))
+        return False
+
+    return False
+
+
+def delete_notification_channel(
+    endpoint,
+    awsauth,
+    channel_id,
+    headers=HEADERS
+):
+    '''
+
+    delete specified notification channel (notifications plugin)
+
+    '''
+
+    path = '_plugins/_notifications/configs/{}'.format(channel_id)
+
+    try:
+        r = session.delete(
+            '{}/{}'.format(endpoint, path),
+            auth=awsauth,
+            headers=headers
+        )
+
+        if r.ok:
+            print('Notice: {} notification channel deleted'.format(channel_id))
+            return True
+
+        print('Notice (delete_notification_channel): on {} returned {}'.format(
+            path,
+            r.status_code
+        ))
+
+    except Exception as e:
+        print('Error (delete_notification_channel): {}'.format(e))
+        return False
+
+    return False
+
+
+def delete_data_stream(
+    endpoint,
+    awsauth,
+    data_stream_name,
+    headers=HEADERS
+):
+    '''
+
+    delete data stream, including every backing index
+
+    '''
+
+    if not data_stream_name:
+        print('Error (delete_data_stream): data_stream_name must be provided')
+        return False
+
+    path = '_data_stream/{}'.format(data_stream_name)
+
+    try:
+        r = session.delete(
+            '{}/{}'.format(endpoint, path),
+            auth=awsauth,
+            headers=headers
+        )
+
+        if r.ok:
+            print('Notice: {} data stream deleted'.format(data_stream_name))
+            return True
+
+        print('Notice (delete_data_stream): on {} returned {}'.format(
+            path,
+            r.status_code
+        ))
+
+    except Exception as e:
+        print('Error (delete_data_stream): {}'.format(e))
+        return False
+
+    return False
+
+
+def delete_monitor(
+    endpoint,
+    awsauth,
+    monitor_id,
+    headers=HEADERS
+):
+    '''
+
+    delete alerting monitor (i.e. before recreating it with another type)
+
+    '''
+
+    if not monitor_id:
+        print('Error (delete_monitor): monitor_id must be provided')
+        return False
+
+    path = '_plugins/_alerting/monitors/{}'.format(monitor_id)
+
+    try:
+        r = session.delete(
+            '{}/{}'.format(endpoint, path),
+            auth=awsauth,
+            headers=headers
+        )
+
+        if r.ok:
+            print('Notice: {} monitor deleted'.format(monitor_id))
+            return True
+
+        print('Notice (delete_monitor): on {} returned {}'.format(
+            path,
+            r.status_code
+        ))
+
+    except Exception as e:
+        print('Error (delete_monitor): {}'.format(e))
+        return False
+
+    return False
+
+
+def delete_rollup_job(
+    endpoint,
+    awsauth,
+    rollup_id,
+    headers=HEADERS
+):
+    '''
+
+    delete rollup job, where the summary index is kept
+
+    '''
+
+    if not rollup_id:
+        print('Error (delete_rollup_job): rollup_id must be provided')
+        return False
+
+    path = '_plugins/_rollup/jobs/{}'.format(rollup_id)
+
+    try:
+        r = session.delete(
+            '{}/{}'.format(endpoint, path),
+            auth=awsauth,
+            headers=headers
+        )
+
+        if r.ok:
+            print('Notice: {} rollup job deleted'.format(rollup_id))
+            return True
+
+        print('Notice (delete_rollup_job): on {} returned {}'.format(
+            path,
+            r.status_code
+        ))
+
+    except Exception as e:
+        print('Error (delete_rollup_job): {}'.format(e))
+        return False
+
+    return False
+
+
+def delete_transform_job(
+    endpoint,
+    awsauth,
+    transform_id,
+    headers=HEADERS
+):
+    '''
+
+    delete transform job, where the summary index is kept
+
+    '''
+
+    if not transform_id:
+        print('Error (delete_transform_job): transform_id must be provided')
+        return False
+
+    path = '_plugins/_transform/{}'.format(transform_id)
+
+    try:
+        r = session.delete(
+            '{}/{}'.format(endpoint, path),
+            auth=awsauth,
+            headers=headers
+        )
+
+        if r.ok:
+            print('Notice: {} transform job deleted'.format(transform_id))
+            return True
+
+        print('Notice (delete_transform_job): on {} returned {}'.format(
+            path,
+            r.status_code
+        ))
+
+    except Exception as e:
+        print('Error (delete_transform_job): {}'.format(e))
+        return False
+
+    return False
+
+
+def delete_async_search(
+    endpoint,
+    awsauth,
+    search_id,
+    headers=HEADERS
+):
+    '''
+
+    delete asynchronous search, cancelling it if still running
+
+    '''
+
+    if not search_id:
+        print('Error (delete_async_search): search_id must be provided')
+        return False
+
+    path = '_plugins/_asynchronous_search/{}'.format(search_id)
+
+    try:
+        r = session.delete(
+            '{}/{}'.format(endpoint, path),
+            auth=awsauth,
+            headers=headers
+        )
+
+        if r.ok:
+            return True
+
+        print('Notice (delete_async_search): on {} returned {}'.format(
+            path,
+            r.status_code
+        ))
+
+    except Exception as e:
+        print('Error (delete_async_search): {}'.format(e))
+        return False
+
+    return False
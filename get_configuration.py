@@ -1,32 +1,39 @@
-import os
-import json
-import requests
+from urllib.parse import quote
+from transport import session
+from codec import (
+    dumps,
+    encode_path,
+    loads,
+    HEADERS,
+    DASHBOARD_HEADERS
+)
 
 
 def get_indices(
     endpoint,
     awsauth,
     filter_header='',
-    headers=json.loads(os.getenv('Headers', '{"Content-Type": "application/json"}').strip())
+    headers=HEADERS,
+    index=''
 ):
     '''
 
     get list of indices in the opensearch cluster
 
     @filter_header, headers in the index (i.e. index,docs.count)
+    @index, restrict listing to specified index, or pattern
 
     '''
 
     if filter_header:
         filter_header = '?v&h={}'.format(filter_header)
 
-    path = '_cat/indices{}'.format(filter_header)
+    path = '_cat/indices{}{}'.format('/{}'.format(index) if index else '', filter_header)
 
     try:
-        r = requests.get(
+        r = session.get(
             '{}/{}'.format(endpoint, path),
             auth=awsauth,
-            json={},
             headers=headers
         )
 
@@ -43,210 +50,1293 @@ def get_indices(
         return None
 
 
-def get_document_count(endpoint, awsauth, index, filter_header=''):
+def get_resolve_index(
+    endpoint,
+    awsauth,
+    pattern,
+    expand_wildcards=None,
+    headers=HEADERS
+):
     '''
 
-    check opensearch index document count
+    resolve index names, aliases, and data streams matching pattern, where
+    data stream backing indices list their 'data_stream'
+
+    @pattern, comma separated names, or wildcard expressions (i.e. *_temporary)
+    @expand_wildcards, i.e. 'open', 'all' (default 'open')
 
     '''
 
-    r = get_indices(endpoint, awsauth, filter_header)
-    found_index = None
+    if not pattern:
+        print('Error (get_resolve_index): pattern not provided')
+        return None
 
-    if not index:
-        print('Error (get_document_count): index not provided')
-        return False
+    path = encode_path('_resolve/index/{}'.format(pattern), expand_wildcards=expand_wildcards)
 
     try:
-        for x in r:
-            row = x.split()
-            found_index = row[1] if row[0].decode('utf-8') == index else None
-            if found_index:
-                return found_index
+        r = session.get(
+            '{}/{}'.format(endpoint, path),
+            auth=awsauth,
+            headers=headers
+        )
 
-    except TypeError as e:
-        print('Error (get_document_count): get_indices not iterable -- {}'.format(e))
+        if r.ok:
+            return loads(r.content)
 
-    return False
+        print('Notice (get_resolve_index): on {} returned {}'.format(
+            path,
+            r.status_code
+        ))
+
+    except Exception as e:
+        print('Error (get_resolve_index): {}'.format(e))
+
+    return None
 
 
-def get_alert_destination(
+def get_nodes(
     endpoint,
     awsauth,
-    sns_alert_name=None,
-    headers=json.loads(os.getenv('Headers', '{"Content-Type": "application/json"}').strip())
+    filter_header='',
+    headers=HEADERS
 ):
     '''
 
-    get sns alerting destination
+    get list of nodes in the opensearch cluster
+
+    @filter_header, headers in the node (i.e. name,node.role)
 
     '''
 
-    path = '_plugins/_alerting/destinations'
+    if filter_header:
+        filter_header = '?h={}'.format(filter_header)
+
+    path = '_cat/nodes{}'.format(filter_header)
 
     try:
-        r = requests.get(
+        r = session.get(
             '{}/{}'.format(endpoint, path),
             auth=awsauth,
-            json={},
             headers=headers
         )
 
-        print('Notice (get_alert_destination): on {} returned {}'.format(
+        print('Notice (get_nodes): on {} returned {}'.format(
             path,
             r.status_code
         ))
 
+        if r.ok:
+            return r.content.splitlines()
+
     except Exception as e:
-        print('Error (get_alert_destination): {}'.format(e))
-        return None
+        print('Error (get_nodes): {}'.format(e))
 
-    if r.ok and 'destinations' in r.json():
-        destinations = r.json()['destinations']
+    return None
 
-        if sns_alert_name:
-            id = next((x['id'] for x in destinations if x['name'] == sns_alert_name), None)
 
-        else:
-            print('Error: sns_alert_name not provided')
-            return None
+def get_index_stats(
+    endpoint,
+    awsauth,
+    index,
+    metrics='docs,store',
+    filter_path=None,
+    fields=None,
+    headers=HEADERS
+):
+    '''
 
-        if id:
-            return id
+    get index statistics (i.e. primary store size, and document count)
+
+    @metrics, comma separated index stats metrics (i.e. docs,store,segments)
+    @filter_path, limit response to specified paths (i.e. '_all.primaries')
+    @fields, fields reported by the fielddata, and completion metrics (i.e. '*')
+
+    '''
+
+    if index:
+        path = encode_path('{}/_stats/{}'.format(index, metrics), filter_path=filter_path, fields=fields)
 
     else:
-        print('Notice: no destination found')
+        print('Error (get_index_stats): index not provided')
+        return None
+
+    try:
+        r = session.get(
+            '{}/{}'.format(endpoint, path),
+            auth=awsauth,
+            headers=headers
+        )
+
+        if r.ok:
+            return loads(r.content)
+
+        print('Notice (get_index_stats): on {} returned {}'.format(
+            path,
+            r.status_code
+        ))
+
+    except Exception as e:
+        print('Error (get_index_stats): {}'.format(e))
 
     return None
 
 
-def get_index_pattern(
+def get_mapping(endpoint, awsauth, index, filter_path=None, headers=HEADERS):
+    '''
+
+    get index mappings, keyed by concrete index name (i.e. when 'index' is
+    an alias, or a pattern)
+
+    @filter_path, limit response to specified paths (i.e. '*.mappings.properties')
+
+    '''
+
+    if not index:
+        print('Error (get_mapping): index not provided')
+        return None
+
+    path = encode_path('{}/_mapping'.format(index), filter_path=filter_path)
+
+    try:
+        r = session.get(
+            '{}/{}'.format(endpoint, path),
+            auth=awsauth,
+            headers=headers
+        )
+
+        if r.ok:
+            return loads(r.content)
+
+        print('Notice (get_mapping): on {} returned {}'.format(
+            path,
+            r.status_code
+        ))
+
+    except Exception as e:
+        print('Error (get_mapping): {}'.format(e))
+
+    return None
+
+
+def get_index_settings(
     endpoint,
     awsauth,
-    index_id=None,
-    title=None,
-    headers=json.loads(os.getenv('Headers', '{"Content-Type": "application/json", "osd-xsrf": "true"}').strip())
+    index,
+    name=None,
+    include_defaults=False,
+    headers=HEADERS
 ):
     '''
 
-    get index patterns
+    get flat index settings, keyed by concrete index name
+
+    @name, comma separated setting names, or wildcards (i.e. 'index.codec')
+    @include_defaults, include settings not explicitly set (i.e. the default
+        'index.codec')
 
     '''
 
-    if index_id and title:
-        path = '_dashboards/api/saved_objects/index-pattern/{}'.format(index_id)
+    if not index:
+        print('Error (get_index_settings): index not provided')
+        return None
 
-    else:
-        print('Error (get_index_pattern): path not configured')
-        return False
+    path = encode_path(
+        '{}/_settings{}'.format(index, '/{}'.format(name) if name else ''),
+        flat_settings=True,
+        include_defaults=include_defaults or None
+    )
 
     try:
-        r = requests.get(
+        r = session.get(
             '{}/{}'.format(endpoint, path),
             auth=awsauth,
             headers=headers
         )
 
-        print('Notice (get_index_pattern): on {} returned {}'.format(
+        if r.ok:
+            return loads(r.content)
+
+        print('Notice (get_index_settings): on {} returned {}'.format(
             path,
             r.status_code
         ))
 
     except Exception as e:
-        print('Error (get_index_pattern): {}'.format(e))
+        print('Error (get_index_settings): {}'.format(e))
+
+    return None
+
+
+def get_field_usage_stats(endpoint, awsauth, index, filter_path=None, headers=HEADERS):
+    '''
+
+    get per shard field usage statistics (i.e. inverted index, doc values, and
+    norms accesses) since the shards were started
+
+    @filter_path, limit response to specified paths (i.e. '*.shards.stats.fields')
+    @return, response, or None where the api is not available (i.e. not
+        provided by the cluster version)
+
+    '''
+
+    if not index:
+        print('Error (get_field_usage_stats): index not provided')
         return None
 
-    if r.ok:
-        return r.json()
+    path = encode_path('{}/_field_usage_stats'.format(index), filter_path=filter_path)
 
-    else:
-        print('Notice: no index pattern found')
+    try:
+        r = session.get(
+            '{}/{}'.format(endpoint, path),
+            auth=awsauth,
+            headers=headers
+        )
+
+        if r.ok:
+            return loads(r.content)
+
+        print('Notice (get_field_usage_stats): on {} returned {}'.format(
+            path,
+            r.status_code
+        ))
+
+    except Exception as e:
+        print('Error (get_field_usage_stats): {}'.format(e))
 
     return None
 
 
-def get_dashboard(
+def get_document_count(endpoint, awsauth, index, filter_header=''):
+    '''
+
+    check opensearch index document count
+
+    '''
+
+    r = get_indices(endpoint, awsauth, filter_header, index=index)
+    found_index = None
+
+    if not index:
+        print('Error (get_document_count): index not provided')
+        return False
+
+    try:
+        for x in r:
+            row = x.split()
+            found_index = row[1] if row[0].decode('utf-8') == index else None
+            if found_index:
+                return found_index
+
+    except TypeError as e:
+        print('Error (get_document_count): get_indices not iterable -- {}'.format(e))
+
+    return False
+
+
+def get_count(
     endpoint,
     awsauth,
-    title=None,
-    headers=json.loads(os.getenv('Headers', '{"Content-Type": "application/json", "osd-xsrf": "true"}').strip())
+    index,
+    query=None,
+    refresh=False,
+    headers=HEADERS
 ):
     '''
 
-    get opensearch dashboard
+    count documents using the _count api, where nested documents are not
+    counted (unlike the _cat/indices 'docs.count')
+
+    @query, optional query clause, only matching documents are counted
+    @refresh, refresh the index before counting, so recently indexed (i.e.
+        reindexed) documents are counted
+    @return, document count (integer), or None if the index does not exist
+        or the request failed
 
     '''
 
-    if title:
-        path = '_dashboards/api/saved_objects/dashboard/{}'.format(title)
+    if not index:
+        print('Error (get_count): index not provided')
+        return None
 
-    else:
-        print('Error (get_dashboard): path not configured')
-        return False
+    path = encode_path('{}/_count'.format(index), filter_path='count')
 
     try:
-        r = requests.get(
+        if refresh:
+            session.post(
+                '{}/{}/_refresh'.format(endpoint, index),
+                auth=awsauth,
+                headers=headers
+            )
+
+        r = session.post(
             '{}/{}'.format(endpoint, path),
             auth=awsauth,
+            data=dumps({'query': query}) if query else None,
             headers=headers
         )
 
         if r.ok:
-            return r.json()
+            return int(loads(r.content)['count'])
 
-        print('Notice (get_dashboard): on {} returned {}'.format(
+        print('Notice (get_count): on {} returned {}'.format(
             path,
             r.status_code
         ))
 
     except Exception as e:
-        print('Error (get_dashboard): {}'.format(e))
+        print('Error (get_count): {}'.format(e))
+
+    return None
+
+
+def get_index_exists(endpoint, awsauth, index, headers=HEADERS):
+    '''
+
+    check index existence using a HEAD request, where only a 404 response is
+    treated as a missing index
+
+    @return, True if the index exists, False if not found, or None if the
+        request failed (i.e. throttled, or unavailable)
+
+    '''
+
+    if not index:
+        print('Error (get_index_exists): index not provided')
         return None
 
-    if r.ok:
-        return r.json()
+    try:
+        r = session.head(
+            '{}/{}'.format(endpoint, index),
+            auth=awsauth,
+            headers=headers
+        )
 
-    else:
-        print('Notice: no dashboard found')
+        if r.ok:
+            return True
+
+        if r.status_code == 404:
+            return False
+
+        print('Notice (get_index_exists): on {} returned {}'.format(
+            index,
+            r.status_code
+        ))
+
+    except Exception as e:
+        print('Error (get_index_exists): {}'.format(e))
 
     return None
 
 
-def get_monitor(
+def get_alert_destination(
     endpoint,
     awsauth,
-    monitor_name,
-    headers=json.loads(os.getenv('Headers', '{"Content-Type": "application/json"}').strip())
+    sns_alert_name=None,
+    size=20,
+    filter_path='totalDestinations,destinations.id,destinations.name',
+    headers=HEADERS
 ):
     '''
 
-    get monitor by name
+    get sns alerting destination, where destinations are filtered server-side
+    by name, and paginated until an exact name match is found
+
+    @size, number of destinations returned per page
+    @filter_path, limit response to specified paths, by default only the
+        attributes required to match the destination name
 
     '''
 
-    path = '_plugins/_alerting/monitors/_search'
+    if not sns_alert_name:
+        print('Error: sns_alert_name not provided')
+        return None
+
+    start_index = 0
+
+    while True:
+        path = encode_path(
+            '_plugins/_alerting/destinations',
+            searchString=quote(sns_alert_name),
+            size=size,
+            startIndex=start_index,
+            filter_path=filter_path
+        )
 
-    if monitor_name:
         try:
-            r = requests.get(
+            r = session.get(
                 '{}/{}'.format(endpoint, path),
                 auth=awsauth,
-                json={ 'query': { 'match' : { 'monitor.name': monitor_name } } },
                 headers=headers
             )
 
-            if r.ok:
-                return r.json()
-
-            print('Notice (get_monitor): on {} returned {}'.format(
+            print('Notice (get_alert_destination): on {} returned {}'.format(
                 path,
                 r.status_code
             ))
 
         except Exception as e:
-            print('Error (get_monitor): {}'.format(e))
+            print('Error (get_alert_destination): {}'.format(e))
             return None
 
-    else:
-        print('Error (get_monitor): monitor_name not provided')
+        result = loads(r.content) if r.ok else {}
+        destinations = result.get('destinations', [])
+        id = next((x['id'] for x in destinations if x['name'] == sns_alert_name), None)
+
+        if id:
+            return id
+
+        start_index += size
+
+        if not destinations or start_index >= result.get('totalDestinations', 0):
+            break
+
+    print('Notice: no destination found')
+
+    return None
+
+
+def get_notification_channel(
+    endpoint,
+    awsauth,
+    channel_name=None,
+    config_type='sns',
+    size=20,
+    filter_path='total_hits,config_list.config_id,config_list.config.name',
+    headers=HEADERS
+):
+    '''
+
+    get notification channel id (notifications plugin), where channels are
+    filtered server-side by name and type, and paginated until an exact name
+    match is found
+
+    @size, number of channels returned per page
+    @filter_path, limit response to specified paths, by default only the
+        attributes required to match the channel name
+
+    '''
+
+    if not channel_name:
+        print('Error (get_notification_channel): channel_name not provided')
         return None
+
+    from_index = 0
+
+    while True:
+        path = encode_path(
+            '_plugins/_notifications/configs',
+            name=quote(channel_name),
+            config_type=config_type,
+            max_items=size,
+            from_index=from_index,
+            filter_path=filter_path
+        )
+
+        try:
+            r = session.get(
+                '{}/{}'.format(endpoint, path),
+                auth=awsauth,
+                headers=headers
+            )
+
+            print('Notice (get_notification_channel): on {} returned {}'.format(
+                path,
+                r.status_code
+            ))
+
+        except Exception as e:
+            print('Error (get_notification_channel): {}'.format(e))
+            return None
+
+        result = loads(r.content) if r.ok else {}
+        configs = result.get('config_list', [])
+        id = next((
+            x['config_id'] for x in configs if x.get('config', {}).get('name') == channel_name
+        ), None)
+
+        if id:
+            return id
+
+        from_index += size
+
+        if not configs or from_index >= result.get('total_hits', 0):
+            break
+
+    print('Notice: no notification channel found')
+
+    return None
+
+
+def get_index_pattern(
+    endpoint,
+    awsauth,
+    index_id=None,
+    title=None,
+    fields=None,
+    headers=DASHBOARD_HEADERS
+):
+    '''
+
+    get index patterns
+
+    @fields, limit returned attributes (i.e. ['title']), using _bulk_get since
+        the single saved object api returns every attribute
+
+    '''
+
+    if index_id and title and fields is not None:
+        r = get_saved_objects(
+            endpoint,
+            awsauth,
+            [{'type': 'index-pattern', 'id': index_id, 'fields': fields}],
+            headers=headers
+        )
+
+        return r[0] if r and 'error' not in r[0] else None
+
+    elif index_id and title:
+        path = '_dashboards/api/saved_objects/index-pattern/{}'.format(index_id)
+
+    else:
+        print('Error (get_index_pattern): path not configured')
+        return False
+
+    try:
+        r = session.get(
+            '{}/{}'.format(endpoint, path),
+            auth=awsauth,
+            headers=headers
+        )
+
+        print('Notice (get_index_pattern): on {} returned {}'.format(
+            path,
+            r.status_code
+        ))
+
+    except Exception as e:
+        print('Error (get_index_pattern): {}'.format(e))
+        return None
+
+    if r.ok:
+        return loads(r.content)
+
+    else:
+        print('Notice: no index pattern found')
+
+    return None
+
+
+def get_dashboard(
+    endpoint,
+    awsauth,
+    title=None,
+    fields=None,
+    headers=DASHBOARD_HEADERS
+):
+    '''
+
+    get opensearch dashboard
+
+    @fields, limit returned attributes (i.e. ['title']), using _bulk_get since
+        the single saved object api returns every attribute
+
+    '''
+
+    if title and fields is not None:
+        r = get_saved_objects(
+            endpoint,
+            awsauth,
+            [{'type': 'dashboard', 'id': title, 'fields': fields}],
+            headers=headers
+        )
+
+        return r[0] if r and 'error' not in r[0] else None
+
+    elif title:
+        path = '_dashboards/api/saved_objects/dashboard/{}'.format(title)
+
+    else:
+        print('Error (get_dashboard): path not configured')
+        return False
+
+    try:
+        r = session.get(
+            '{}/{}'.format(endpoint, path),
+            auth=awsauth,
+            headers=headers
+        )
+
+        if r.ok:
+            return loads(r.content)
+
+        print('Notice (get_dashboard): on {} returned {}'.format(
+            path,
+            r.status_code
+        ))
+
+    except Exception as e:
+        print('Error (get_dashboard): {}'.format(e))
+        return None
+
+    if r.ok:
+        return loads(r.content)
+
+    else:
+        print('Notice: no dashboard found')
+
+    return None
+
+
+def get_monitor(
+    endpoint,
+    awsauth,
+    monitor_name,
+    monitor_type=None,
+    size=1,
+    source=None,
+    filter_path=None,
+    headers=HEADERS
+):
+    '''
+
+    get monitor by exact name
+
+    @monitor_type, optionally restrict results to 'query_level_monitor',
+        'doc_level_monitor', or 'bucket_level_monitor'
+    @source, False excludes the monitor source, or list of included fields
+        (i.e. ['monitor.name'])
+    @filter_path, limit response to specified paths (i.e. 'hits.hits._id')
+
+    '''
+
+    path = encode_path('_plugins/_alerting/monitors/_search', filter_path=filter_path)
+
+    if monitor_name:
+        query = { 'bool': { 'filter': [{ 'term': { 'monitor.name.keyword': monitor_name } }] } }
+        payload = { 'size': size, 'query': query }
+
+        if monitor_type:
+            query['bool']['filter'].append({ 'term': { 'monitor.monitor_type': monitor_type } })
+
+        if source is not None:
+            payload['_source'] = source
+
+        try:
+            r = session.get(
+                '{}/{}'.format(endpoint, path),
+                auth=awsauth,
+                data=dumps(payload),
+                headers=headers
+            )
+
+            if r.ok:
+                return loads(r.content)
+
+            print('Notice (get_monitor): on {} returned {}'.format(
+                path,
+                r.status_code
+            ))
+
+        except Exception as e:
+            print('Error (get_monitor): {}'.format(e))
+            return None
+
+    else:
+        print('Error (get_monitor): monitor_name not provided')
+        return None
+
+
+def get_index_template(
+    endpoint,
+    awsauth,
+    template_name,
+    filter_path=None,
+    headers=HEADERS
+):
+    '''
+
+    get composable index template by name
+
+    @filter_path, limit response to specified paths
+
+    '''
+
+    if template_name:
+        path = encode_path('_index_template/{}'.format(template_name), filter_path=filter_path)
+
+    else:
+        print('Error (get_index_template): template_name not provided')
+        return None
+
+    try:
+        r = session.get(
+            '{}/{}'.format(endpoint, path),
+            auth=awsauth,
+            headers=headers
+        )
+
+        if r.ok:
+            return loads(r.content)
+
+        print('Notice (get_index_template): on {} returned {}'.format(
+            path,
+            r.status_code
+        ))
+
+    except Exception as e:
+        print('Error (get_index_template): {}'.format(e))
+
+    return None
+
+
+def get_component_template(
+    endpoint,
+    awsauth,
+    template_name,
+    filter_path=None,
+    headers=HEADERS
+):
+    '''
+
+    get component template by name
+
+    @filter_path, limit response to specified paths
+
+    '''
+
+    if template_name:
+        path = encode_path('_component_template/{}'.format(template_name), filter_path=filter_path)
+
+    else:
+        print('Error (get_component_template): template_name not provided')
+        return None
+
+    try:
+        r = session.get(
+            '{}/{}'.format(endpoint, path),
+            auth=awsauth,
+            headers=headers
+        )
+
+        if r.ok:
+            return loads(r.content)
+
+        print('Notice (get_component_template): on {} returned {}'.format(
+            path,
+            r.status_code
+        ))
+
+    except Exception as e:
+        print('Error (get_component_template): {}'.format(e))
+
+    return None
+
+
+def get_search(
+    endpoint,
+    awsauth,
+    indices,
+    query,
+    request_cache=None,
+    filter_path='took,timed_out,_shards.failed',
+    headers=HEADERS
+):
+    '''
+
+    run search request
+
+    @query, search request body
+    @request_cache, True caches the shard-level results (including requests
+        with hits), False bypasses the cache, otherwise the index setting
+    @filter_path, limit response to specified paths, by default excluding
+        the search hits and aggregation results
+
+    '''
+
+    if indices and query:
+        path = encode_path(
+            '{}/_search'.format(','.join(indices)),
+            request_cache=request_cache,
+            filter_path=filter_path
+        )
+
+    else:
+        print('Error (get_search): indices and query must be provided')
+        return None
+
+    try:
+        r = session.post(
+            '{}/{}'.format(endpoint, path),
+            auth=awsauth,
+            data=dumps(query),
+            headers=headers
+        )
+
+        if r.ok:
+            return loads(r.content)
+
+        print('Notice (get_search): on {} returned {}'.format(
+            path,
+            r.status_code
+        ))
+
+    except Exception as e:
+        print('Error (get_search): {}'.format(e))
+
+    return None
+
+
+def get_async_search(
+    endpoint,
+    awsauth,
+    search_id,
+    keep_alive=None,
+    filter_path=None,
+    headers=HEADERS
+):
+    '''
+
+    get asynchronous search state, and (partial) results
+
+    @keep_alive, extend the retention of the search (i.e. '1h')
+    @filter_path, limit response to specified paths
+    @return, response with 'state' (i.e. 'RUNNING', 'SUCCEEDED', 'FAILED'), and
+        'response', or None if the search does not exist (i.e. expired)
+
+    '''
+
+    if not search_id:
+        print('Error (get_async_search): search_id must be provided')
+        return None
+
+    path = encode_path(
+        '_plugins/_asynchronous_search/{}'.format(search_id),
+        keep_alive=keep_alive,
+        filter_path=filter_path
+    )
+
+    try:
+        r = session.get(
+            '{}/{}'.format(endpoint, path),
+            auth=awsauth,
+            headers=headers
+        )
+
+        if r.ok:
+            return loads(r.content)
+
+        print('Notice (get_async_search): on {} returned {}'.format(
+            path,
+            r.status_code
+        ))
+
+    except Exception as e:
+        print('Error (get_async_search): {}'.format(e))
+
+    return None
+
+
+def get_saved_objects(
+    endpoint,
+    awsauth,
+    objects=[],
+    headers=DASHBOARD_HEADERS
+):
+    '''
+
+    get multiple dashboards saved objects in a single request
+
+    @objects, list of saved object references, as follows, where 'fields' is
+        optional and limits the returned attributes:
+
+        [{
+            'type': 'index-pattern',
+            'id': 'logs',
+            'fields': ['title']
+        }]
+
+    Note: saved objects not found are returned with an 'error' attribute
+          (i.e. {'statusCode': 404}), rather than failing the request
+
+    '''
+
+    if objects:
+        path = '_dashboards/api/saved_objects/_bulk_get'
+
+    else:
+        print('Error (get_saved_objects): objects not provided')
+        return None
+
+    try:
+        r = session.post(
+            '{}/{}'.format(endpoint, path),
+            auth=awsauth,
+            data=dumps(objects),
+            headers=headers
+        )
+
+        print('Notice (get_saved_objects): on {} returned {}'.format(
+            path,
+            r.status_code
+        ))
+
+        if r.ok:
+            return loads(r.content).get('saved_objects', [])
+
+    except Exception as e:
+        print('Error (get_saved_objects): {}'.format(e))
+
+    return None
+
+
+def get_saved_objects_export(
+    endpoint,
+    awsauth,
+    file_path,
+    types=[],
+    objects=[],
+    include_references_deep=True,
+    chunk_size=65536,
+    headers=DASHBOARD_HEADERS
+):
+    '''
+
+    export dashboards saved objects as ndjson, streamed into specified file
+    without buffering the entire export in memory
+
+    @types, export all saved objects of the specified types (i.e. ['dashboard'])
+    @objects, export specified saved objects (i.e. [{'type': 'dashboard', 'id': 'logs'}])
+
+    '''
+
+    if types or objects:
+        path = '_dashboards/api/saved_objects/_export'
+        payload = {'includeReferencesDeep': include_references_deep}
+
+        if objects:
+            payload['objects'] = objects
+
+        else:
+            payload['type'] = types
+
+    else:
+        print('Error (get_saved_objects_export): types or objects must be provided')
+        return None
+
+    try:
+        with session.post(
+            '{}/{}'.format(endpoint, path),
+            auth=awsauth,
+            data=dumps(payload),
+            headers=headers,
+            stream=True
+        ) as r:
+            print('Notice (get_saved_objects_export): on {} returned {}'.format(
+                path,
+                r.status_code
+            ))
+
+            if r.ok:
+                with open(file_path, 'wb') as f:
+                    for chunk in r.iter_content(chunk_size=chunk_size):
+                        f.write(chunk)
+
+                return file_path
+
+    except Exception as e:
+        print('Error (get_saved_objects_export): {}'.format(e))
+
+    return None
+
+
+def get_cluster_health(
+    endpoint,
+    awsauth,
+    index='',
+    wait_for_status=None,
+    wait_for_no_relocating_shards=False,
+    timeout='30s',
+    filter_path=None,
+    headers=HEADERS
+):
+    '''
+
+    get cluster health, optionally restricted to specified index, where the
+    request is held server-side until the wait condition is met, or timeout
+
+    @wait_for_status, one of 'green', 'yellow', or 'red'
+    @wait_for_no_relocating_shards, wait until no shards are relocating
+    @filter_path, limit response to specified paths (i.e. 'status,timed_out')
+
+    Note: if the timeout elapses, the response contains 'timed_out': true
+
+    '''
+
+    path = '_cluster/health{}?timeout={}'.format(
+        '/{}'.format(index) if index else '',
+        timeout
+    )
+
+    if wait_for_status:
+        path = '{}&wait_for_status={}'.format(path, wait_for_status)
+
+    if wait_for_no_relocating_shards:
+        path = '{}&wait_for_no_relocating_shards=true'.format(path)
+
+    path = encode_path(path, filter_path=filter_path)
+
+    try:
+        r = session.get(
+            '{}/{}'.format(endpoint, path),
+            auth=awsauth,
+            headers=headers
+        )
+
+        print('Notice (get_cluster_health): on {} returned {}'.format(
+            path,
+            r.status_code
+        ))
+
+        #
+        # timed out requests return 408, but still contain the health
+        #
+        if r.ok or r.status_code == 408:
+            return loads(r.content)
+
+    except Exception as e:
+        print('Error (get_cluster_health): {}'.format(e))
+
+    return None
+
+
+def get_task(
+    endpoint,
+    awsauth,
+    task_id,
+    wait_for_completion=False,
+    timeout='30s',
+    filter_path=None,
+    headers=HEADERS
+):
+    '''
+
+    get task status (i.e. forcemerge, or reindex launched asynchronously)
+
+    @wait_for_completion, hold the request server-side until the task
+        completes, or timeout
+    @filter_path, limit response to specified paths (i.e. 'completed,error')
+
+    '''
+
+    if task_id:
+        path = '_tasks/{}'.format(task_id)
+
+        if wait_for_completion:
+            path = '{}?wait_for_completion=true&timeout={}'.format(path, timeout)
+
+        path = encode_path(path, filter_path=filter_path)
+
+    else:
+        print('Error (get_task): task_id not provided')
+        return None
+
+    try:
+        r = session.get(
+            '{}/{}'.format(endpoint, path),
+            auth=awsauth,
+            headers=headers
+        )
+
+        if r.ok:
+            return loads(r.content)
+
+        print('Notice (get_task): on {} returned {}'.format(
+            path,
+            r.status_code
+        ))
+
+    except Exception as e:
+        print('Error (get_task): {}'.format(e))
+
+    return None
+
+
+def get_data_stream(
+    endpoint,
+    awsauth,
+    data_stream_name='',
+    filter_path='data_streams.name,data_streams.generation,data_streams.indices.index_name',
+    headers=HEADERS
+):
+    '''
+
+    get data stream, including its backing indices (oldest first), where the
+    last backing index is the write index
+
+    @data_stream_name, data stream name, or pattern (default all)
+    @filter_path, limit response to specified paths
+
+    '''
+
+    path = encode_path(
+        '_data_stream{}'.format('/{}'.format(data_stream_name) if data_stream_name else ''),
+        filter_path=filter_path
+    )
+
+    try:
+        r = session.get(
+            '{}/{}'.format(endpoint, path),
+            auth=awsauth,
+            headers=headers
+        )
+
+        if r.ok:
+            return loads(r.content)
+
+        print('Notice (get_data_stream): on {} returned {}'.format(
+            path,
+            r.status_code
+        ))
+
+    except Exception as e:
+        print('Error (get_data_stream): {}'.format(e))
+
+    return None
+
+
+def get_rollup_job(
+    endpoint,
+    awsauth,
+    rollup_id,
+    filter_path=None,
+    headers=HEADERS
+):
+    '''
+
+    get rollup job, including '_seq_no' and '_primary_term', which are required
+    to update the job (see set_rollup_job)
+
+    @filter_path, limit response to specified paths (i.e. '_seq_no,_primary_term')
+
+    '''
+
+    if not rollup_id:
+        print('Error (get_rollup_job): rollup_id must be provided')
+        return None
+
+    path = encode_path('_plugins/_rollup/jobs/{}'.format(rollup_id), filter_path=filter_path)
+
+    try:
+        r = session.get(
+            '{}/{}'.format(endpoint, path),
+            auth=awsauth,
+            headers=headers
+        )
+
+        if r.ok:
+            return loads(r.content)
+
+        print('Notice (get_rollup_job): on {} returned {}'.format(
+            path,
+            r.status_code
+        ))
+
+    except Exception as e:
+        print('Error (get_rollup_job): {}'.format(e))
+
+    return None
+
+
+def get_transform_job(
+    endpoint,
+    awsauth,
+    transform_id,
+    filter_path=None,
+    headers=HEADERS
+):
+    '''
+
+    get transform job, including '_seq_no' and '_primary_term', which are required
+    to update the job (see set_transform_job)
+
+    @filter_path, limit response to specified paths (i.e. '_seq_no,_primary_term')
+
+    '''
+
+    if not transform_id:
+        print('Error (get_transform_job): transform_id must be provided')
+        return None
+
+    path = encode_path('_plugins/_transform/{}'.format(transform_id), filter_path=filter_path)
+
+    try:
+        r = session.get(
+            '{}/{}'.format(endpoint, path),
+            auth=awsauth,
+            headers=headers
+        )
+
+        if r.ok:
+            return loads(r.content)
+
+        print('Notice (get_transform_job): on {} returned {}'.format(
+            path,
+            r.status_code
+        ))
+
+    except Exception as e:
+        print('Error (get_transform_job): {}'.format(e))
+
+    return None
+
+
+def get_document(
+    endpoint,
+    awsauth,
+    index_name,
+    document_id,
+    source=None,
+    source_excludes=None,
+    headers=HEADERS
+):
+    '''
+
+    get document by id, including '_seq_no' and '_primary_term', which can be
+    used for optimistic concurrency control on subsequent writes
+
+    @source, False excludes the document source, or list of included fields
+    @source_excludes, list of excluded fields
+
+    '''
+
+    if index_name and document_id:
+        path = encode_path(
+            '{}/_doc/{}'.format(index_name, document_id),
+            _source=source if source is False else None,
+            _source_includes=source if isinstance(source, list) else None,
+            _source_excludes=source_excludes
+        )
+
+    else:
+        print('Error (get_document): index_name and document_id must be provided')
+        return None
+
+    try:
+        r = session.get(
+            '{}/{}'.format(endpoint, path),
+            auth=awsauth,
+            headers=headers
+        )
+
+        if r.ok:
+            return loads(r.content)
+
+        print('Notice (get_document): on {} returned {}'.format(
+            path,
+            r.status_code
+        ))
+
+    except Exception as e:
+        print('Error (get_document): {}'.format(e))
+
+    return None
@@ -1,5 +1,10 @@
 import os
+import re
+import copy
+import sys
 import json
+import math
+import hashlib
 import time
 import boto3
 import requests
@@ -9,21 +14,99 @@ from get_configuration import (
     get_indices,
     get_index_pattern,
     get_alert_destination,
+    get_notification_channel,
     get_dashboard,
-    get_document_count,
-    get_monitor
+    get_count,
+    get_index_exists,
+    get_monitor,
+    get_search,
+    get_async_search,
+    get_saved_objects,
+    get_nodes,
+    get_index_stats,
+    get_mapping,
+    get_index_settings,
+    get_field_usage_stats,
+    get_cluster_health,
+    get_task,
+    get_data_stream,
+    get_rollup_job,
+    get_transform_job,
+    get_resolve_index
 )
 from set_configuration import (
     set_index_pattern,
     set_alert_destination,
+    set_notification_channel,
     set_new_index,
     set_reindex,
     set_dashboard,
-    set_monitor
+    set_monitor,
+    set_index_template,
+    set_component_template,
+    set_saved_objects,
+    set_saved_objects_import,
+    set_index_settings,
+    set_forcemerge,
+    set_shrink,
+    set_data_stream,
+    set_rollover,
+    set_rollup_job,
+    set_transform_job,
+    set_async_search,
+    build_monitor_query,
+    build_dashboard_queries
 )
 from delete_configuration import (
     delete_index,
-    delete_document
+    delete_indices,
+    delete_document,
+    delete_async_search,
+    delete_monitor
+)
+from state_store import (
+    ClusterStateStore,
+    FileStateStore
+)
+from lease_lock import LeaseLock
+from transport import (
+    set_rate_limits,
+    get_rate_metrics
+)
+from tracing import (
+    set_tracing,
+    trace,
+    put_metadata
+)
+
+#
+# mapping advisor: estimated share of a field's disk footprint saved per
+#     change (see check_mapping), where 'codec' is a share of the store size
+#
+MAPPING_SAVINGS = {
+    'index': 0.5,
+    'doc_values': 0.3,
+    'keyword_only': 0.6,
+    'keyword_field': 0.4,
+    'codec': 0.15
+}
+INDEXED_TYPES = (
+    'keyword',
+    'text',
+    'match_only_text',
+    'long',
+    'integer',
+    'short',
+    'byte',
+    'double',
+    'float',
+    'half_float',
+    'scaled_float',
+    'unsigned_long',
+    'date',
+    'date_nanos',
+    'ip',
+    'boolean'
 )
 
 
@@ -34,10 +117,10 @@ def check_index(endpoint, awsauth, index):
 
     '''
 
-    r = get_indices(endpoint, awsauth)
+    r = get_indices(endpoint, awsauth, 'index', index=index)
     found_index = None
 
-    for x in r:
+    for x in r or []:
         found_index = next((y for y in x.split() if y.decode('utf-8') == index), None)
         if found_index:
             return True
@@ -52,7 +135,7 @@ def check_index_pattern(endpoint, awsauth, index_id, title):
 
     '''
 
-    r = get_index_pattern(endpoint, awsauth, index_id, title)
+    r = get_index_pattern(endpoint, awsauth, index_id, title, fields=['title'])
 
     if r and 'id' in r:
         return r['id']
@@ -67,7 +150,7 @@ def check_dashboard(endpoint, awsauth, title):
 
     '''
 
-    r = get_dashboard(endpoint, awsauth, title)
+    r = get_dashboard(endpoint, awsauth, title, fields=['title'])
 
     if r and 'id' in r:
         return r['id']
@@ -75,6 +158,557 @@ def check_dashboard(endpoint, awsauth, title):
     return r
 
 
+def check_health(endpoint, awsauth, index='', status='yellow', timeout='30s'):
+    '''
+
+    check opensearch index (or cluster) reaches specified health status, where
+    the request is held server-side until the status is reached, or timeout
+
+    '''
+
+    r = get_cluster_health(
+        endpoint,
+        awsauth,
+        index,
+        wait_for_status=status,
+        timeout=timeout,
+        filter_path='status,timed_out'
+    )
+
+    return bool(r) and not r.get('timed_out')
+
+
+def check_saved_objects(endpoint, awsauth, objects):
+    '''
+
+    check which dashboards saved objects do not exist, using a single request
+
+    @objects, list of saved objects, each containing at least 'type' and 'id'
+
+    '''
+
+    r = get_saved_objects(
+        endpoint,
+        awsauth,
+        [{'type': x['type'], 'id': x['id'], 'fields': ['title']} for x in objects]
+    )
+
+    if r is None:
+        return objects
+
+    found = set((x['type'], x['id']) for x in r if 'error' not in x)
+
+    return [x for x in objects if (x['type'], x['id']) not in found]
+
+
+def check_monitor_cost(
+    endpoint,
+    awsauth,
+    monitor_name,
+    destination_id,
+    max_took=1000,
+    max_shards=0,
+    top=5,
+    state_store=None,
+    timeout=30,
+    **monitor_options
+):
+    '''
+
+    pre-flight monitor before deployment, by executing it once without saving
+    or sending actions (dryrun), then running its search with profiling
+
+    @max_took, search took-time budget (milliseconds), where 0 disables
+    @max_shards, shards hit budget, where 0 disables
+    @top, number of most expensive query and aggregation components reported
+    @state_store, @timeout, the profiled search runs asynchronously, where a
+        search not completed within 'timeout' (seconds) is collected by a
+        later execution (see check_async_search)
+    @monitor_options, keyword arguments passed to set_monitor
+
+    Note: document level monitors have no search input, so only the dryrun
+          result is checked
+
+    '''
+
+    report = {'ok': True, 'took': None, 'shards': None, 'expensive': [], 'errors': []}
+    dryrun = set_monitor(
+        endpoint,
+        awsauth,
+        monitor_name,
+        destination_id=destination_id,
+        dryrun=True,
+        **monitor_options
+    )
+
+    if not dryrun:
+        report['ok'] = False
+        report['errors'].append('dryrun execution failed')
+        return report
+
+    result = dryrun['result']
+    trigger_results = result.get('trigger_results', {}).values()
+
+    for error in [result.get('error'), result.get('input_results', {}).get('error')] + [
+        x.get('error') for x in trigger_results if isinstance(x, dict)
+    ]:
+        if error:
+            report['errors'].append(error)
+
+    search = next((x['search'] for x in dryrun['monitor']['inputs'] if 'search' in x), None)
+    profile = check_async_search(
+        endpoint,
+        awsauth,
+        search['indices'],
+        dict(search['query'], profile=True),
+        'preflight-{}'.format(monitor_name),
+        state_store=state_store,
+        timeout=timeout,
+        filter_path='id,state,response.took,response._shards,response.profile'
+    ) if search else None
+
+    if search and not profile:
+        report['errors'].append('profiled search pending, or failed')
+
+    if profile:
+        report['took'] = profile.get('took')
+        report['shards'] = profile.get('_shards', {}).get('total')
+        components = {}
+
+        for shard in profile.get('profile', {}).get('shards', []):
+            stack = list(shard.get('aggregations', []))
+
+            for x in shard.get('searches', []):
+                stack.extend(x.get('query', []))
+
+            while stack:
+                y = stack.pop()
+                key = (y.get('type'), y.get('description'))
+                components[key] = components.get(key, 0) + y.get('time_in_nanos', 0)
+                stack.extend(y.get('children', []))
+
+        report['expensive'] = [{
+            'type': k[0],
+            'description': k[1],
+            'time_ms': round(v / 1e6, 3)
+        } for k, v in sorted(components.items(), key=lambda x: x[1], reverse=True)[:top]]
+
+        if max_took and report['took'] is not None and report['took'] > max_took:
+            report['errors'].append('took {}ms exceeds {}ms budget'.format(report['took'], max_took))
+
+        if max_shards and report['shards'] is not None and report['shards'] > max_shards:
+            report['errors'].append('{} shards exceeds {} shard budget'.format(report['shards'], max_shards))
+
+    report['ok'] = not report['errors']
+    print('Notice (check_monitor_cost): {} returned {}'.format(monitor_name, report))
+
+    return report
+
+
+def check_async_search(
+    endpoint,
+    awsauth,
+    indices,
+    query,
+    key,
+    state_store=None,
+    timeout=30,
+    poll=2,
+    keep_alive='1h',
+    filter_path=None
+):
+    '''
+
+    run expensive search asynchronously, so the lambda is not blocked (nor the
+    request timed out), returning the results if completed within 'timeout'.
+    Otherwise the search continues server-side, and its id is persisted under
+    'key', so a later execution collects the results rather than submitting
+    the search again.
+
+    @state_store, object implementing get, set, and delete (see state_store.py),
+        where a search persisted for other indices, or another query (i.e.
+        after an update) is deleted rather than collected
+    @timeout, seconds the search is polled within this execution
+    @keep_alive, time a pending search (and its results) is retained
+    @return, search response, or None if pending or failed
+
+    '''
+
+    digest = hashlib.sha256(json.dumps([indices, query], sort_keys=True).encode('utf-8')).hexdigest()
+    state = state_store.get(key) if state_store else None
+
+    if state and state.get('digest') != digest:
+        print('Notice (check_async_search): {} query changed, discarding {}'.format(key, state['id']))
+        delete_async_search(endpoint, awsauth, state['id'])
+        state_store.delete(key)
+        state = None
+
+    search = get_async_search(
+        endpoint,
+        awsauth,
+        state['id'],
+        keep_alive=keep_alive,
+        filter_path=filter_path
+    ) if state else None
+
+    if not search:
+        search = set_async_search(
+            endpoint,
+            awsauth,
+            indices,
+            query,
+            keep_alive=keep_alive,
+            filter_path=filter_path
+        )
+
+    deadline = time.time() + timeout
+
+    while search and search.get('state') in ('INIT', 'RUNNING') and time.time() < deadline:
+        time.sleep(poll)
+        search = get_async_search(endpoint, awsauth, search['id'], filter_path=filter_path) or search
+
+    if not search:
+        return None
+
+    if search.get('state') in ('INIT', 'RUNNING'):
+        print('Notice (check_async_search): {} pending as {}'.format(key, search['id']))
+
+        if state_store:
+            state_store.set(key, {'id': search['id'], 'indices': indices, 'digest': digest})
+
+        return None
+
+    if search.get('id'):
+        delete_async_search(endpoint, awsauth, search['id'])
+
+    if state:
+        state_store.delete(key)
+
+    if 'response' not in search:
+        print('Error (check_async_search): {} {} with {}'.format(key, search.get('state'), search.get('error')))
+        return None
+
+    return search['response']
+
+
+def check_shard_number(
+    endpoint,
+    awsauth,
+    index,
+    target_shard_size=30,
+    max_shard_docs=200000000,
+    node_endpoint=None,
+    node_auth=None
+):
+    '''
+
+    check shard number required for specified index, using its primary store
+    size and document count, rounded up to a multiple of the data node count
+    so shards are evenly allocated
+
+    @target_shard_size, desired primary shard size (GB)
+    @max_shard_docs, desired maximum document count per primary shard
+    @node_endpoint, @node_auth, cluster the new index is created on (default
+        endpoint, and awsauth), where its data nodes are counted (i.e. when
+        the index is sized on a remote source cluster)
+
+    '''
+
+    stats = get_index_stats(endpoint, awsauth, index, filter_path='_all.primaries')
+
+    if not stats or '_all' not in stats:
+        print('Notice (check_shard_number): stats not available for {}'.format(index))
+        return 1
+
+    primaries = stats['_all'].get('primaries', {})
+    store_size = primaries.get('store', {}).get('size_in_bytes', 0)
+    doc_count = primaries.get('docs', {}).get('count', 0)
+    shard_number = max(
+        1,
+        math.ceil(store_size / (target_shard_size * pow(1024, 3))),
+        math.ceil(doc_count / max_shard_docs)
+    )
+
+    nodes = get_nodes(
+        node_endpoint if node_endpoint else endpoint,
+        node_auth if node_endpoint else awsauth,
+        'node.role'
+    )
+    data_nodes = len([x for x in nodes if b'd' in x]) if nodes else 0
+
+    if data_nodes and shard_number > 1:
+        shard_number = math.ceil(shard_number / data_nodes) * data_nodes
+
+    print('Notice (check_shard_number): {} ({} bytes, {} docs, {} data nodes) requires {} shards'.format(
+        index,
+        store_size,
+        doc_count,
+        data_nodes,
+        shard_number
+    ))
+
+    return shard_number
+
+
+def get_mapping_fields(properties, prefix=''):
+    '''
+
+    flatten mapping properties into (field path, field attributes) pairs,
+    where object properties are traversed, and multi-fields (i.e. keyword)
+    follow their parent field
+
+    '''
+
+    fields = []
+
+    for name, attributes in properties.items():
+        path = '{}{}'.format(prefix, name)
+
+        if 'properties' in attributes:
+            fields.extend(get_mapping_fields(attributes['properties'], '{}.'.format(path)))
+            continue
+
+        fields.append((path, attributes))
+
+        for x, y in attributes.get('fields', {}).items():
+            fields.append(('{}.{}'.format(path, x), y))
+
+    return fields
+
+
+def get_field_usage(usage):
+    '''
+
+    sum field usage statistics across indices and shards, into searched (terms,
+    and points), aggregated (doc values), and norms accesses per field
+
+    '''
+
+    fields = {}
+
+    for index, stats in usage.items():
+        if index.startswith('_'):
+            continue
+
+        for shard in stats.get('shards', []):
+            for field, x in shard.get('stats', {}).get('fields', {}).items():
+                total = fields.setdefault(field, {'searched': 0, 'aggregated': 0, 'norms': 0})
+                total['searched'] += x.get('inverted_index', {}).get('terms', 0) + x.get('points', 0)
+                total['aggregated'] += x.get('doc_values', 0)
+                total['norms'] += x.get('norms', 0)
+
+    return fields
+
+
+def check_mapping(endpoint, awsauth, index, min_saving=0):
+    '''
+
+    advise storage optimizations for an existing index, using its mappings,
+    primary store size, fielddata, and field usage statistics (where
+    available), and build the suggested mappings for the next remap
+
+    Without field usage statistics, only changes not depending on usage are
+    advised (norms on text fields, fielddata, and the index codec). Disk
+    savings are coarse estimates, where the store size is divided evenly
+    across fields (see MAPPING_SAVINGS), and heap savings are the current
+    fielddata memory of the field.
+
+    @min_saving, minimum estimated disk, or heap saving (bytes) reported
+    @return, dict of 'recommendations' (field, change, reason, disk, heap),
+        'mappings' (i.e. the Mappings property), and 'settings', or None if
+        the mappings, or stats are not available
+
+    Note: usage statistics are reset when shards are started (i.e. node
+          restarts), so fields used only by infrequent reports may appear
+          unused
+
+    '''
+
+    mappings = get_mapping(endpoint, awsauth, index)
+    stats = get_index_stats(
+        endpoint,
+        awsauth,
+        index,
+        metrics='docs,store,fielddata',
+        filter_path='_all.primaries',
+        fields='*'
+    )
+
+    if not mappings or not stats or '_all' not in stats:
+        print('Notice (check_mapping): mappings or stats not available for {}'.format(index))
+        return None
+
+    #
+    # aliases, or patterns: the first concrete index is advised
+    #
+    index_name = sorted(mappings)[0]
+    mappings = mappings[index_name].get('mappings', {})
+    suggested = copy.deepcopy(mappings)
+    primaries = stats['_all'].get('primaries', {})
+    store_size = primaries.get('store', {}).get('size_in_bytes', 0)
+    doc_count = primaries.get('docs', {}).get('count', 0)
+    fielddata = primaries.get('fielddata', {}).get('fields', {})
+    usage = get_field_usage_stats(endpoint, awsauth, index_name, filter_path='*.shards.stats.fields')
+    usage = get_field_usage(usage) if usage else None
+    fields = dict(get_mapping_fields(suggested.get('properties', {})))
+    share = store_size / max(1, len(fields))
+    recommendations = []
+    skipped = set()
+
+    def recommend(field, change, reason, disk=0, heap=0):
+        if max(disk, heap) >= min_saving:
+            recommendations.append({
+                'field': field,
+                'change': change,
+                'reason': reason,
+                'disk': int(disk),
+                'heap': int(heap)
+            })
+
+    for field, attributes in fields.items():
+        field_type = attributes.get('type')
+        used = usage.get(field, {'searched': 0, 'aggregated': 0, 'norms': 0}) if usage is not None else None
+        heap = fielddata.get(field, {}).get('memory_size_in_bytes', 0)
+
+        if field in skipped or field_type not in INDEXED_TYPES or attributes.get('index') is False:
+            continue
+
+        #
+        # unused: neither the field, nor its multi-fields are searched or
+        #     aggregated, so only kept in _source
+        #
+        if used and not used['searched'] and not used['aggregated'] and not any(
+            usage.get('{}.{}'.format(field, x)) for x in attributes.get('fields', {})
+        ):
+            change = {'index': False}
+
+            if field_type not in ('text', 'match_only_text') and attributes.get('doc_values') is not False:
+                change['doc_values'] = False
+
+            attributes.update(change)
+            attributes.pop('fielddata', None)
+            recommend(
+                field,
+                change,
+                'not searched, nor aggregated',
+                disk=share * (MAPPING_SAVINGS['index'] + MAPPING_SAVINGS['doc_values'] * ('doc_values' in change)),
+                heap=heap
+            )
+            continue
+
+        if field_type == 'text':
+            keyword = next((
+                (x, y) for x, y in attributes.get('fields', {}).items() if y.get('type') == 'keyword'
+            ), None)
+            keyword_used = usage.get('{}.{}'.format(field, keyword[0])) if used and keyword else None
+
+            #
+            # keyword-only: the analyzed text is not searched, only its keyword
+            #
+            if used and keyword and not used['searched'] and keyword_used and keyword_used['searched']:
+                change = {'type': 'keyword'}
+
+                if keyword[1].get('ignore_above'):
+                    change['ignore_above'] = keyword[1]['ignore_above']
+
+                skipped.update('{}.{}'.format(field, x) for x in attributes.get('fields', {}))
+                attributes.clear()
+                attributes.update(change)
+                recommend(
+                    field,
+                    change,
+                    'text not searched, only {}.{}'.format(field, keyword[0]),
+                    disk=share * MAPPING_SAVINGS['keyword_only'],
+                    heap=heap
+                )
+                continue
+
+            if used and keyword and not keyword_used:
+                skipped.add('{}.{}'.format(field, keyword[0]))
+                attributes['fields'].pop(keyword[0])
+
+                if not attributes['fields']:
+                    attributes.pop('fields')
+
+                recommend(
+                    field,
+                    {'fields': {keyword[0]: None}},
+                    '{}.{} not searched, nor aggregated'.format(field, keyword[0]),
+                    disk=share * MAPPING_SAVINGS['keyword_field']
+                )
+
+            if attributes.get('fielddata') and (used is None or not used['aggregated']):
+                attributes.pop('fielddata')
+                recommend(
+                    field,
+                    {'fielddata': False},
+                    'aggregate on a keyword field instead of fielddata',
+                    heap=heap
+                )
+
+            if attributes.get('norms', True) and (used is None or not used['norms']):
+                attributes['norms'] = False
+                recommend(
+                    field,
+                    {'norms': False},
+                    'length normalization not used for scoring (i.e. log fields)',
+                    disk=doc_count
+                )
+
+        #
+        # searched, but not aggregated, sorted, or scripted
+        #
+        elif field_type != 'match_only_text' and used and not used['aggregated'] and attributes.get('doc_values', True):
+            attributes['doc_values'] = False
+            recommend(
+                field,
+                {'doc_values': False},
+                'not aggregated, sorted, or scripted',
+                disk=share * MAPPING_SAVINGS['doc_values']
+            )
+
+    settings = {}
+    codec = get_index_settings(endpoint, awsauth, index_name, 'index.codec', include_defaults=True)
+
+    if codec and index_name in codec:
+        codec = dict(
+            codec[index_name].get('defaults', {}),
+            **codec[index_name].get('settings', {})
+        ).get('index.codec', 'default')
+
+        if codec not in ('best_compression', 'zstd', 'zstd_no_dict'):
+            settings['index.codec'] = 'best_compression'
+            recommend(
+                '_source',
+                settings,
+                'stored fields compressed with deflate, at some indexing cost',
+                disk=store_size * MAPPING_SAVINGS['codec']
+            )
+
+    print('Notice (check_mapping): {} ({} bytes, {} docs, field usage {}) estimated saving {} bytes disk, {} bytes heap'.format(
+        index_name,
+        store_size,
+        doc_count,
+        'available' if usage is not None else 'not available',
+        sum(x['disk'] for x in recommendations),
+        sum(x['heap'] for x in recommendations)
+    ))
+
+    for x in recommendations:
+        print('Notice (check_mapping): {} {} ({}), {} bytes disk, {} bytes heap'.format(
+            x['field'],
+            json.dumps(x['change']),
+            x['reason'],
+            x['disk'],
+            x['heap']
+        ))
+
+    if recommendations:
+        print('Notice (check_mapping): suggested Mappings {}'.format(json.dumps(suggested)))
+
+    return {'recommendations': recommendations, 'mappings': suggested, 'settings': settings}
+
+
 def remap_index(
     endpoint,
     awsauth,
@@ -82,46 +716,706 @@ def remap_index(
     destination_index=None,
     mappings={},
     retry=15,
-    filter_header='index,docs.count'
+    shard_number=None,
+    replica_number=1,
+    target_shard_size=30,
+    timeout='60s',
+    remote=None,
+    size=None,
+    slices=None,
+    requests_per_second=None
 ):
     '''
 
     create new index with optional mapping, reindex old index into new index,
     finally delete old index
 
-    @retry, depending on index size (i.e. document count), the requested remap
-        process may take longer than either the exponential back-off, or overall
-        lambda timeout definition
+    @retry, number of server-side long-polls (each up to 'timeout') awaiting
+        the reindex task. Depending on index size (i.e. document count), the
+        requested remap process may take longer than either the overall
+        retries, or overall lambda timeout definition
+    @shard_number, primary shard number of the new index, if not provided it is
+        sized from the source index using 'target_shard_size' (GB)
+    @remote, reindex 'source_index' from a remote cluster into the local
+        'destination_index' (see set_reindex), where the remote source index
+        is counted (and sized) using the remote credentials, and never deleted
+    @size, @slices, @requests_per_second, reindex batch size, parallelism, and
+        throttle (see set_reindex)
 
     Note: this function is designed to be executed in the early stages of
           index deployment, mainly to enhance cloudformation deployments
 
     '''
 
-    old_count = get_document_count(endpoint, awsauth, source_index, filter_header)
+    if remote:
+        source_endpoint = remote['host'].rstrip('/')
+        source_auth = (remote['username'], remote['password']) if remote.get('username') else None
 
-    if not old_count:
-        if set_new_index(endpoint, awsauth, source_index, mappings=mappings):
+    else:
+        source_endpoint = endpoint
+        source_auth = awsauth
+
+    old_count = get_count(source_endpoint, source_auth, source_index, refresh=not remote)
+    put_metadata('source_count', old_count)
+
+    #
+    # remote source: a failed count (i.e. unreachable host, or credentials) is
+    #     not a missing index, so nothing is created
+    #
+    if old_count is None and remote:
+        print('Error (remap_index): {} on {} could not be counted'.format(source_index, source_endpoint))
+        return False
+
+    if old_count is None:
+        if set_new_index(
+            endpoint,
+            awsauth,
+            destination_index if remote else source_index,
+            shard_number=shard_number or 1,
+            replica_number=replica_number,
+            mappings=mappings,
+            wait_for_active_shards=1
+        ):
             return True
 
-    elif old_count:
-        new_index = set_new_index(endpoint, awsauth, destination_index, mappings=mappings)
-        reindex = set_reindex(endpoint, awsauth, source_index, destination_index)
+    else:
+        new_index = set_new_index(
+            endpoint,
+            awsauth,
+            destination_index,
+            shard_number=shard_number or check_shard_number(
+                source_endpoint,
+                source_auth,
+                source_index,
+                target_shard_size=target_shard_size,
+                node_endpoint=endpoint,
+                node_auth=awsauth
+            ),
+            replica_number=replica_number,
+            mappings=mappings,
+            wait_for_active_shards=1
+        )
+
+        #
+        # primaries must be allocated before the reindex starts writing
+        #
+        if new_index and check_health(endpoint, awsauth, destination_index, timeout=timeout):
+            task_id = set_reindex(
+                endpoint,
+                awsauth,
+                source_index,
+                destination_index,
+                wait_for_completion=False,
+                refresh=True,
+                remote=remote,
+                size=size,
+                slices=slices,
+                requests_per_second=requests_per_second
+            )
+            put_metadata('task_id', task_id)
 
-        if new_index and reindex:
-            for x in range(1, retry + 1):
-                update_count = get_document_count(endpoint, awsauth, destination_index, filter_header)
-                if update_count and old_count == update_count:
-                    delete_index(endpoint, awsauth, source_index)
-                    return True
-                else:
-                    time.sleep(pow(x, 2))
+            for x in range(1, retry + 1) if task_id else []:
+                task = get_task(
+                    endpoint,
+                    awsauth,
+                    task_id,
+                    wait_for_completion=True,
+                    timeout=timeout,
+                    filter_path='completed,error,response.failures'
+                )
+
+                if task and task.get('completed'):
+                    failures = task.get('error') or task.get('response', {}).get('failures')
+                    update_count = get_count(endpoint, awsauth, destination_index, refresh=True)
+                    put_metadata('destination_count', update_count)
+
+                    if not failures and update_count == old_count:
+                        if not remote:
+                            delete_index(endpoint, awsauth, source_index)
+                        return True
+
+                    print('Error (remap_index): reindex task {} completed with {} documents of {}, failures {}'.format(
+                        task_id,
+                        update_count,
+                        old_count,
+                        failures
+                    ))
+                    break
 
     print('Notice (remap_index): neither reindex action implemented')
 
     return False
 
 
+def remap_index_job(
+    endpoint,
+    awsauth,
+    index,
+    state_store,
+    job_id=None,
+    mappings={},
+    deadline=None,
+    retry=60,
+    shard_number=None,
+    replica_number=1,
+    target_shard_size=30,
+    timeout='60s',
+    size=None,
+    slices=None,
+    requests_per_second=None
+):
+    '''
+
+    resumable variant of the remap, which reindexes index into
+    '<index>_temporary', then back into index with mappings. After every step
+    the following state is persisted, so the job can continue on a later
+    invocation:
+
+        {
+            'index': 'logs',
+            'leg': 0,
+            'phase': 'create' | 'reindex' | 'verify' | 'delete' | 'done' | 'failed',
+            'task_id': None,
+            'source_count': None,
+            'destination_count': None,
+            'polls': 0
+        }
+
+    @state_store, object implementing get, set, and delete (see state_store.py)
+    @job_id, state key, defaults to 'remap-<index>', so any later request on
+        the same index resumes the job, where a failed job retries its leg
+        and the state is deleted once done
+    @deadline, epoch seconds after which no further step is started, and the
+        current state is returned (i.e. remaining lambda execution time)
+    @retry, number of server-side long-polls (each up to 'timeout') allowed
+        in a single phase before the job fails
+    @size, @slices, @requests_per_second, reindex batch size, parallelism, and
+        throttle (see set_reindex)
+
+    Note: if index does not exist, it is created with mappings, and the job
+          completes immediately, unless '<index>_temporary' exists (i.e. the
+          state was lost after the first leg), where the second leg resumes
+
+    '''
+
+    key = job_id or 'remap-{}'.format(index)
+    temporary_index = '{}_temporary'.format(index)
+    legs = [(index, temporary_index, {}), (temporary_index, index, mappings)]
+    state = state_store.get(key)
+
+    if state and state['phase'] == 'failed':
+        print('Notice (remap_index_job): {} retrying leg {}'.format(key, state['leg']))
+        state.update(phase='create', task_id=None, polls=0)
+
+    elif not state or state['phase'] == 'done':
+        state = {
+            'index': index,
+            'leg': 0,
+            'phase': 'create',
+            'task_id': None,
+            'source_count': None,
+            'destination_count': None,
+            'polls': 0
+        }
+
+    while state['phase'] not in ('done', 'failed'):
+        if deadline and time.time() > deadline:
+            print('Notice (remap_index_job): {} paused at leg {} {} phase'.format(
+                key,
+                state['leg'],
+                state['phase']
+            ))
+            return state
+
+        source_index, destination_index, leg_mappings = legs[state['leg']]
+        phase = state['phase']
+
+        if phase == 'create':
+            state['source_count'] = get_count(endpoint, awsauth, source_index, refresh=True)
+
+            #
+            # failed count: only a 404 is a missing index, otherwise (i.e.
+            #     throttled) the phase is retried
+            #
+            exists = get_index_exists(endpoint, awsauth, source_index) if state['source_count'] is None else True
+            temporary_exists = get_index_exists(
+                endpoint,
+                awsauth,
+                temporary_index
+            ) if exists is False and state['leg'] == 0 else None
+
+            if exists is not False and state['source_count'] is None:
+                print('Notice (remap_index_job): {} not counted, retrying'.format(source_index))
+                time.sleep(5)
+
+            elif exists is False and state['leg'] == 0 and temporary_exists:
+                print('Notice (remap_index_job): {} not found, resuming from {}'.format(index, temporary_index))
+                state['leg'] = 1
+
+            elif exists is False and state['leg'] == 0 and temporary_exists is None:
+                print('Notice (remap_index_job): {} existence unknown, retrying'.format(temporary_index))
+                time.sleep(5)
+
+            elif exists is False and state['leg'] == 0:
+                r = set_new_index(
+                    endpoint,
+                    awsauth,
+                    index,
+                    shard_number=shard_number or 1,
+                    replica_number=replica_number,
+                    mappings=mappings,
+                    wait_for_active_shards=1
+                )
+                state['phase'] = 'done' if r else 'failed'
+
+            elif exists is False:
+                print('Error (remap_index_job): {} not found'.format(source_index))
+                state['phase'] = 'failed'
+
+            else:
+                r = check_index(endpoint, awsauth, destination_index) or set_new_index(
+                    endpoint,
+                    awsauth,
+                    destination_index,
+                    shard_number=shard_number or check_shard_number(
+                        endpoint,
+                        awsauth,
+                        source_index,
+                        target_shard_size=target_shard_size
+                    ),
+                    replica_number=replica_number,
+                    mappings=leg_mappings,
+                    wait_for_active_shards=1
+                )
+                state['phase'] = 'reindex' if r else 'failed'
+
+        elif phase == 'reindex':
+            if check_health(endpoint, awsauth, destination_index, timeout=timeout):
+                task_id = set_reindex(
+                    endpoint,
+                    awsauth,
+                    source_index,
+                    destination_index,
+                    wait_for_completion=False,
+                    refresh=True,
+                    size=size,
+                    slices=slices,
+                    requests_per_second=requests_per_second
+                )
+                state['task_id'] = task_id
+                state['phase'] = 'verify' if task_id else 'failed'
+
+        elif phase == 'verify':
+            task = get_task(
+                endpoint,
+                awsauth,
+                state['task_id'],
+                wait_for_completion=True,
+                timeout=timeout,
+                filter_path='completed,error,response.failures'
+            )
+
+            if task and task.get('completed'):
+                failures = task.get('error') or task.get('response', {}).get('failures')
+                state['destination_count'] = get_count(endpoint, awsauth, destination_index, refresh=True)
+
+                if not failures and state['destination_count'] is None:
+                    print('Notice (remap_index_job): {} not counted, retrying'.format(destination_index))
+                    time.sleep(5)
+
+                elif not failures and state['destination_count'] == state['source_count']:
+                    state['phase'] = 'delete'
+
+                else:
+                    print('Error (remap_index_job): task {} completed with {} documents of {}, failures {}'.format(
+                        state['task_id'],
+                        state['destination_count'],
+                        state['source_count'],
+                        failures
+                    ))
+                    state['phase'] = 'failed'
+
+        elif phase == 'delete':
+            if delete_index(endpoint, awsauth, source_index):
+                state['leg'] = state['leg'] + 1
+                state['phase'] = 'create' if state['leg'] < len(legs) else 'done'
+
+        state['polls'] = 0 if state['phase'] != phase else state['polls'] + 1
+
+        if state['polls'] >= retry:
+            print('Error (remap_index_job): {} exceeded {} attempts in {} phase'.format(
+                key,
+                retry,
+                phase
+            ))
+            state['phase'] = 'failed'
+
+        state_store.set(key, state)
+        put_metadata('remap_job', state)
+
+    print('Notice (remap_index_job): {} {}'.format(key, state['phase']))
+
+    if state['phase'] == 'done':
+        state_store.delete(key)
+
+    return state
+
+
+def continue_invocation(event, context):
+    '''
+
+    re-invoke current lambda asynchronously with the same event, used to
+    continue long-running jobs beyond the current invocation timeout
+
+    Note: requires lambda:InvokeFunction permission on the function itself
+
+    '''
+
+    try:
+        boto3.client('lambda').invoke(
+            FunctionName=context.invoked_function_arn,
+            InvocationType='Event',
+            Payload=json.dumps(event)
+        )
+        print('Notice: continuing {} in new invocation'.format(context.invoked_function_arn))
+        return True
+
+    except Exception as e:
+        print('Error (continue_invocation): {}'.format(e))
+        return False
+
+
+def acquire_lock(lock, wait, executions):
+    '''
+
+    acquire lease before a guarded step (remap, document deletion, or monitor
+    update), where a lease held by another invocation skips only that step,
+    recorded as {'in_progress': <holding request, or owner>}
+
+    '''
+
+    if not lock or lock.acquire(wait=wait):
+        return True
+
+    print('Notice: {} already in progress by {}, skipping step'.format(lock.name, lock.holder))
+    executions.append({'in_progress': lock.holder_request or lock.holder})
+
+    return False
+
+
+def release_lock(lock):
+    '''
+
+    release lease acquired by acquire_lock, if still held by this invocation
+
+    '''
+
+    if lock and lock.thread:
+        return lock.release()
+
+    return False
+
+
+def shrink_index(
+    endpoint,
+    awsauth,
+    source_index,
+    destination_index=None,
+    shard_number=1,
+    replica_number=1,
+    timeout='5m'
+):
+    '''
+
+    shrink index into fewer primary shards, by making the source index
+    read-only, relocating a copy of every shard onto a single data node, then
+    shrinking into the destination index
+
+    @destination_index, defaults to '<source_index>_shrink'
+    @timeout, maximum time the relocation is awaited server-side
+
+    Note: the source index remains read-only, and is not deleted, where an
+          existing destination index (i.e. a later update, or re-delivery) is
+          not shrunk again
+
+    '''
+
+    destination_index = destination_index or '{}_shrink'.format(source_index)
+
+    if check_index(endpoint, awsauth, destination_index):
+        print('Notice (shrink_index): {} already exists, skipping shrink of {}'.format(
+            destination_index,
+            source_index
+        ))
+        return True
+
+    nodes = get_nodes(endpoint, awsauth, 'name,node.role')
+    node_name = next((
+        x.split()[0].decode('utf-8') for x in nodes or [] if b'd' in x.split()[-1]
+    ), None)
+
+    if not node_name:
+        print('Error (shrink_index): data node not found')
+        return False
+
+    if not set_index_settings(endpoint, awsauth, source_index, {
+        'index.routing.allocation.require._name': node_name,
+        'index.blocks.write': True
+    }):
+        return False
+
+    health = get_cluster_health(
+        endpoint,
+        awsauth,
+        source_index,
+        wait_for_no_relocating_shards=True,
+        timeout=timeout
+    )
+
+    if not health or health.get('timed_out'):
+        print('Error (shrink_index): {} relocation to {} not completed within {}'.format(
+            source_index,
+            node_name,
+            timeout
+        ))
+        return False
+
+    return set_shrink(
+        endpoint,
+        awsauth,
+        source_index,
+        destination_index,
+        shard_number=shard_number,
+        replica_number=replica_number
+    )
+
+
+def expire_data_stream(endpoint, awsauth, data_stream_name, retention_days):
+    '''
+
+    delete whole backing indices of data stream whose documents are older than
+    the retention, rather than deleting documents by query
+
+    A backing index stops receiving documents once rolled over, so its newest
+    document is no newer than the creation date of the next backing index.
+    The write index (last backing index) is never deleted.
+
+    @retention_days, minimum age (days) of the newest document within an
+        expired backing index
+
+    '''
+
+    r = get_data_stream(endpoint, awsauth, data_stream_name)
+    streams = r.get('data_streams', []) if r else []
+
+    if not streams:
+        print('Notice (expire_data_stream): {} data stream not found'.format(data_stream_name))
+        return False
+
+    indices = [x['index_name'] for x in streams[0].get('indices', [])]
+    created = {}
+
+    for x in get_indices(
+        endpoint,
+        awsauth,
+        'index,creation.date',
+        index='.ds-{}-*'.format(data_stream_name)
+    ) or []:
+        row = x.split()
+        if len(row) == 2 and row[1].isdigit():
+            created[row[0].decode('utf-8')] = int(row[1]) / 1000
+
+    expired = [
+        x for x, y in zip(indices[:-1], indices[1:])
+        if created.get(y) and created[y] < time.time() - retention_days * 86400
+    ]
+
+    print('Notice (expire_data_stream): {} backing indices of {} expired {}'.format(
+        len(expired),
+        data_stream_name,
+        expired
+    ))
+
+    return all([delete_index(endpoint, awsauth, x) for x in expired])
+
+
+def cleanup_indices(
+    endpoint,
+    awsauth,
+    pattern,
+    name_regex=None,
+    min_age_days=0,
+    min_size=0,
+    max_size=0,
+    max_count=20,
+    dry_run=False,
+    batch_size=20
+):
+    '''
+
+    delete indices matching pattern (i.e. '*_temporary' left by failed
+    remaps), filtered by name, age, and primary store size, in batches
+
+    @pattern, resolved using _resolve/index, where aliases, data streams, and
+        backing indices are never deleted (see expire_data_stream)
+    @name_regex, only names matching the regular expression
+    @min_age_days, only indices created at least specified days ago
+    @min_size, @max_size, only indices with a primary store size (bytes)
+        within the specified bounds (0 is unbounded)
+    @max_count, nothing is deleted when more indices match, which guards
+        against an overly broad pattern
+    @dry_run, report the matching indices without deleting
+
+    '''
+
+    resolved = get_resolve_index(endpoint, awsauth, pattern)
+
+    if resolved is None:
+        return False
+
+    indices = [
+        x['name'] for x in resolved.get('indices', [])
+        if not x.get('data_stream') and (not name_regex or re.search(name_regex, x['name']))
+    ]
+
+    if indices and (min_age_days or min_size or max_size):
+        created = {}
+        for x in get_indices(endpoint, awsauth, 'index,creation.date', index=pattern) or []:
+            row = x.split()
+            if len(row) == 2 and row[1].isdigit():
+                created[row[0].decode('utf-8')] = int(row[1]) / 1000
+
+        stats = get_index_stats(
+            endpoint,
+            awsauth,
+            pattern,
+            'store',
+            filter_path='indices.*.primaries.store.size_in_bytes'
+        ) or {}
+        sizes = {
+            k: v['primaries']['store']['size_in_bytes'] for k, v in stats.get('indices', {}).items()
+        }
+
+        indices = [
+            x for x in indices
+            if (not min_age_days or created.get(x, time.time()) < time.time() - min_age_days * 86400) and
+            (not min_size or sizes.get(x, 0) >= min_size) and
+            (not max_size or sizes.get(x, max_size + 1) <= max_size)
+        ]
+
+    print('Notice (cleanup_indices): {} indices matching {} {}'.format(
+        len(indices),
+        pattern,
+        indices
+    ))
+
+    if len(indices) > max_count:
+        print('Error (cleanup_indices): {} indices exceed max_count {}, none deleted'.format(
+            len(indices),
+            max_count
+        ))
+        return False
+
+    if dry_run or not indices:
+        return True
+
+    return delete_indices(endpoint, awsauth, indices, batch_size=batch_size)
+
+
+def rollup_index(
+    endpoint,
+    awsauth,
+    index,
+    target_index,
+    job_id=None,
+    job_type='rollup',
+    **options
+):
+    '''
+
+    create or update a continuous rollup (or transform) job summarizing index
+    into target_index, and the index pattern of target_index, so long-range
+    dashboard queries use the pre-aggregated documents
+
+    @job_id, defaults to target_index
+    @job_type, 'rollup' or 'transform'
+    @options, see set_rollup_job (i.e. interval, terms, metrics)
+
+    '''
+
+    job_id = job_id or target_index
+    jobs = {
+        'rollup': (get_rollup_job, set_rollup_job),
+        'transform': (get_transform_job, set_transform_job)
+    }
+
+    if job_type not in jobs:
+        print('Error (rollup_index): job_type must be one of {}, not {}'.format(sorted(jobs), job_type))
+        return False
+
+    get_job, set_job = jobs[job_type]
+    job = get_job(endpoint, awsauth, job_id, filter_path='_id,_seq_no,_primary_term')
+
+    if not set_job(
+        endpoint,
+        awsauth,
+        job_id,
+        index,
+        target_index,
+        if_seq_no=job.get('_seq_no') if job else None,
+        if_primary_term=job.get('_primary_term') if job else None,
+        **options
+    ):
+        return False
+
+    if check_index_pattern(endpoint, awsauth, index_id=target_index, title=target_index) != target_index:
+        return set_index_pattern(endpoint, awsauth, index_id=target_index, title=target_index)
+
+    return True
+
+
+def warm_index(endpoint, awsauth, index, queries, repeat=3):
+    '''
+
+    replay representative queries (i.e. monitor, and dashboard queries) with
+    the request cache enabled, so the first user queries after a remap (or
+    dashboard creation) do not hit cold caches, and filesystem pages
+
+    @queries, list of search request bodies
+    @repeat, number of warm executions per query, after the cold execution
+    @return, list of cold, and median warm 'took' (ms) per query, or None if a
+        query fails
+
+    Note: relative date math (i.e. 'now-1h') is only cached by the request
+          cache when rounded (i.e. 'now-1h/m')
+
+    '''
+
+    report = []
+
+    for x, query in enumerate(queries):
+        took = []
+
+        for y in range(repeat + 1):
+            r = get_search(endpoint, awsauth, [index], query, request_cache=True)
+
+            if not r or r.get('timed_out') or r.get('_shards', {}).get('failed'):
+                print('Error (warm_index): query {} failed on {}'.format(x, index))
+                return None
+
+            took.append(r['took'])
+
+        report.append({
+            'query': x,
+            'cold': took[0],
+            'warm': sorted(took[1:])[len(took[1:]) // 2] if repeat else None
+        })
+
+    print('Notice (warm_index): {} cold and warm took (ms) {}'.format(index, report))
+
+    return report
+
+
 def lambda_handler(event, context, physicalResourceId=None, noEcho=False):
     '''
 
@@ -134,17 +1428,23 @@ def lambda_handler(event, context, physicalResourceId=None, noEcho=False):
     tracing_enabled          = bool(strtobool(os.getenv('TracingEnabled', 'True').strip().capitalize()))
     properties               = event.get('ResourceProperties', {})
     request_type             = event.get('RequestType', None)
-    region                   = properties.get('Region', os.environ['AWS_REGION']).strip()
+    region                   = properties.get('Region', os.getenv('AWS_REGION', '')).strip()
     endpoint                 = properties.get('OpenSearchDomain', '').strip()
     index                    = properties.get('OpenSearchIndex', '').strip()
     headers                  = json.loads(properties.get('Headers', '{"Content-Type": "application/json"}').strip())
     sns_alert_name           = properties.get('SnsAlertName', ''). strip()
     sns_topic_arn            = properties.get('SnsTopicArn', ''). strip()
     sns_role_arn             = properties.get('SnsRoleArn', ''). strip()
+    notification_channel     = bool(strtobool(properties.get('NotificationChannel', 'False').strip().capitalize()))
     monitor_name             = properties.get('MonitorName', ''). strip()
     monitor_interval         = int(properties.get('MonitorInterval', '5'). strip())
     monitor_unit             = properties.get('MonitorUnit', 'MINUTES'). strip()
-    monitor_condition        = properties.get('MonitorCondition', 'ctx.results[0].hits.total.value > 5'). strip()
+    monitor_type             = properties.get('MonitorType', 'query_level_monitor'). strip()
+    monitor_condition        = properties.get('MonitorCondition', {
+        'query_level_monitor': 'ctx.results[0].hits.total.value > 5',
+        'doc_level_monitor': '',
+        'bucket_level_monitor': 'params._count > 5'
+    }.get(monitor_type, '')). strip()
     monitor_range_field      = properties.get('MonitorRangeField', 'timestamp'). strip()
     monitor_range_from       = properties.get('MonitorRangeFrom', 'now-1h'). strip()
     monitor_range_to         = properties.get('MonitorRangeTo', 'now'). strip()
@@ -155,10 +1455,88 @@ def lambda_handler(event, context, physicalResourceId=None, noEcho=False):
         monitor_condition,
         monitor_interval
     )).strip()
+    monitor_doc_queries      = json.loads(properties.get('MonitorDocQueries', '[]'). strip())
+    monitor_bucket_fields    = json.loads(properties.get('MonitorBucketFields', '[]'). strip())
+    monitor_aggregations     = json.loads(properties.get('MonitorAggregations', '{}'). strip())
+    monitor_buckets_path     = json.loads(properties.get('MonitorBucketsPath', '{"_count": "_count"}'). strip())
     mappings                 = json.loads(properties.get('Mappings', '{}').strip())
     initialize_dashboard     = bool(strtobool(properties.get('InitalizeDashboard', 'False').strip().capitalize()))
     document_delete_range    = properties.get('DocumentDeleteRange', {})
+    document_delete_range    = json.loads(document_delete_range) if isinstance(document_delete_range, str) else document_delete_range
+    component_templates      = json.loads(properties.get('ComponentTemplates', '{}').strip())
+    index_template_name      = properties.get('IndexTemplateName', index.replace('*', '').rstrip('-').rstrip('_')).strip()
+    index_template_patterns  = json.loads(properties.get('IndexTemplatePatterns', '[]').strip())
+    index_template_priority  = int(properties.get('IndexTemplatePriority', '100').strip())
+    index_template_shards    = int(properties.get('IndexTemplateShards', '0').strip())
+    index_template_replicas  = int(properties.get('IndexTemplateReplicas', '1').strip())
+    data_stream              = bool(strtobool(properties.get('DataStream', 'False').strip().capitalize()))
+    data_stream_field        = properties.get('DataStreamTimestampField', '').strip() or None
+    data_stream_rollover     = json.loads(properties.get('DataStreamRollover', '{}').strip())
+    data_stream_retention    = int(properties.get('DataStreamRetentionDays', '0').strip())
+    rollup_interval          = properties.get('RollupInterval', '').strip()
+    rollup_type              = properties.get('RollupType', 'rollup').strip().lower()
+    rollup_target_index      = properties.get('RollupIndex', '{}_rollup'.format(index.replace('*', '').rstrip('-').rstrip('_'))).strip()
+    rollup_field             = properties.get('RollupTimestampField', 'timestamp').strip()
+    rollup_terms             = json.loads(properties.get('RollupTerms', '[]').strip())
+    rollup_metrics           = json.loads(properties.get('RollupMetrics', '{}').strip())
+    rollup_schedule          = int(properties.get('RollupScheduleMinutes', '60').strip())
+    warmup                   = bool(strtobool(properties.get('Warmup', 'False').strip().capitalize()))
+    warmup_queries           = json.loads(properties.get('WarmupQueries', '[]').strip())
+    warmup_repeat            = int(properties.get('WarmupRepeat', '3').strip())
+    mapping_advisor          = bool(strtobool(properties.get('MappingAdvisor', 'False').strip().capitalize()))
+    mapping_min_saving       = int(properties.get('MappingAdvisorMinSaving', '0').strip())
+    cleanup_pattern          = properties.get('CleanupPattern', '').strip()
+    cleanup_name_regex       = properties.get('CleanupNameRegex', '').strip() or None
+    cleanup_min_age_days     = float(properties.get('CleanupMinAgeDays', '1').strip())
+    cleanup_min_size         = int(properties.get('CleanupMinSize', '0').strip())
+    cleanup_max_size         = int(properties.get('CleanupMaxSize', '0').strip())
+    cleanup_max_count        = int(properties.get('CleanupMaxCount', '20').strip())
+    cleanup_dry_run          = bool(strtobool(properties.get('CleanupDryRun', 'False').strip().capitalize()))
     executions               = []
+    saved_objects            = json.loads(properties.get('SavedObjects', '[]').strip())
+    saved_objects_file       = properties.get('SavedObjectsFile', '').strip()
+    saved_objects_overwrite  = bool(strtobool(properties.get('SavedObjectsOverwrite', 'False').strip().capitalize()))
+    shard_number             = int(properties.get('ShardNumber', '0').strip()) or None
+    replica_number           = int(properties.get('ReplicaNumber', '1').strip())
+    target_shard_size        = float(properties.get('TargetShardSize', '30').strip())
+    remap_mode               = properties.get('RemapMode', '').strip().lower()
+    remap_state_index        = properties.get('RemapStateIndex', 'opensearch_customization_state').strip()
+    remap_state_file         = properties.get('RemapStateFile', '').strip()
+    reindex_remote           = json.loads(properties.get('ReindexRemote', '{}').strip())
+    reindex_remote_index     = properties.get('ReindexRemoteIndex', index).strip()
+    reindex_size             = int(properties.get('ReindexSize', '0').strip()) or None
+    reindex_slices           = properties.get('ReindexSlices', '').strip() or None
+    reindex_throttle         = float(properties.get('ReindexRequestsPerSecond', '0').strip()) or None
+    lock_ttl                 = int(properties.get('LockTtl', '300').strip())
+    lock_wait                = int(properties.get('LockWait', '0').strip())
+    lock_index               = properties.get('LockIndex', 'opensearch_customization_lock').strip()
+    rate_limits              = json.loads(properties.get('RateLimits', '{}').strip())
+    force_merge_index        = properties.get('ForceMergeIndex', index).strip()
+    force_merge_segments     = int(properties.get('ForceMergeSegments', '0').strip())
+    shrink_source            = properties.get('ShrinkIndex', '').strip()
+    shrink_destination       = properties.get('ShrinkDestination', '').strip()
+    shrink_shards            = int(properties.get('ShrinkShards', '1').strip())
+    monitor_preflight        = properties.get('MonitorPreflight', '').strip().lower()
+    monitor_max_took         = int(properties.get('MonitorMaxTook', '1000').strip())
+    monitor_max_shards       = int(properties.get('MonitorMaxShards', '0').strip())
+    monitor_preflight_wait   = int(properties.get('MonitorPreflightTimeout', '30').strip())
+    monitor_options          = {
+        'monitor_type': monitor_type,
+        'indices': [index],
+        'schedule_interval': monitor_interval,
+        'schedule_unit': monitor_unit,
+        'post_date_field': monitor_range_field,
+        'post_date_from': monitor_range_from,
+        'post_date_to': monitor_range_to,
+        'monitor_query_terms': monitor_query_terms,
+        'aggregations': monitor_aggregations,
+        'doc_level_queries': monitor_doc_queries,
+        'bucket_fields': monitor_bucket_fields,
+        'buckets_path': monitor_buckets_path,
+        'trigger_condition_source': monitor_condition or None,
+        'trigger_action_subject': monitor_trigger_subject,
+        'trigger_action_message': monitor_trigger_message
+    }
 
     #
     # version 4 authentication for the python requests
@@ -183,224 +1561,734 @@ def lambda_handler(event, context, physicalResourceId=None, noEcho=False):
         request_type = None
 
     #
-    # x-ray tracing
+    # x-ray tracing: subsegment per step, otherwise no-op (see tracing.py)
     #
-    if tracing_enabled:
-        from aws_xray_sdk.core import xray_recorder
-        from aws_xray_sdk.core import patch_all
-        patch_all()
+    set_tracing(tracing_enabled)
 
     #
-    # Note: 'StackId' in 'event' signify cloudformation execution
+    # state store: persists resumable remaps, and pending asynchronous searches
+    #
+    state_store = None
+
+    if request_type:
+        state_store = FileStateStore(remap_state_file) if remap_state_file else ClusterStateStore(
+            endpoint,
+            awsauth,
+            remap_state_index
+        )
+
     #
-    if request_type == 'Create':
+    # rate limits: shared by every helper request (default RateLimits variable)
+    #
+    if rate_limits:
+        set_rate_limits(rate_limits)
+
+    rate_metrics = get_rate_metrics()
+
+    #
+    # lease lock: remap, document deletion, and monitor steps are not executed
+    #     concurrently for the same index (i.e. retries, or parallel stacks),
+    #     where the lease is acquired around each of these steps only
+    #
+    lock = None
+
+    if lock_ttl and index and request_type in ('Create', 'Update'):
+        lock = LeaseLock(
+            endpoint,
+            awsauth,
+            index,
+            owner=event.get('LockOwner'),
+            request=event.get('RequestId'),
+            ttl=lock_ttl,
+            lock_index=lock_index
+        )
+
+    try:
         #
-        # reindex: using index field mapping
+        # warm-up queries: custom queries, monitor query, and dashboard queries
         #
-        if mappings:
-            if get_document_count(endpoint, awsauth, index, 'index,docs.count'):
-                if remap_index(endpoint, awsauth, index, '{}_temporary'.format(index)):
-                    r = remap_index(
+        if warmup:
+            if monitor_name and monitor_type != 'doc_level_monitor':
+                warmup_queries.append(build_monitor_query(
+                    post_date_field=monitor_range_field,
+                    post_date_from=monitor_range_from,
+                    post_date_to=monitor_range_to,
+                    monitor_query_terms=monitor_query_terms,
+                    aggregations=monitor_aggregations
+                ))
+
+            if initialize_dashboard:
+                warmup_queries.extend(build_dashboard_queries(monitor_range_field))
+
+        #
+        # Note: 'StackId' in 'event' signify cloudformation execution
+        #
+        if request_type == 'Create':
+            #
+            # templates: applied to indices created after deployment (i.e. daily)
+            #
+            if index_template_patterns or data_stream:
+                for name, template in component_templates.items():
+                    r = set_component_template(
                         endpoint,
                         awsauth,
-                        '{}_temporary'.format(index),
-                        index,
-                        mappings=mappings
+                        name,
+                        settings=template.get('settings', {}),
+                        mappings=template.get('mappings', {})
                     )
-                    executions.append(True if r else False)
+                    executions.append({'set_component_template': True} if r else {'set_component_template': False})
 
-                else:
-                    executions.append(False)
+                r = set_index_template(
+                    endpoint,
+                    awsauth,
+                    index_template_name,
+                    index_patterns=index_template_patterns or [index],
+                    priority=index_template_priority,
+                    composed_of=list(component_templates),
+                    shard_number=index_template_shards,
+                    replica_number=index_template_replicas,
+                    mappings=mappings,
+                    data_stream=data_stream,
+                    timestamp_field=data_stream_field
+                )
+                executions.append({'set_index_template': True} if r else {'set_index_template': False})
 
-            else:
-                r = remap_index(endpoint, awsauth, index, mappings=mappings)
-                executions.append({'set_reindex': True} if r else {'set_reindex': False})
+            #
+            # data stream: backing indices are created (and rolled over) using the
+            #     index template, so mappings are not remapped
+            #
+            if data_stream:
+                r = get_data_stream(endpoint, awsauth, index, filter_path='data_streams.name')
+
+                if not r or not r.get('data_streams'):
+                    r = set_data_stream(endpoint, awsauth, index)
+                    executions.append({'set_data_stream': True} if r else {'set_data_stream': False})
+
+                if data_stream_rollover:
+                    r = set_rollover(endpoint, awsauth, index, data_stream_rollover)
+                    executions.append({'set_rollover': True} if r else {'set_rollover': False})
+
+                if data_stream_retention and acquire_lock(lock, lock_wait, executions):
+                    r = expire_data_stream(endpoint, awsauth, index, data_stream_retention)
+                    executions.append({'expire_data_stream': True} if r else {'expire_data_stream': False})
+
+                    release_lock(lock)
 
-        if initialize_dashboard:
             #
-            # create index pattern: used by dashboard
+            # reindex: using index field mapping
             #
-            index_id = index.replace('*', '').rstrip('-').rstrip('_')
-            current_id = check_index_pattern(endpoint, awsauth, index_id=index_id, title=index)
+            if (mappings or reindex_remote) and not data_stream and acquire_lock(lock, lock_wait, executions):
+                with trace('remap', executions, index=index, endpoint=endpoint):
+                    remap_options = {
+                        'shard_number': shard_number,
+                        'replica_number': replica_number,
+                        'target_shard_size': target_shard_size,
+                        'size': reindex_size,
+                        'slices': reindex_slices,
+                        'requests_per_second': reindex_throttle
+                    }
+
+                    #
+                    # remote reindex: copy remote index server-side into new index
+                    #
+                    if reindex_remote:
+                        r = remap_index(
+                            endpoint,
+                            awsauth,
+                            reindex_remote_index,
+                            index,
+                            mappings=mappings,
+                            remote=reindex_remote,
+                            **remap_options
+                        )
+                        executions.append({'remap_index': True} if r else {'remap_index': False})
+
+                    #
+                    # resumable remap: continued across invocations until converged
+                    #
+                    elif remap_mode == 'job':
+                        state = remap_index_job(
+                            endpoint,
+                            awsauth,
+                            index,
+                            state_store,
+                            mappings=mappings,
+                            deadline=time.time() + context.get_remaining_time_in_millis() / 1000 - 120 if context else None,
+                            **remap_options
+                        )
+
+                        if state['phase'] not in ('done', 'failed'):
+                            #
+                            # continued invocation: reacquires the lease held by this invocation
+                            #
+                            if lock:
+                                event['LockOwner'] = lock.owner
+
+                            if continue_invocation(event, context):
+                                if lock:
+                                    lock.stop()
+                                    lock = None
+                                return None
+
+                        executions.append({'remap_index': True} if state['phase'] == 'done' else {'remap_index': False})
+
+                    elif get_count(endpoint, awsauth, index) is not None:
+                        if remap_index(endpoint, awsauth, index, '{}_temporary'.format(index), **remap_options):
+                            r = remap_index(
+                                endpoint,
+                                awsauth,
+                                '{}_temporary'.format(index),
+                                index,
+                                mappings=mappings,
+                                **remap_options
+                            )
+                            executions.append({'remap_index': True} if r else {'remap_index': False})
+
+                        else:
+                            executions.append({'remap_index': False})
+
+                    else:
+                        r = remap_index(endpoint, awsauth, index, mappings=mappings, **remap_options)
+                        executions.append({'set_reindex': True} if r else {'set_reindex': False})
+
+                release_lock(lock)
+
+            if initialize_dashboard:
+                #
+                # create index pattern: used by dashboard
+                #
+                with trace('index_pattern', executions, index=index, endpoint=endpoint):
+                    index_id = index.replace('*', '').rstrip('-').rstrip('_')
+                    current_id = check_index_pattern(endpoint, awsauth, index_id=index_id, title=index)
+
+                    if current_id != index_id:
+                        r = set_index_pattern(endpoint, awsauth, index_id=index_id, title=index)
+                        current_id = check_index_pattern(endpoint, awsauth, index_id=index_id, title=index)
+                        executions.append({'set_index_pattern': True} if r else {'set_index_pattern': False})
+
+                #
+                # create dashboard: if index and index pattern exists
+                #
+                with trace('dashboard', executions, index=index, endpoint=endpoint):
+                    if (
+                        current_id and
+                        check_index(endpoint, awsauth, index) and
+                        check_health(endpoint, awsauth, index) and
+                        not check_dashboard(endpoint, awsauth, index)
+                    ):
+                        r = set_dashboard(endpoint, awsauth, index)
+                        executions.append({'set_dashboard': True} if r else {'set_dashboard': False})
+
+                    else:
+                        executions.append({'set_dashboard': False})
 
-            if current_id != index_id:
-                r = set_index_pattern(endpoint, awsauth, index_id=index_id, title=index)
-                current_id = check_index_pattern(endpoint, awsauth, index_id=index_id, title=index)
-                executions.append({'set_index_pattern': True} if r else {'set_index_pattern': False})
+            #
+            # rollup: downsampled summary index, used by long-range dashboards
+            #
+            if rollup_interval:
+                r = rollup_index(
+                    endpoint,
+                    awsauth,
+                    index,
+                    rollup_target_index,
+                    job_type=rollup_type,
+                    timestamp_field=rollup_field,
+                    interval=rollup_interval,
+                    terms=rollup_terms,
+                    metrics=rollup_metrics,
+                    schedule_interval=rollup_schedule
+                )
+                executions.append({'rollup_index': True} if r else {'rollup_index': False})
 
             #
-            # create dashboard: if index and index pattern exists
+            # saved objects: checked and created in bulk
             #
-            if (
-                current_id and
-                check_index(endpoint, awsauth, index) and
-                not check_dashboard(endpoint, awsauth, index)
-            ):
-                r = set_dashboard(endpoint, awsauth, index)
-                executions.append({'set_dashboard': True} if r else {'set_dashboard': False})
+            if saved_objects:
+                missing = saved_objects if saved_objects_overwrite else check_saved_objects(endpoint, awsauth, saved_objects)
+                r = set_saved_objects(
+                    endpoint,
+                    awsauth,
+                    missing,
+                    overwrite=saved_objects_overwrite
+                ) if missing else True
+                executions.append({'set_saved_objects': True} if r else {'set_saved_objects': False})
 
-            else:
-                executions.append({'set_dashboard': False})
+            if saved_objects_file:
+                r = set_saved_objects_import(
+                    endpoint,
+                    awsauth,
+                    saved_objects_file,
+                    overwrite=saved_objects_overwrite
+                )
+                executions.append({'set_saved_objects_import': True} if r else {'set_saved_objects_import': False})
 
-        #
-        # sns destination
-        #
-        if sns_alert_name and sns_topic_arn and sns_role_arn:
-            try:
-                destination = get_alert_destination(
+            #
+            # sns destination
+            #
+            if sns_alert_name and sns_topic_arn and sns_role_arn:
+                with trace('destination', executions, index=index, endpoint=endpoint):
+                    try:
+                        destination = (get_notification_channel if notification_channel else get_alert_destination)(
+                            endpoint,
+                            awsauth,
+                            sns_alert_name
+                        )
+
+                        r = None
+                        if not destination and notification_channel:
+                            r = set_notification_channel(
+                                endpoint,
+                                awsauth,
+                                sns_alert_name,
+                                sns_topic_arn,
+                                sns_role_arn
+                            )
+
+                        elif not destination:
+                            r = set_alert_destination(
+                                endpoint,
+                                awsauth,
+                                sns_alert_name,
+                                sns_topic_arn,
+                                sns_role_arn
+                            )
+
+                        executions.append({'set_destination': True} if r else {'set_destination': False})
+
+                    except Exception as e:
+                        print('Error (set_alert_destination): attempt failed with {}'.format(e))
+                        executions.append({'set_destination': False})
+
+            ##
+            ## delete document: using provided range
+            ##
+            if document_delete_range and acquire_lock(lock, lock_wait, executions):
+                with trace('delete_document', executions, index=index, endpoint=endpoint):
+                    r = delete_document(endpoint, awsauth, index, document_delete_range)
+                    executions.append({'delete_document': True} if r else {'delete_document': False})
+
+                release_lock(lock)
+
+            ##
+            ## post-processing: merge segments, and shrink indices no longer written
+            ##
+            if force_merge_segments:
+                r = set_forcemerge(
                     endpoint,
                     awsauth,
-                    sns_alert_name
+                    force_merge_index,
+                    max_num_segments=force_merge_segments
                 )
+                executions.append({'set_forcemerge': True} if r else {'set_forcemerge': False})
 
-                r = None
-                if not destination:
-                    r = set_alert_destination(
+            if shrink_source:
+                r = shrink_index(
+                    endpoint,
+                    awsauth,
+                    shrink_source,
+                    shrink_destination,
+                    shard_number=shrink_shards,
+                    replica_number=replica_number
+                )
+                executions.append({'set_shrink': True} if r else {'set_shrink': False})
+
+            if cleanup_pattern:
+                r = cleanup_indices(
+                    endpoint,
+                    awsauth,
+                    cleanup_pattern,
+                    name_regex=cleanup_name_regex,
+                    min_age_days=cleanup_min_age_days,
+                    min_size=cleanup_min_size,
+                    max_size=cleanup_max_size,
+                    max_count=cleanup_max_count,
+                    dry_run=cleanup_dry_run
+                )
+                executions.append({'cleanup_indices': True} if r else {'cleanup_indices': False})
+
+            ##
+            ## monitor: used to setup alerting using exist sns topic
+            ##
+            if monitor_name and sns_alert_name and index and acquire_lock(lock, lock_wait, executions):
+                with trace('monitor', executions, index=index, endpoint=endpoint):
+                    destination_id = (get_notification_channel if notification_channel else get_alert_destination)(
                         endpoint,
                         awsauth,
-                        sns_alert_name,
-                        sns_topic_arn,
-                        sns_role_arn
+                        sns_alert_name
                     )
 
-                executions.append({'set_destination': True} if r else {'set_destination': False})
-
-            except Exception as e:
-                print('Error (set_alert_destination): attempt failed with {}'.format(e))
-                executions.append({'set_destination': False})
+                    if destination_id:
+                        report = check_monitor_cost(
+                            endpoint,
+                            awsauth,
+                            monitor_name,
+                            destination_id,
+                            max_took=monitor_max_took,
+                            max_shards=monitor_max_shards,
+                            state_store=state_store,
+                            timeout=monitor_preflight_wait,
+                            **monitor_options
+                        ) if monitor_preflight else None
+
+                        if report and not report['ok'] and monitor_preflight == 'reject':
+                            print('Error: monitor {} rejected by pre-flight {}'.format(
+                                monitor_name,
+                                report['errors']
+                            ))
+                            executions.append({'set_alert': False})
+
+                        else:
+                            r = set_monitor(
+                                endpoint,
+                                awsauth,
+                                monitor_name,
+                                destination_id=destination_id,
+                                **monitor_options
+                            )
+                            executions.append({'set_alert': True} if r else {'set_alert': False})
+
+                release_lock(lock)
+
+            ##
+            ## warm-up: replay queries against the (new) index before reporting
+            ##
+            if warmup_queries and index:
+                r = warm_index(endpoint, awsauth, index, warmup_queries, repeat=warmup_repeat)
+                executions.append({'warm_index': True} if r else {'warm_index': False})
+
+            ##
+            ## mapping advisor: suggested Mappings for the next remap (logged)
+            ##
+            if mapping_advisor and index:
+                r = check_mapping(endpoint, awsauth, index, min_saving=mapping_min_saving)
+                executions.append({'check_mapping': True} if r else {'check_mapping': False})
+
+        elif request_type == 'Update':
+            #
+            # templates: applied to indices created after deployment (i.e. daily)
+            #
+            if index_template_patterns or data_stream:
+                for name, template in component_templates.items():
+                    r = set_component_template(
+                        endpoint,
+                        awsauth,
+                        name,
+                        settings=template.get('settings', {}),
+                        mappings=template.get('mappings', {})
+                    )
+                    executions.append({'set_component_template': True} if r else {'set_component_template': False})
 
-        ##
-        ## delete document: using provided range
-        ##
-        if document_delete_range:
-            r = delete_document(endpoint, awsauth, index, document_delete_range)
-            executions.append({'delete_document': True} if r else {'delete_document': False})
+                r = set_index_template(
+                    endpoint,
+                    awsauth,
+                    index_template_name,
+                    index_patterns=index_template_patterns or [index],
+                    priority=index_template_priority,
+                    composed_of=list(component_templates),
+                    shard_number=index_template_shards,
+                    replica_number=index_template_replicas,
+                    mappings=mappings,
+                    data_stream=data_stream,
+                    timestamp_field=data_stream_field
+                )
+                executions.append({'set_index_template': True} if r else {'set_index_template': False})
 
-        ##
-        ## monitor: used to setup alerting using exist sns topic
-        ##
-        if monitor_name and sns_alert_name and index:
-            destination_id = get_alert_destination(endpoint, awsauth, sns_alert_name)
+            #
+            # data stream: backing indices are created (and rolled over) using the
+            #     index template, so mappings are not remapped
+            #
+            if data_stream:
+                r = get_data_stream(endpoint, awsauth, index, filter_path='data_streams.name')
+
+                if not r or not r.get('data_streams'):
+                    r = set_data_stream(endpoint, awsauth, index)
+                    executions.append({'set_data_stream': True} if r else {'set_data_stream': False})
+
+                if data_stream_rollover:
+                    r = set_rollover(endpoint, awsauth, index, data_stream_rollover)
+                    executions.append({'set_rollover': True} if r else {'set_rollover': False})
+
+                if data_stream_retention and acquire_lock(lock, lock_wait, executions):
+                    r = expire_data_stream(endpoint, awsauth, index, data_stream_retention)
+                    executions.append({'expire_data_stream': True} if r else {'expire_data_stream': False})
+
+                    release_lock(lock)
+
+            if initialize_dashboard:
+                #
+                # create index pattern: used by dashboard
+                #
+                with trace('index_pattern', executions, index=index, endpoint=endpoint):
+                    index_id = index.replace('*', '').rstrip('-').rstrip('_')
+                    current_id = check_index_pattern(endpoint, awsauth, index_id=index_id, title=index)
+
+                    if current_id and current_id != index_id:
+                        r = set_index_pattern(endpoint, awsauth, index_id=index_id, title=index)
+                        current_id = check_index_pattern(endpoint, awsauth, index_id=index_id, title=index)
+                        executions.append({'set_index_pattern': True} if r else {'set_index_pattern': False})
+
+                #
+                # create dashboard: if index and index pattern exists
+                #
+                with trace('dashboard', executions, index=index, endpoint=endpoint):
+                    if (
+                        current_id and
+                        check_index(endpoint, awsauth, index) and
+                        check_health(endpoint, awsauth, index) and
+                        not check_dashboard(endpoint, awsauth, index)
+                    ):
+                        r = set_dashboard(endpoint, awsauth, index)
+                        executions.append({'set_dashboard': True} if r else {'set_dashboard': False})
+
+                    else:
+                        executions.append({'set_dashboard': False})
 
-            if destination_id:
-                r = set_monitor(
+            #
+            # rollup: downsampled summary index, used by long-range dashboards
+            #
+            if rollup_interval:
+                r = rollup_index(
                     endpoint,
                     awsauth,
-                    monitor_name,
-                    destination_id=destination_id,
-                    indices=[index],
-                    schedule_interval=monitor_interval,
-                    schedule_unit=monitor_unit,
-                    post_date_field=monitor_range_field,
-                    post_date_from=monitor_range_from,
-                    post_date_to=monitor_range_to,
-                    monitor_query_terms=monitor_query_terms,
-                    trigger_condition_source=monitor_condition,
-                    trigger_action_subject=monitor_trigger_subject,
-                    trigger_action_message=monitor_trigger_message
+                    index,
+                    rollup_target_index,
+                    job_type=rollup_type,
+                    timestamp_field=rollup_field,
+                    interval=rollup_interval,
+                    terms=rollup_terms,
+                    metrics=rollup_metrics,
+                    schedule_interval=rollup_schedule
                 )
-                executions.append({'set_alert': True} if r else {'set_alert': False})
+                executions.append({'rollup_index': True} if r else {'rollup_index': False})
 
-    elif request_type == 'Update':
-        if initialize_dashboard:
             #
-            # create index pattern: used by dashboard
+            # saved objects: checked and created in bulk
             #
-            index_id = index.replace('*', '').rstrip('-').rstrip('_')
-            current_id = check_index_pattern(endpoint, awsauth, index_id=index_id, title=index)
+            if saved_objects:
+                missing = saved_objects if saved_objects_overwrite else check_saved_objects(endpoint, awsauth, saved_objects)
+                r = set_saved_objects(
+                    endpoint,
+                    awsauth,
+                    missing,
+                    overwrite=saved_objects_overwrite
+                ) if missing else True
+                executions.append({'set_saved_objects': True} if r else {'set_saved_objects': False})
 
-            if current_id and current_id != index_id:
-                r = set_index_pattern(endpoint, awsauth, index_id=index_id, title=index)
-                current_id = check_index_pattern(endpoint, awsauth, index_id=index_id, title=index)
-                executions.append({'set_index_pattern': True} if r else {'set_index_pattern': False})
+            if saved_objects_file:
+                r = set_saved_objects_import(
+                    endpoint,
+                    awsauth,
+                    saved_objects_file,
+                    overwrite=saved_objects_overwrite
+                )
+                executions.append({'set_saved_objects_import': True} if r else {'set_saved_objects_import': False})
 
             #
-            # create dashboard: if index and index pattern exists
+            # sns destination
             #
-            if (
-                current_id and
-                check_index(endpoint, awsauth, index) and
-                not check_dashboard(endpoint, awsauth, index)
-            ):
-                r = set_dashboard(endpoint, awsauth, index)
-                executions.append({'set_dashboard': True} if r else {'set_dashboard': False})
-
-            else:
-                executions.append({'set_dashboard': False})
+            if sns_alert_name and sns_topic_arn and sns_role_arn:
+                with trace('destination', executions, index=index, endpoint=endpoint):
+                    try:
+                        destination = (get_notification_channel if notification_channel else get_alert_destination)(
+                            endpoint,
+                            awsauth,
+                            sns_alert_name
+                        )
+
+                        r = None
+                        if not destination and notification_channel:
+                            r = set_notification_channel(
+                                endpoint,
+                                awsauth,
+                                sns_alert_name,
+                                sns_topic_arn,
+                                sns_role_arn
+                            )
+
+                        elif not destination:
+                            r = set_alert_destination(
+                                endpoint,
+                                awsauth,
+                                sns_alert_name,
+                                sns_topic_arn,
+                                sns_role_arn,
+                                update=True
+                            )
+
+                        executions.append({'set_destination': True} if r else {'set_destination': False})
+
+                    except Exception as e:
+                        print('Error (set_alert_destination): attempt failed with {}'.format(e))
+                        executions.append({'set_destination': False})
+
+            ##
+            ## delete document: using provided range
+            ##
+            if document_delete_range and acquire_lock(lock, lock_wait, executions):
+                with trace('delete_document', executions, index=index, endpoint=endpoint):
+                    r = delete_document(endpoint, awsauth, index, document_delete_range)
+                    executions.append({'delete_document': True} if r else {'delete_document': False})
+
+                release_lock(lock)
+
+            ##
+            ## post-processing: merge segments, and shrink indices no longer written
+            ##
+            if force_merge_segments:
+                r = set_forcemerge(
+                    endpoint,
+                    awsauth,
+                    force_merge_index,
+                    max_num_segments=force_merge_segments
+                )
+                executions.append({'set_forcemerge': True} if r else {'set_forcemerge': False})
 
-        #
-        # sns destination
-        #
-        if sns_alert_name and sns_topic_arn and sns_role_arn:
-            try:
-                destination = get_alert_destination(
+            if shrink_source:
+                r = shrink_index(
                     endpoint,
                     awsauth,
-                    sns_alert_name
+                    shrink_source,
+                    shrink_destination,
+                    shard_number=shrink_shards,
+                    replica_number=replica_number
                 )
+                executions.append({'set_shrink': True} if r else {'set_shrink': False})
 
-                r = None
-                if not destination:
-                    r = set_alert_destination(
+            if cleanup_pattern:
+                r = cleanup_indices(
+                    endpoint,
+                    awsauth,
+                    cleanup_pattern,
+                    name_regex=cleanup_name_regex,
+                    min_age_days=cleanup_min_age_days,
+                    min_size=cleanup_min_size,
+                    max_size=cleanup_max_size,
+                    max_count=cleanup_max_count,
+                    dry_run=cleanup_dry_run
+                )
+                executions.append({'cleanup_indices': True} if r else {'cleanup_indices': False})
+
+            ##
+            ## monitor: used to setup alerting using exist sns topic
+            ##
+            if monitor_name and sns_alert_name and index and acquire_lock(lock, lock_wait, executions):
+                with trace('monitor', executions, index=index, endpoint=endpoint):
+                    destination_id = (get_notification_channel if notification_channel else get_alert_destination)(
                         endpoint,
                         awsauth,
-                        sns_alert_name,
-                        sns_topic_arn,
-                        sns_role_arn,
-                        update=True
+                        sns_alert_name
                     )
 
-                executions.append({'set_destination': True} if r else {'set_destination': False})
+                    if destination_id:
+                        report = check_monitor_cost(
+                            endpoint,
+                            awsauth,
+                            monitor_name,
+                            destination_id,
+                            max_took=monitor_max_took,
+                            max_shards=monitor_max_shards,
+                            state_store=state_store,
+                            timeout=monitor_preflight_wait,
+                            **monitor_options
+                        ) if monitor_preflight else None
+
+                        if report and not report['ok'] and monitor_preflight == 'reject':
+                            print('Error: monitor {} rejected by pre-flight {}'.format(
+                                monitor_name,
+                                report['errors']
+                            ))
+                            executions.append({'set_alert': False})
+
+                        else:
+                            monitor_id = ''
+                            replaced_id = ''
+                            monitor = get_monitor(
+                                endpoint,
+                                awsauth,
+                                monitor_name,
+                                source=['monitor.monitor_type'],
+                                filter_path='hits.hits._id,hits.hits._source'
+                            )
+
+                            if monitor and monitor.get('hits', {}).get('hits'):
+                                monitor_id = monitor['hits']['hits'][0]['_id']
+                                existing_type = monitor['hits']['hits'][0].get('_source', {}).get(
+                                    'monitor',
+                                    {}
+                                ).get('monitor_type', 'query_level_monitor')
+
+                                #
+                                # monitor type changed: recreated, where the existing monitor is
+                                #     deleted once its replacement is created
+                                #
+                                if existing_type != monitor_type:
+                                    print('Notice: {} monitor type changed from {} to {}, recreating'.format(
+                                        monitor_name,
+                                        existing_type,
+                                        monitor_type
+                                    ))
+                                    replaced_id, monitor_id = monitor_id, ''
+
+                            r = set_monitor(
+                                endpoint,
+                                awsauth,
+                                monitor_name,
+                                destination_id=destination_id,
+                                monitor_id=monitor_id,
+                                **monitor_options
+                            )
+
+                            if r and replaced_id:
+                                r = delete_monitor(endpoint, awsauth, replaced_id)
+
+                            executions.append({'set_alert': True} if r else {'set_alert': False})
+
+                release_lock(lock)
+
+            ##
+            ## warm-up: replay queries against the (new) index before reporting
+            ##
+            if warmup_queries and index:
+                r = warm_index(endpoint, awsauth, index, warmup_queries, repeat=warmup_repeat)
+                executions.append({'warm_index': True} if r else {'warm_index': False})
+
+            ##
+            ## mapping advisor: suggested Mappings for the next remap (logged)
+            ##
+            if mapping_advisor and index:
+                r = check_mapping(endpoint, awsauth, index, min_saving=mapping_min_saving)
+                executions.append({'check_mapping': True} if r else {'check_mapping': False})
+
+        elif request_type == 'Delete':
+            executions.append({'delete': True})
+            pass
 
-            except Exception as e:
-                print('Error (set_alert_destination): attempt failed with {}'.format(e))
-                executions.append({'set_destination': False})
+        else:
+            print('Error: request_type={} is not valid'.format(request_type))
 
-        ##
-        ## delete document: using provided range
-        ##
-        if document_delete_range:
-            r = delete_document(endpoint, awsauth, index, document_delete_range)
-            executions.append({'delete_document': True} if r else {'delete_document': False})
+    finally:
+        release_lock(lock)
 
-        ##
-        ## monitor: used to setup alerting using exist sns topic
-        ##
-        if monitor_name and sns_alert_name and index:
-            destination_id = get_alert_destination(endpoint, awsauth, sns_alert_name)
 
-            if destination_id:
-                monitor_id = ''
-                monitor = get_monitor(endpoint, awsauth, monitor_name)
+    rate_metrics = get_rate_metrics(since=rate_metrics)
 
-                if 'hits' in monitor and 'hits' in monitor['hits']:
-                    monitor_id = monitor['hits']['hits'][0]['_index']
+    if rate_metrics:
+        print('Notice: rate limiter queue wait {}'.format(rate_metrics))
 
-                r = set_monitor(
-                    endpoint,
-                    awsauth,
-                    monitor_name,
-                    destination_id=destination_id,
-                    monitor_id=monitor_id,
-                    indices=[index],
-                    schedule_interval=monitor_interval,
-                    schedule_unit=monitor_unit,
-                    post_date_field=monitor_range_field,
-                    post_date_from=monitor_range_from,
-                    post_date_to=monitor_range_to,
-                    monitor_query_terms=monitor_query_terms,
-                    trigger_condition_source=monitor_condition,
-                    trigger_action_subject=monitor_trigger_subject,
-                    trigger_action_message=monitor_trigger_message
-                )
-                executions.append({'set_alert': True} if r else {'set_alert': False})
+    #
+    # in progress: a duplicate delivery of the request holding the lease is
+    #     answered by that invocation, otherwise the skipped steps are
+    #     reported as already in progress, without failing (i.e. parallel
+    #     stacks)
+    #
+    in_progress = next((x['in_progress'] for x in executions if 'in_progress' in x), None)
 
-    elif request_type == 'Delete':
-        executions.append({'delete': True})
-        pass
+    if in_progress and in_progress == event.get('RequestId'):
+        print('Notice: {} duplicate delivery, response sent by lease holder'.format(in_progress))
+        return None
 
-    else:
-        print('Error: request_type={} is not valid'.format(request_type))
+    if in_progress:
+        print('Notice: {} already in progress by {}'.format(index, in_progress))
 
     #
     # return condition: lambda invoked by cloudformation
@@ -425,7 +2313,10 @@ def lambda_handler(event, context, physicalResourceId=None, noEcho=False):
         response_body['LogicalResourceId'] = event['LogicalResourceId']
         response_body['NoEcho'] = noEcho
 
-        if request_type == 'Create' or request_type == 'Update':
+        if in_progress:
+            response_body['Data'] = {'executions': executions, 'in_progress': in_progress}
+
+        elif request_type == 'Create' or request_type == 'Update':
             response_body['Data'] = {'executions': executions}
 
         else:
@@ -463,4 +2354,5 @@ def lambda_handler(event, context, physicalResourceId=None, noEcho=False):
 
 
 if __name__ == '__main__':
-    lambda_handler()
+    from cli import main
+    sys.exit(main())
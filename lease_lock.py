@@ -0,0 +1,180 @@
+import time
+import uuid
+import threading
+from codec import HEADERS
+from get_configuration import get_document
+from set_configuration import set_document
+from delete_configuration import delete_document_id
+
+
+class LeaseLock:
+    '''
+
+    lease-based lock stored as a document within an opensearch index, so
+    concurrent invocations (i.e. cloudformation retries, or parallel stacks)
+    do not remap, delete, or update the same index at the same time
+
+    The lock document is created using op_type=create, so only one invocation
+    succeeds. The lease expires after 'ttl' seconds unless renewed by the
+    heartbeat, so a crashed invocation does not hold the lock indefinitely.
+    Expired leases are taken over using if_seq_no, and if_primary_term.
+
+    @name, lock document id (i.e. the index name)
+    @owner, lock owner, where an owner reacquires its own lease (i.e. the
+        continued invocations of a resumable remap), otherwise unique per
+        lock, so duplicate deliveries of the same request are serialized
+    @request, request id recorded with the lease (i.e. cloudformation
+        RequestId), so a duplicate delivery can be told apart
+    @ttl, lease duration (seconds)
+
+    '''
+
+    def __init__(
+        self,
+        endpoint,
+        awsauth,
+        name,
+        owner=None,
+        request=None,
+        ttl=300,
+        lock_index='opensearch_customization_lock',
+        headers=HEADERS
+    ):
+        self.endpoint = endpoint
+        self.awsauth = awsauth
+        self.name = name
+        self.owner = owner or str(uuid.uuid4())
+        self.request = request
+        self.ttl = ttl
+        self.lock_index = lock_index
+        self.headers = headers
+        self.holder = None
+        self.holder_request = None
+        self.stopped = threading.Event()
+        self.thread = None
+
+    def get(self):
+        return get_document(self.endpoint, self.awsauth, self.lock_index, self.name, headers=self.headers)
+
+    def set(self, lock=None):
+        '''
+
+        create lease, or renew (take over) the lease read as 'lock'
+
+        '''
+
+        return set_document(
+            self.endpoint,
+            self.awsauth,
+            self.lock_index,
+            {'owner': self.owner, 'request': self.request, 'expires': time.time() + self.ttl},
+            document_id=self.name,
+            op_type=None if lock else 'create',
+            if_seq_no=lock['_seq_no'] if lock else None,
+            if_primary_term=lock['_primary_term'] if lock else None,
+            refresh=True,
+            headers=self.headers
+        )
+
+    def acquire(self, wait=0, poll=5):
+        '''
+
+        acquire lease, and start the heartbeat
+
+        @wait, seconds to wait for a lease held by another owner
+        @return, True if acquired, otherwise False, where 'holder' is the
+            owner of the current lease
+
+        '''
+
+        deadline = time.time() + wait
+
+        while True:
+            if self.set():
+                break
+
+            lock = self.get()
+
+            if lock and lock.get('found'):
+                self.holder = lock['_source'].get('owner')
+                self.holder_request = lock['_source'].get('request')
+
+                if (
+                    (self.holder == self.owner or lock['_source'].get('expires', 0) < time.time()) and
+                    self.set(lock)
+                ):
+                    break
+
+            if time.time() + poll > deadline:
+                return False
+
+            time.sleep(poll)
+
+        self.holder = self.owner
+        self.holder_request = self.request
+        self.stopped.clear()
+        self.thread = threading.Thread(target=self.heartbeat, daemon=True)
+        self.thread.start()
+
+        return True
+
+    def heartbeat(self):
+        '''
+
+        renew the lease every third of the ttl, until stopped, or the lease is
+        no longer owned, or expired (i.e. a frozen container thawed after the
+        ttl, where another owner may already hold the lease)
+
+        '''
+
+        while not self.stopped.wait(self.ttl / 3):
+            lock = self.get()
+
+            if (
+                not lock or
+                not lock.get('found') or
+                lock['_source'].get('owner') != self.owner or
+                lock['_source'].get('expires', 0) < time.time()
+            ):
+                print('Error (LeaseLock): lease on {} lost'.format(self.name))
+                return
+
+            self.set(lock)
+
+    def stop(self):
+        '''
+
+        stop the heartbeat, where the lease is kept until expired (i.e. when
+        the work continues in a subsequent invocation)
+
+        '''
+
+        self.stopped.set()
+
+        if self.thread:
+            self.thread.join()
+            self.thread = None
+
+    def release(self):
+        '''
+
+        stop the heartbeat, and delete the lease if still owned
+
+        '''
+
+        self.stop()
+        lock = self.get()
+
+        if not lock or not lock.get('found') or lock['_source'].get('owner') != self.owner:
+            return False
+
+        return delete_document_id(
+            self.endpoint,
+            self.awsauth,
+            self.lock_index,
+            self.name,
+            if_seq_no=lock['_seq_no'],
+            if_primary_term=lock['_primary_term'],
+            refresh=True,
+            headers=self.headers
+        )
@@ -1,6 +1,13 @@
 import os
-import json
-import requests
+import time
+from transport import session
+from codec import (
+    dumps,
+    loads,
+    encode_path,
+    HEADERS,
+    DASHBOARD_HEADERS
+)
 
 
 def set_new_index(
@@ -10,13 +17,17 @@ def set_new_index(
     shard_number=1,
     replica_number=1,
     mappings={},
-    headers=json.loads(os.getenv('Headers', '{"Content-Type": "application/json"}').strip()),
-    update=False
+    headers=HEADERS,
+    update=False,
+    wait_for_active_shards=None
 ):
     '''
 
     create new index with specified mapping
 
+    @wait_for_active_shards, hold the request server-side until the specified
+        number of shard copies are active (i.e. 1 for primaries, or 'all')
+
     '''
 
     if not index_name:
@@ -36,15 +47,26 @@ def set_new_index(
         'mappings': mappings
     }
 
+    path = index_name
+
+    if wait_for_active_shards:
+        path = '{}?wait_for_active_shards={}'.format(index_name, wait_for_active_shards)
+
     try:
-        r = requests.put(
-            '{}/{}'.format(endpoint, index_name),
+        r = session.put(
+            '{}/{}'.format(endpoint, path),
             auth=awsauth,
-            json=payload,
+            data=dumps(payload),
             headers=headers
         )
 
         if r.ok:
+            if wait_for_active_shards and not loads(r.content).get('shards_acknowledged'):
+                print('Notice (set_new_index): {} created, but {} active shards not acknowledged'.format(
+                    index_name,
+                    wait_for_active_shards
+                ))
+
             print('Notice: {} index created'.format(index_name))
             return True
 
@@ -60,397 +82,1747 @@ def set_new_index(
     return False
 
 
-def set_reindex(
+def set_component_template(
     endpoint,
     awsauth,
-    source_index,
-    destination_index,
-    headers=json.loads(os.getenv('Headers', '{"Content-Type": "application/json"}').strip())
+    template_name,
+    shard_number=None,
+    replica_number=None,
+    settings={},
+    mappings={},
+    headers=HEADERS
 ):
     '''
 
-    reindex old index into new index
+    create or replace component template, which can be composed into one or
+    more index templates
 
-    '''
+    @settings, additional index settings merged with the shard and replica
+        number (i.e. {'refresh_interval': '30s'})
 
-    if source_index and destination_index:
-        path = '_reindex'
-        payload = {
-          'source': {
-            'index': source_index
-          },
-          'dest': {
-            'index': destination_index
-          }
-        }
+    '''
 
-    else:
-        print('Error (set_reindex): path and payload not configured')
+    if not template_name:
+        print('Error (set_component_template): template_name not provided')
         return False
 
-    #
-    # configure opensearch index pattern
-    #
+    path = '_component_template/{}'.format(template_name)
+    index_settings = dict(settings)
+
+    if shard_number:
+        index_settings['number_of_shards'] = shard_number
+
+    if replica_number is not None:
+        index_settings['number_of_replicas'] = replica_number
+
+    payload = {'template': {}}
+
+    if index_settings:
+        payload['template']['settings'] = {'index': index_settings}
+
+    if mappings:
+        payload['template']['mappings'] = mappings
+
     try:
-        r = requests.post(
+        r = session.put(
             '{}/{}'.format(endpoint, path),
             auth=awsauth,
-            json=payload,
+            data=dumps(payload),
             headers=headers
         )
 
         if r.ok:
-            print('Notice: opensearch reindex from {} to {}'.format(
-                source_index,
-                destination_index
-            ))
+            print('Notice: {} component template configured'.format(template_name))
             return True
 
-        print('Notice (set_reindex): on {} returned {}'.format(
+        print('Notice (set_component_template): on {} returned {}'.format(
             path,
             r.status_code
         ))
 
     except Exception as e:
-        print('Error (set_reindex): {}'.format(e))
+        print('Error (set_component_template): {}'.format(e))
         return False
 
     return False
 
 
-def set_index_pattern(
+def set_index_template(
     endpoint,
     awsauth,
-    index_id=None,
-    title=None,
-    headers=json.loads(os.getenv('Headers', '{"Content-Type": "application/json", "osd-xsrf": "true"}').strip()),
-    update=False
+    template_name,
+    index_patterns=[],
+    priority=0,
+    composed_of=[],
+    shard_number=None,
+    replica_number=None,
+    settings={},
+    mappings={},
+    headers=HEADERS,
+    data_stream=False,
+    timestamp_field=None
 ):
     '''
 
-    set opensearch index pattern
+    create or replace composable index template, applied to every index created
+    with a name matching one of the index patterns
 
-    '''
+    @index_patterns, list of wildcard expressions (i.e. ['logs-*'])
+    @priority, when multiple templates match a new index, the highest priority
+        template is applied
+    @composed_of, ordered list of component template names, where settings and
+        mappings defined directly in this template take precedence
+    @data_stream, matching names are created as data streams (see
+        set_data_stream), rather than plain indices
+    @timestamp_field, data stream timestamp field (default '@timestamp')
 
-    if index_id and title:
-        path = '_dashboards/api/saved_objects/index-pattern/{}'.format(index_id)
-        payload = {
-            'attributes': {'title': title}
-        }
+    '''
 
-    else:
-        print('Error (set_index_pattern): path and payload not configured')
+    if not template_name or not index_patterns:
+        print('Error (set_index_template): {} and {} must be provided'.format(
+            'template_name ({})'.format(template_name),
+            'index_patterns ({})'.format(index_patterns)
+        ))
         return False
 
-    #
-    # configure opensearch index pattern
-    #
-    try:
-        if update:
-            r = requests.put(
-                '{}/{}'.format(endpoint, path),
-                auth=awsauth,
-                json=payload,
-                headers=headers
-            )
+    path = '_index_template/{}'.format(template_name)
+    index_settings = dict(settings)
 
-        else:
-            r = requests.post(
-                '{}/{}'.format(endpoint, path),
-                auth=awsauth,
-                json=payload,
-                headers=headers
-            )
+    if shard_number:
+        index_settings['number_of_shards'] = shard_number
+
+    if replica_number is not None:
+        index_settings['number_of_replicas'] = replica_number
+
+    payload = {
+        'index_patterns': index_patterns,
+        'priority': priority,
+        'composed_of': composed_of,
+        'template': {}
+    }
+
+    if data_stream:
+        payload['data_stream'] = {'timestamp_field': {'name': timestamp_field}} if timestamp_field else {}
+
+    if index_settings:
+        payload['template']['settings'] = {'index': index_settings}
+
+    if mappings:
+        payload['template']['mappings'] = mappings
+
+    try:
+        r = session.put(
+            '{}/{}'.format(endpoint, path),
+            auth=awsauth,
+            data=dumps(payload),
+            headers=headers
+        )
 
         if r.ok:
-            print('Notice: opensearch index pattern configured')
+            print('Notice: {} index template configured for {}'.format(
+                template_name,
+                index_patterns
+            ))
             return True
 
-        print('Notice (set_index_pattern): on {} returned {}'.format(
+        print('Notice (set_index_template): on {} returned {}'.format(
             path,
             r.status_code
         ))
 
     except Exception as e:
-        print('Error (set_index_pattern): {}'.format(e))
+        print('Error (set_index_template): {}'.format(e))
         return False
 
     return False
 
 
-def set_alert_destination(
+def set_data_stream(
     endpoint,
     awsauth,
-    sns_alert_name=None,
-    sns_topic_arn=None,
-    sns_role_arn=None,
-    headers=json.loads(os.getenv('Headers', '{"Content-Type": "application/json"}').strip()),
-    update=False,
+    data_stream_name,
+    headers=HEADERS
 ):
     '''
 
-    set sns alerting destination
+    create data stream, where an index template with 'data_stream' enabled
+    must match the data stream name (see set_index_template)
 
-    '''
+    Note: data streams are append-only, where documents are indexed using
+          op_type=create, and require the timestamp field
 
-    #
-    # define payload and path
-    #
-    if sns_alert_name and sns_topic_arn and sns_role_arn:
-        path = '_plugins/_alerting/destinations'
-        payload = {
-            'name': sns_alert_name,
-            'type': 'sns',
-            'sns': {
-                'topic_arn': sns_topic_arn,
-                'role_arn': sns_role_arn
-            }
-        }
+    '''
 
-    else:
-        print('Error (set_alert_destination): path and payload not configured')
+    if not data_stream_name:
+        print('Error (set_data_stream): data_stream_name must be provided')
         return False
 
-    #
-    # configure opensearch domain
-    #
-    try:
-        if update:
-            r = requests.put(
-                '{}/{}'.format(endpoint, path),
-                auth=awsauth,
-                json=payload,
-                headers=headers
-            )
+    path = '_data_stream/{}'.format(data_stream_name)
 
-        else:
-            r = requests.post(
-                '{}/{}'.format(endpoint, path),
-                auth=awsauth,
-                json=payload,
-                headers=headers
-            )
+    try:
+        r = session.put(
+            '{}/{}'.format(endpoint, path),
+            auth=awsauth,
+            headers=headers
+        )
 
         if r.ok:
-            print('Notice: sns destination configured')
+            print('Notice: {} data stream created'.format(data_stream_name))
             return True
 
-        print('Notice (set_alert_destination): on {} returned {}'.format(
+        print('Notice (set_data_stream): on {} returned {}'.format(
             path,
             r.status_code
         ))
 
     except Exception as e:
-        print('Error (set_alert_destination): {}'.format(e))
+        print('Error (set_data_stream): {}'.format(e))
         return False
 
     return False
 
 
-def set_dashboard(
+def set_rollover(
     endpoint,
     awsauth,
-    title=None,
-    headers=json.loads(os.getenv('Headers', '{"Content-Type": "application/json", "osd-xsrf": "true"}').strip()),
-    update=False
+    alias,
+    conditions={},
+    headers=HEADERS
 ):
     '''
 
-    create opensearch dashboard
+    roll over data stream (or alias) onto a new write index, when any of the
+    specified conditions is met, or unconditionally if none are provided
 
-    '''
+    @conditions, object with the following structure
 
-    if title:
-        path = '_dashboards/api/saved_objects/dashboard/{}'.format(title)
-        payload = {
-            'attributes': {'title': title}
+        {
+            "max_age": "1d",
+            "max_docs": 100000000,
+            "max_size": "50gb"
         }
 
-    else:
-        print('Error (set_dashboard): path and payload not configured')
+    @return, new write index if rolled over, True if no condition was met,
+        otherwise False
+
+    '''
+
+    if not alias:
+        print('Error (set_rollover): alias must be provided')
         return False
 
-    try:
-        if update:
-            r = requests.put(
-                '{}/{}'.format(endpoint, path),
-                auth=awsauth,
-                json=payload,
-                headers=headers
-            )
+    path = '{}/_rollover'.format(alias)
 
-        else:
-            r = requests.post(
-                '{}/{}'.format(endpoint, path),
-                auth=awsauth,
-                json=payload,
-                headers=headers
-            )
+    try:
+        r = session.post(
+            '{}/{}'.format(endpoint, path),
+            auth=awsauth,
+            data=dumps({'conditions': conditions}) if conditions else None,
+            headers=headers
+        )
 
         if r.ok:
-            print('Notice: dashboard created')
+            response = loads(r.content)
+
+            if response.get('rolled_over'):
+                print('Notice: {} rolled over from {} to {}'.format(
+                    alias,
+                    response.get('old_index'),
+                    response.get('new_index')
+                ))
+                return response.get('new_index') or True
+
             return True
 
-        print('Notice (set_dashboard): on {} returned {}'.format(
+        print('Notice (set_rollover): on {} returned {}'.format(
             path,
             r.status_code
         ))
 
     except Exception as e:
-        print('Error (set_dashboard): {}'.format(e))
-        return None
+        print('Error (set_rollover): {}'.format(e))
+        return False
 
     return False
 
 
-def set_monitor(
+def set_document(
     endpoint,
     awsauth,
-    monitor_name,
-    destination_id=None,
-    monitor_id='',
-    indices=[],
-    query_size=0,
-    schedule_interval=5,
-    schedule_unit='MINUTES',
-    post_date_field='timestamp',
-    post_date_from='now-1h',
-    post_date_to='now',
-    post_date_include_lower='true',
-    post_date_include_upper='true',
-    post_date_format='epoch_millis',
-    adjust_pure_negative='true',
-    monitor_query_terms={},
-    aggregations={},
-    trigger_name=None,
-    trigger_severity='1',
-    trigger_condition_source='ctx.results[0].hits.total.value > 5',
-    trigger_action_name=None,
-    trigger_action_subject='Monitor Triggered',
-    trigger_action_message='Monitor detected satisfying condition',
-    trigger_action_throttle_enabled='false',
-    headers=json.loads(os.getenv('Headers', '{"Content-Type": "application/json"}').strip())
+    index_name,
+    document,
+    document_id=None,
+    op_type=None,
+    if_seq_no=None,
+    if_primary_term=None,
+    refresh=False,
+    headers=HEADERS
 ):
     '''
 
-    set monitor to run query and check whether results should trigger any alerts
+    index single document
 
-    @monitor_id, if provided update monitor by specified id
-    @monitor_query_terms, has an object structure as follows, where 'status' is
-        a field within the cluster index:
+    @op_type, 'create' fails (409) if the document id already exists
+    @if_seq_no, with if_primary_term, fails (409) unless the document was not
+        modified since it was read (see get_document)
+    @refresh, make the document immediately visible to search
 
-        {
-            'status': ['fail'],
-            'boost': 1
-        }
+    '''
 
-    @trigger_condition_source, the condition will be applied to the ctx.results,
-        which is a byproduct of the 'monitor_query_terms' (acting as a filter)
+    if not index_name or not document:
+        print('Error (set_document): index_name and document must be provided')
+        return False
 
-    '''
+    params = ['refresh=true'] if refresh else []
 
-    if monitor_name and destination_id and indices:
-        suffix = '/{}'.format(monitor_id) if monitor_id else ''
-        path = '_plugins/_alerting/monitors{}'.format(suffix)
-        payload = {
-            'type': 'monitor',
-            'name': monitor_name,
-            'monitor_type': 'query_level_monitor',
-            'enabled': 'true',
-            'schedule': {
-                'period': {
-                    'interval': schedule_interval,
-                    'unit': schedule_unit
-                }
-            },
-            'inputs': [{
-                'search': {
-                    'indices': indices,
-                    'query': {
-                        'size': query_size,
-                        'query': {
-                            'bool': {
-                                'filter': [{
-                                    'range': {
-                                        post_date_field: {
-                                            'gte': post_date_from,
-                                            'lt': post_date_to,
-                                            'include_lower': post_date_include_lower,
-                                            'include_upper': post_date_include_upper,
-                                            'format': post_date_format
-                                        }
-                                    }
-                                }, {
-                                    'terms': monitor_query_terms
-                                }]
-                            }
-                        },
-                        'aggregations': aggregations
-                    }
-                }
-            }],
-            'triggers': [{
-                'name': trigger_name if trigger_name else monitor_name,
-                'severity': trigger_severity,
-                'condition': {
-                    'script': {
-                        'source': trigger_condition_source,
-                        'lang': 'painless'
-                    }
-                },
-                'actions': [{
-                    'name': trigger_action_name if trigger_action_name else monitor_name,
-                    'destination_id': destination_id,
-                    'message_template': {
-                        'source': trigger_action_message
-                    },
-                    'throttle_enabled': trigger_action_throttle_enabled,
-                    'subject_template': {
-                        'source': trigger_action_subject
-                    }
-                }]
-            }]
-        }
+    if op_type:
+        params.append('op_type={}'.format(op_type))
 
-    else:
-        monitor_name and destination_id and indices
-        print('Error (set_monitor): {}, {}, and {} must be provided'.format(
-            'monitor_name ({})'.format(monitor_name),
-            'destination_id ({})'.format(destination_id),
-            'indices ({})'.format(indices)
-        ))
-        return False
+    if if_seq_no is not None and if_primary_term is not None:
+        params.append('if_seq_no={}&if_primary_term={}'.format(if_seq_no, if_primary_term))
+
+    path = '{}/_doc{}{}'.format(
+        index_name,
+        '/{}'.format(document_id) if document_id else '',
+        '?{}'.format('&'.join(params)) if params else ''
+    )
 
     try:
-        if monitor_id:
-            r = requests.put(
+        if document_id:
+            r = session.put(
                 '{}/{}'.format(endpoint, path),
                 auth=awsauth,
-                json=payload,
+                data=dumps(document),
                 headers=headers
             )
 
         else:
-            r = requests.post(
+            r = session.post(
                 '{}/{}'.format(endpoint, path),
                 auth=awsauth,
-                json=payload,
+                data=dumps(document),
                 headers=headers
             )
 
         if r.ok:
-            print('Notice: monitor {}'.format(
-                '{} updated'.format(monitor_id) if monitor_id else 'created'
-            ))
             return True
 
-        print('Notice (set_monitor): on {} returned {}'.format(
+        print('Notice (set_document): on {} returned {}'.format(
             path,
             r.status_code
         ))
 
     except Exception as e:
-        print('Error (set_monitor): {}'.format(e))
-        return None
+        print('Error (set_document): {}'.format(e))
+        return False
+
+    return False
+
+
+def set_bulk(
+    endpoint,
+    awsauth,
+    index_name,
+    documents,
+    refresh=False,
+    headers=HEADERS
+):
+    '''
+
+    index multiple documents using a single _bulk request
+
+    @documents, list of documents, where each is indexed with a generated id
+    @refresh, make the documents immediately visible to search
+
+    Note: the response is limited to failed items, so large batches are not
+          returned in full
+
+    '''
+
+    if not index_name or not documents:
+        print('Error (set_bulk): index_name and documents must be provided')
+        return False
+
+    path = encode_path(
+        '{}/_bulk'.format(index_name),
+        refresh=True if refresh else None,
+        filter_path='errors,items.*.error'
+    )
+    action = dumps({'index': {}})
+    payload = b''.join(
+        b'%s\n%s\n' % (action, dumps(x)) for x in documents
+    )
+
+    try:
+        r = session.post(
+            '{}/{}'.format(endpoint, path),
+            auth=awsauth,
+            data=payload,
+            headers=dict(headers, **{'Content-Type': 'application/x-ndjson'})
+        )
+
+        if r.ok:
+            response = loads(r.content)
+
+            if not response.get('errors'):
+                return True
+
+            errors = [list(x.values())[0]['error'] for x in response.get('items', [])]
+            print('Notice (set_bulk): {} documents failed on {}, first error {}'.format(
+                len(errors),
+                index_name,
+                errors[0] if errors else None
+            ))
+            return False
+
+        print('Notice (set_bulk): on {} returned {}'.format(
+            path,
+            r.status_code
+        ))
+
+    except Exception as e:
+        print('Error (set_bulk): {}'.format(e))
+        return False
+
+    return False
+
+
+def set_async_search(
+    endpoint,
+    awsauth,
+    indices,
+    query,
+    wait_for_completion_timeout='1s',
+    keep_alive='1h',
+    keep_on_completion=True,
+    filter_path=None,
+    headers=HEADERS
+):
+    '''
+
+    submit asynchronous search, which continues server-side after the request
+    returns, where the results are fetched using get_async_search
+
+    @wait_for_completion_timeout, time the request waits for the search, where
+        searches completed within the timeout return their results directly
+    @keep_alive, time the search (and its results) is retained, extended on
+        each get_async_search
+    @keep_on_completion, retain the results of searches completed within
+        'wait_for_completion_timeout', so they can be fetched again
+    @filter_path, limit response to specified paths (i.e. 'id,state')
+    @return, response with the search 'id', 'state', and (partial) 'response'
+
+    '''
+
+    if not indices or not query:
+        print('Error (set_async_search): indices and query must be provided')
+        return False
+
+    path = encode_path(
+        '_plugins/_asynchronous_search',
+        index=','.join(indices),
+        wait_for_completion_timeout=wait_for_completion_timeout,
+        keep_alive=keep_alive,
+        keep_on_completion=keep_on_completion,
+        filter_path=filter_path
+    )
+
+    try:
+        r = session.post(
+            '{}/{}'.format(endpoint, path),
+            auth=awsauth,
+            data=dumps(query),
+            headers=headers
+        )
+
+        if r.ok:
+            return loads(r.content)
+
+        print('Notice (set_async_search): on {} returned {}'.format(
+            path,
+            r.status_code
+        ))
+
+    except Exception as e:
+        print('Error (set_async_search): {}'.format(e))
+        return False
+
+    return False
+
+
+def set_reindex(
+    endpoint,
+    awsauth,
+    source_index,
+    destination_index,
+    headers=HEADERS,
+    wait_for_completion=True,
+    refresh=False,
+    remote=None,
+    size=None,
+    slices=None,
+    requests_per_second=None
+):
+    '''
+
+    reindex old index into new index
+
+    @wait_for_completion, if False the reindex runs as a task, and the task id
+        is returned, which can be tracked using get_task
+    @refresh, refresh the destination index once the reindex completes, so
+        the copied documents are immediately searchable (and counted)
+    @remote, reindex from a remote cluster, where the remote host must be
+        listed in the 'reindex.remote.allowlist' setting of the destination
+
+        {
+            "host": "https://other-domain:443",
+            "username": "user",
+            "password": "pass",
+            "socket_timeout": "1m",
+            "connect_timeout": "10s"
+        }
+
+    @size, number of documents per scroll batch
+    @slices, number of parallel sub-tasks (or 'auto'), not supported with
+        'remote'
+    @requests_per_second, throttle the reindex (sub-requests per second)
+
+    '''
+
+    if remote and slices:
+        print('Notice (set_reindex): slices not supported from remote {}, ignored'.format(remote.get('host')))
+        slices = None
+
+    if source_index and destination_index:
+        path = encode_path(
+            '_reindex',
+            wait_for_completion=bool(wait_for_completion),
+            refresh=bool(refresh),
+            slices=slices,
+            requests_per_second=requests_per_second
+        )
+        payload = {
+          'source': {
+            'index': source_index
+          },
+          'dest': {
+            'index': destination_index
+          }
+        }
+
+        if remote:
+            payload['source']['remote'] = {
+                k: v for k, v in remote.items() if k in (
+                    'host',
+                    'username',
+                    'password',
+                    'headers',
+                    'socket_timeout',
+                    'connect_timeout'
+                )
+            }
+
+        if size:
+            payload['source']['size'] = size
+
+    else:
+        print('Error (set_reindex): path and payload not configured')
+        return False
+
+    #
+    # configure opensearch index pattern
+    #
+    try:
+        r = session.post(
+            '{}/{}'.format(endpoint, path),
+            auth=awsauth,
+            data=dumps(payload),
+            headers=headers
+        )
+
+        if r.ok:
+            task_id = None if wait_for_completion else loads(r.content).get('task')
+            print('Notice: opensearch reindex from {}{} to {}{}'.format(
+                '{}/'.format(remote['host']) if remote else '',
+                source_index,
+                destination_index,
+                ' started as task {}'.format(task_id) if task_id else ''
+            ))
+            return task_id or True
+
+        print('Notice (set_reindex): on {} returned {}'.format(
+            path,
+            r.status_code
+        ))
+
+    except Exception as e:
+        print('Error (set_reindex): {}'.format(e))
+        return False
+
+    return False
+
+
+def set_index_settings(
+    endpoint,
+    awsauth,
+    index_name,
+    settings={},
+    headers=HEADERS
+):
+    '''
+
+    update dynamic settings of an existing index
+
+    @settings, flattened or nested index settings, where None resets a
+        setting to its default (i.e. {'index.blocks.write': None})
+
+    '''
+
+    if index_name and settings:
+        path = '{}/_settings'.format(index_name)
+
+    else:
+        print('Error (set_index_settings): index_name and settings must be provided')
+        return False
+
+    try:
+        r = session.put(
+            '{}/{}'.format(endpoint, path),
+            auth=awsauth,
+            data=dumps(settings),
+            headers=headers
+        )
+
+        if r.ok:
+            print('Notice: {} settings updated with {}'.format(index_name, settings))
+            return True
+
+        print('Notice (set_index_settings): on {} returned {}'.format(
+            path,
+            r.status_code
+        ))
+
+    except Exception as e:
+        print('Error (set_index_settings): {}'.format(e))
+        return False
+
+    return False
+
+
+def set_forcemerge(
+    endpoint,
+    awsauth,
+    index_name,
+    max_num_segments=1,
+    wait_for_completion=False,
+    headers=HEADERS
+):
+    '''
+
+    merge index segments, intended for indices no longer receiving writes
+
+    @wait_for_completion, if False the merge runs as a task, and the task id
+        is returned, which can be tracked using get_task
+
+    '''
+
+    if index_name:
+        path = '{}/_forcemerge?max_num_segments={}&wait_for_completion={}'.format(
+            index_name,
+            max_num_segments,
+            'true' if wait_for_completion else 'false'
+        )
+
+    else:
+        print('Error (set_forcemerge): index_name not provided')
+        return False
+
+    try:
+        r = session.post(
+            '{}/{}'.format(endpoint, path),
+            auth=awsauth,
+            headers=headers
+        )
+
+        if r.ok:
+            task_id = None if wait_for_completion else loads(r.content).get('task')
+            print('Notice: {} forcemerge to {} segments {}'.format(
+                index_name,
+                max_num_segments,
+                'started as task {}'.format(task_id) if task_id else 'completed'
+            ))
+            return task_id or True
+
+        print('Notice (set_forcemerge): on {} returned {}'.format(
+            path,
+            r.status_code
+        ))
+
+    except Exception as e:
+        print('Error (set_forcemerge): {}'.format(e))
+        return False
+
+    return False
+
+
+def set_shrink(
+    endpoint,
+    awsauth,
+    source_index,
+    destination_index,
+    shard_number=1,
+    replica_number=1,
+    headers=HEADERS
+):
+    '''
+
+    shrink source index into new index with fewer primary shards
+
+    @shard_number, must be a factor of the source index primary shard number
+
+    Note: the source index must be read-only, with a copy of every shard
+          allocated on the same node (see shrink_index in lambda.py)
+
+    '''
+
+    if source_index and destination_index:
+        path = '{}/_shrink/{}'.format(source_index, destination_index)
+        payload = {
+            'settings': {
+                'index.number_of_shards': shard_number,
+                'index.number_of_replicas': replica_number,
+                'index.routing.allocation.require._name': None,
+                'index.blocks.write': None
+            }
+        }
+
+    else:
+        print('Error (set_shrink): path and payload not configured')
+        return False
+
+    try:
+        r = session.post(
+            '{}/{}'.format(endpoint, path),
+            auth=awsauth,
+            data=dumps(payload),
+            headers=headers
+        )
+
+        if r.ok:
+            print('Notice: {} shrunk into {} with {} shards'.format(
+                source_index,
+                destination_index,
+                shard_number
+            ))
+            return True
+
+        print('Notice (set_shrink): on {} returned {}'.format(
+            path,
+            r.status_code
+        ))
+
+    except Exception as e:
+        print('Error (set_shrink): {}'.format(e))
+        return False
+
+    return False
+
+
+def set_index_pattern(
+    endpoint,
+    awsauth,
+    index_id=None,
+    title=None,
+    headers=DASHBOARD_HEADERS,
+    update=False
+):
+    '''
+
+    set opensearch index pattern
+
+    '''
+
+    if index_id and title:
+        path = '_dashboards/api/saved_objects/index-pattern/{}'.format(index_id)
+        payload = {
+            'attributes': {'title': title}
+        }
+
+    else:
+        print('Error (set_index_pattern): path and payload not configured')
+        return False
+
+    #
+    # configure opensearch index pattern
+    #
+    try:
+        if update:
+            r = session.put(
+                '{}/{}'.format(endpoint, path),
+                auth=awsauth,
+                data=dumps(payload),
+                headers=headers
+            )
+
+        else:
+            r = session.post(
+                '{}/{}'.format(endpoint, path),
+                auth=awsauth,
+                data=dumps(payload),
+                headers=headers
+            )
+
+        if r.ok:
+            print('Notice: opensearch index pattern configured')
+            return True
+
+        print('Notice (set_index_pattern): on {} returned {}'.format(
+            path,
+            r.status_code
+        ))
+
+    except Exception as e:
+        print('Error (set_index_pattern): {}'.format(e))
+        return False
+
+    return False
+
+
+def set_alert_destination(
+    endpoint,
+    awsauth,
+    sns_alert_name=None,
+    sns_topic_arn=None,
+    sns_role_arn=None,
+    headers=HEADERS,
+    update=False,
+):
+    '''
+
+    set sns alerting destination
+
+    '''
+
+    #
+    # define payload and path
+    #
+    if sns_alert_name and sns_topic_arn and sns_role_arn:
+        path = '_plugins/_alerting/destinations'
+        payload = {
+            'name': sns_alert_name,
+            'type': 'sns',
+            'sns': {
+                'topic_arn': sns_topic_arn,
+                'role_arn': sns_role_arn
+            }
+        }
+
+    else:
+        print('Error (set_alert_destination): path and payload not configured')
+        return False
+
+    #
+    # configure opensearch domain
+    #
+    try:
+        if update:
+            r = session.put(
+                '{}/{}'.format(endpoint, path),
+                auth=awsauth,
+                data=dumps(payload),
+                headers=headers
+            )
+
+        else:
+            r = session.post(
+                '{}/{}'.format(endpoint, path),
+                auth=awsauth,
+                data=dumps(payload),
+                headers=headers
+            )
+
+        if r.ok:
+            print('Notice: sns destination configured')
+            return True
+
+        print('Notice (set_alert_destination): on {} returned {}'.format(
+            path,
+            r.status_code
+        ))
+
+    except Exception as e:
+        print('Error (set_alert_destination): {}'.format(e))
+        return False
+
+    return False
+
+
+def set_notification_channel(
+    endpoint,
+    awsauth,
+    channel_name=None,
+    sns_topic_arn=None,
+    sns_role_arn=None,
+    channel_id=None,
+    headers=HEADERS
+):
+    '''
+
+    set sns notification channel (notifications plugin), which supersedes the
+    alerting destinations in OpenSearch 2.0+
+
+    @channel_id, if provided update channel by specified id
+
+    '''
+
+    if channel_name and sns_topic_arn and sns_role_arn:
+        path = '_plugins/_notifications/configs{}'.format(
+            '/{}'.format(channel_id) if channel_id else ''
+        )
+        payload = {
+            'config': {
+                'name': channel_name,
+                'description': channel_name,
+                'config_type': 'sns',
+                'is_enabled': True,
+                'sns': {
+                    'topic_arn': sns_topic_arn,
+                    'role_arn': sns_role_arn
+                }
+            }
+        }
+
+    else:
+        print('Error (set_notification_channel): path and payload not configured')
+        return False
+
+    try:
+        if channel_id:
+            r = session.put(
+                '{}/{}'.format(endpoint, path),
+                auth=awsauth,
+                data=dumps(payload),
+                headers=headers
+            )
+
+        else:
+            r = session.post(
+                '{}/{}'.format(endpoint, path),
+                auth=awsauth,
+                data=dumps(payload),
+                headers=headers
+            )
+
+        if r.ok:
+            print('Notice: sns notification channel configured')
+            return True
+
+        print('Notice (set_notification_channel): on {} returned {}'.format(
+            path,
+            r.status_code
+        ))
+
+    except Exception as e:
+        print('Error (set_notification_channel): {}'.format(e))
+        return False
+
+    return False
+
+
+def set_dashboard(
+    endpoint,
+    awsauth,
+    title=None,
+    headers=DASHBOARD_HEADERS,
+    update=False
+):
+    '''
+
+    create opensearch dashboard
+
+    '''
+
+    if title:
+        path = '_dashboards/api/saved_objects/dashboard/{}'.format(title)
+        payload = {
+            'attributes': {'title': title}
+        }
+
+    else:
+        print('Error (set_dashboard): path and payload not configured')
+        return False
+
+    try:
+        if update:
+            r = session.put(
+                '{}/{}'.format(endpoint, path),
+                auth=awsauth,
+                data=dumps(payload),
+                headers=headers
+            )
+
+        else:
+            r = session.post(
+                '{}/{}'.format(endpoint, path),
+                auth=awsauth,
+                data=dumps(payload),
+                headers=headers
+            )
+
+        if r.ok:
+            print('Notice: dashboard created')
+            return True
+
+        print('Notice (set_dashboard): on {} returned {}'.format(
+            path,
+            r.status_code
+        ))
+
+    except Exception as e:
+        print('Error (set_dashboard): {}'.format(e))
+        return None
+
+    return False
+
+
+def build_monitor_query(
+    query_size=0,
+    post_date_field='timestamp',
+    post_date_from='now-1h',
+    post_date_to='now',
+    post_date_include_lower='true',
+    post_date_include_upper='true',
+    post_date_format='epoch_millis',
+    monitor_query_terms={},
+    aggregations={}
+):
+    '''
+
+    build search request body executed by query and bucket level monitors
+
+    '''
+
+    query_filter = [{
+        'range': {
+            post_date_field: {
+                'gte': post_date_from,
+                'lt': post_date_to,
+                'include_lower': post_date_include_lower,
+                'include_upper': post_date_include_upper,
+                'format': post_date_format
+            }
+        }
+    }]
+
+    if monitor_query_terms:
+        query_filter.append({'terms': monitor_query_terms})
+
+    return {
+        'size': query_size,
+        'query': {
+            'bool': {
+                'filter': query_filter
+            }
+        },
+        'aggregations': aggregations
+    }
+
+
+def build_dashboard_queries(
+    post_date_field='timestamp',
+    ranges=[('now-15m/m', '30s'), ('now-7d/h', '3h')]
+):
+    '''
+
+    build search request bodies resembling dashboard visualizations, where
+    documents within each (range, interval) pair are counted per interval
+
+    '''
+
+    return [build_monitor_query(
+        post_date_field=post_date_field,
+        post_date_from=date_from,
+        post_date_to='now/m',
+        aggregations={
+            'histogram': {
+                'date_histogram': {
+                    'field': post_date_field,
+                    'fixed_interval': interval
+                }
+            }
+        }
+    ) for date_from, interval in ranges]
+
+
+def build_doc_level_queries(monitor_query_terms={}):
+    '''
+
+    convert 'monitor_query_terms' into document level monitor queries, where
+    each term value becomes one query (i.e. status:"fail")
+
+    '''
+
+    queries = []
+
+    for field, values in monitor_query_terms.items():
+        if field == 'boost':
+            continue
+
+        for value in values if isinstance(values, list) else [values]:
+            name = '{}_{}'.format(field, value).replace(' ', '_')
+            queries.append({
+                'id': name,
+                'name': name,
+                'query': '{}:"{}"'.format(field, value),
+                'tags': [field]
+            })
+
+    return queries
+
+
+def build_rollup_dimensions(
+    timestamp_field='timestamp',
+    interval='1h',
+    terms=[],
+    timezone='UTC'
+):
+    '''
+
+    build rollup dimensions (or transform groups), where documents are
+    bucketed by 'timestamp_field' into 'interval' buckets (i.e. hourly), then
+    by each terms field
+
+    '''
+
+    return [{
+        'date_histogram': {
+            'source_field': timestamp_field,
+            'fixed_interval': interval,
+            'timezone': timezone
+        }
+    }] + [{'terms': {'source_field': x}} for x in terms]
+
+
+def set_rollup_job(
+    endpoint,
+    awsauth,
+    rollup_id,
+    source_index,
+    target_index,
+    timestamp_field='timestamp',
+    interval='1h',
+    terms=[],
+    metrics={},
+    schedule_interval=60,
+    schedule_unit='Minutes',
+    page_size=1000,
+    if_seq_no=None,
+    if_primary_term=None,
+    headers=HEADERS
+):
+    '''
+
+    create or update continuous index rollup job, which summarizes documents of
+    'source_index' into 'target_index'
+
+    @metrics, object with the following structure, where each field is
+        summarized using the specified metrics
+
+        {
+            "latency": ["min", "max", "sum", "avg", "value_count"]
+        }
+
+    @if_seq_no, with if_primary_term, required to update an existing job
+        (see get_rollup_job)
+
+    '''
+
+    if not rollup_id or not source_index or not target_index:
+        print('Error (set_rollup_job): rollup_id, source_index, and target_index must be provided')
+        return False
+
+    path = encode_path(
+        '_plugins/_rollup/jobs/{}'.format(rollup_id),
+        if_seq_no=if_seq_no,
+        if_primary_term=if_primary_term
+    )
+    payload = {
+        'rollup': {
+            'description': '{} summary of {}'.format(interval, source_index),
+            'source_index': source_index,
+            'target_index': target_index,
+            'enabled': True,
+            'continuous': True,
+            'page_size': page_size,
+            'schedule': {
+                'interval': {
+                    'period': schedule_interval,
+                    'unit': schedule_unit,
+                    'start_time': int(time.time() * 1000)
+                }
+            },
+            'dimensions': build_rollup_dimensions(timestamp_field, interval, terms),
+            'metrics': [{
+                'source_field': field,
+                'metrics': [{x: {}} for x in field_metrics]
+            } for field, field_metrics in metrics.items()]
+        }
+    }
+
+    try:
+        r = session.put(
+            '{}/{}'.format(endpoint, path),
+            auth=awsauth,
+            data=dumps(payload),
+            headers=headers
+        )
+
+        if r.ok:
+            print('Notice: {} rollup job configured from {} into {}'.format(
+                rollup_id,
+                source_index,
+                target_index
+            ))
+            return True
+
+        print('Notice (set_rollup_job): on {} returned {}'.format(
+            path,
+            r.status_code
+        ))
+
+    except Exception as e:
+        print('Error (set_rollup_job): {}'.format(e))
+        return False
+
+    return False
+
+
+def set_transform_job(
+    endpoint,
+    awsauth,
+    transform_id,
+    source_index,
+    target_index,
+    timestamp_field='timestamp',
+    interval='1h',
+    terms=[],
+    metrics={},
+    schedule_interval=60,
+    schedule_unit='Minutes',
+    page_size=1000,
+    if_seq_no=None,
+    if_primary_term=None,
+    headers=HEADERS
+):
+    '''
+
+    create or update continuous transform job, which summarizes documents of
+    'source_index' into 'target_index', where each summary is a plain document
+    (i.e. 'avg_latency'), queryable by any visualization
+
+    @metrics, object with the following structure, where each metric becomes
+        the '<metric>_<field>' aggregation
+
+        {
+            "latency": ["min", "max", "sum", "avg", "value_count"]
+        }
+
+    @if_seq_no, with if_primary_term, required to update an existing job
+        (see get_transform_job)
+
+    '''
+
+    if not transform_id or not source_index or not target_index:
+        print('Error (set_transform_job): transform_id, source_index, and target_index must be provided')
+        return False
+
+    path = encode_path(
+        '_plugins/_transform/{}'.format(transform_id),
+        if_seq_no=if_seq_no,
+        if_primary_term=if_primary_term
+    )
+    payload = {
+        'transform': {
+            'description': '{} summary of {}'.format(interval, source_index),
+            'source_index': source_index,
+            'target_index': target_index,
+            'enabled': True,
+            'continuous': True,
+            'page_size': page_size,
+            'data_selection_query': {'match_all': {}},
+            'schedule': {
+                'interval': {
+                    'period': schedule_interval,
+                    'unit': schedule_unit,
+                    'start_time': int(time.time() * 1000)
+                }
+            },
+            'groups': build_rollup_dimensions(timestamp_field, interval, terms),
+            'aggregations': {
+                '{}_{}'.format(x, field): {x: {'field': field}}
+                for field, field_metrics in metrics.items() for x in field_metrics
+            }
+        }
+    }
+
+    try:
+        r = session.put(
+            '{}/{}'.format(endpoint, path),
+            auth=awsauth,
+            data=dumps(payload),
+            headers=headers
+        )
+
+        if r.ok:
+            print('Notice: {} transform job configured from {} into {}'.format(
+                transform_id,
+                source_index,
+                target_index
+            ))
+            return True
+
+        print('Notice (set_transform_job): on {} returned {}'.format(
+            path,
+            r.status_code
+        ))
+
+    except Exception as e:
+        print('Error (set_transform_job): {}'.format(e))
+        return False
+
+    return False
+
+
+def set_monitor(
+    endpoint,
+    awsauth,
+    monitor_name,
+    destination_id=None,
+    monitor_id='',
+    monitor_type='query_level_monitor',
+    indices=[],
+    query_size=0,
+    schedule_interval=5,
+    schedule_unit='MINUTES',
+    post_date_field='timestamp',
+    post_date_from='now-1h',
+    post_date_to='now',
+    post_date_include_lower='true',
+    post_date_include_upper='true',
+    post_date_format='epoch_millis',
+    adjust_pure_negative='true',
+    monitor_query_terms={},
+    aggregations={},
+    doc_level_queries=[],
+    bucket_fields=[],
+    bucket_size=50,
+    buckets_path={'_count': '_count'},
+    trigger_name=None,
+    trigger_severity='1',
+    trigger_condition_source=None,
+    trigger_action_name=None,
+    trigger_action_subject='Monitor Triggered',
+    trigger_action_message='Monitor detected satisfying condition',
+    trigger_action_throttle_enabled='false',
+    dryrun=False,
+    headers=HEADERS
+):
+    '''
+
+    set monitor to run query and check whether results should trigger any alerts
+
+    @monitor_id, if provided update monitor by specified id
+    @monitor_type, one of the following:
+
+        - query_level_monitor: runs the range query over the entire window on
+            every schedule interval
+        - doc_level_monitor: evaluates 'doc_level_queries' only against
+            documents indexed since the previous execution
+        - bucket_level_monitor: groups the range query by 'bucket_fields'
+            using a composite aggregation, then triggers per bucket
+
+    @monitor_query_terms, has an object structure as follows, where 'status' is
+        a field within the cluster index:
+
+        {
+            'status': ['fail'],
+            'boost': 1
+        }
+
+    @doc_level_queries, list of document level queries, as follows. If not
+        provided, queries are generated from 'monitor_query_terms':
+
+        [{
+            'id': 'status_fail',
+            'name': 'status_fail',
+            'query': 'status:"fail"',
+            'tags': ['status']
+        }]
+
+    @aggregations, for a bucket level monitor, sub-aggregations computed per
+        composite bucket (i.e. {'avg_price': {'avg': {'field': 'price'}}})
+    @buckets_path, maps bucket selector variables to bucket metrics, where
+        each variable is available as 'params.<variable>' in the condition
+    @trigger_condition_source, the condition will be applied to the ctx.results,
+        which is a byproduct of the 'monitor_query_terms' (acting as a filter).
+        Defaults depend on 'monitor_type':
+
+        - query_level_monitor: 'ctx.results[0].hits.total.value > 5'
+        - doc_level_monitor: any document level query matched
+        - bucket_level_monitor: 'params._count > 5'
+
+    @dryrun, execute the monitor once without saving it or sending actions,
+        then return {'monitor': payload, 'result': execution results}
+
+    '''
+
+    if monitor_type not in ('query_level_monitor', 'doc_level_monitor', 'bucket_level_monitor'):
+        print('Error (set_monitor): monitor_type ({}) not supported'.format(monitor_type))
+        return False
+
+    if monitor_name and destination_id and indices:
+        suffix = '/{}'.format(monitor_id) if monitor_id else ''
+        path = '_plugins/_alerting/monitors{}'.format(suffix)
+        action = {
+            'name': trigger_action_name if trigger_action_name else monitor_name,
+            'destination_id': destination_id,
+            'message_template': {
+                'source': trigger_action_message
+            },
+            'throttle_enabled': trigger_action_throttle_enabled,
+            'subject_template': {
+                'source': trigger_action_subject
+            }
+        }
+
+        if monitor_type == 'doc_level_monitor':
+            queries = doc_level_queries or build_doc_level_queries(monitor_query_terms)
+
+            if not queries:
+                print('Error (set_monitor): doc_level_queries or monitor_query_terms must be provided')
+                return False
+
+            inputs = [{
+                'doc_level_input': {
+                    'description': monitor_name,
+                    'indices': indices,
+                    'queries': queries
+                }
+            }]
+            triggers = [{
+                'document_level_trigger': {
+                    'name': trigger_name if trigger_name else monitor_name,
+                    'severity': trigger_severity,
+                    'condition': {
+                        'script': {
+                            'source': trigger_condition_source or ' || '.join(
+                                'query[name={}]'.format(x['name']) for x in queries
+                            ),
+                            'lang': 'painless'
+                        }
+                    },
+                    'actions': [action]
+                }
+            }]
+
+        elif monitor_type == 'bucket_level_monitor':
+            if not bucket_fields:
+                print('Error (set_monitor): bucket_fields must be provided')
+                return False
+
+            composite = {
+                'composite_agg': {
+                    'composite': {
+                        'size': bucket_size,
+                        'sources': [{x: {'terms': {'field': x}}} for x in bucket_fields]
+                    }
+                }
+            }
+
+            if aggregations:
+                composite['composite_agg']['aggregations'] = aggregations
+
+            inputs = [{
+                'search': {
+                    'indices': indices,
+                    'query': build_monitor_query(
+                        query_size=query_size,
+                        post_date_field=post_date_field,
+                        post_date_from=post_date_from,
+                        post_date_to=post_date_to,
+                        post_date_include_lower=post_date_include_lower,
+                        post_date_include_upper=post_date_include_upper,
+                        post_date_format=post_date_format,
+                        monitor_query_terms=monitor_query_terms,
+                        aggregations=composite
+                    )
+                }
+            }]
+            triggers = [{
+                'bucket_level_trigger': {
+                    'name': trigger_name if trigger_name else monitor_name,
+                    'severity': trigger_severity,
+                    'condition': {
+                        'buckets_path': buckets_path,
+                        'parent_bucket_path': 'composite_agg',
+                        'script': {
+                            'source': trigger_condition_source or 'params._count > 5',
+                            'lang': 'painless'
+                        }
+                    },
+                    'actions': [action]
+                }
+            }]
+
+        else:
+            inputs = [{
+                'search': {
+                    'indices': indices,
+                    'query': build_monitor_query(
+                        query_size=query_size,
+                        post_date_field=post_date_field,
+                        post_date_from=post_date_from,
+                        post_date_to=post_date_to,
+                        post_date_include_lower=post_date_include_lower,
+                        post_date_include_upper=post_date_include_upper,
+                        post_date_format=post_date_format,
+                        monitor_query_terms=monitor_query_terms,
+                        aggregations=aggregations
+                    )
+                }
+            }]
+            triggers = [{
+                'name': trigger_name if trigger_name else monitor_name,
+                'severity': trigger_severity,
+                'condition': {
+                    'script': {
+                        'source': trigger_condition_source or 'ctx.results[0].hits.total.value > 5',
+                        'lang': 'painless'
+                    }
+                },
+                'actions': [action]
+            }]
+
+        payload = {
+            'type': 'monitor',
+            'name': monitor_name,
+            'monitor_type': monitor_type,
+            'enabled': 'true',
+            'schedule': {
+                'period': {
+                    'interval': schedule_interval,
+                    'unit': schedule_unit
+                }
+            },
+            'inputs': inputs,
+            'triggers': triggers
+        }
+
+    else:
+        monitor_name and destination_id and indices
+        print('Error (set_monitor): {}, {}, and {} must be provided'.format(
+            'monitor_name ({})'.format(monitor_name),
+            'destination_id ({})'.format(destination_id),
+            'indices ({})'.format(indices)
+        ))
+        return False
+
+    if dryrun:
+        path = '_plugins/_alerting/monitors/_execute?dryrun=true'
+
+        try:
+            r = session.post(
+                '{}/{}'.format(endpoint, path),
+                auth=awsauth,
+                data=dumps(payload),
+                headers=headers
+            )
+
+            if r.ok:
+                return {'monitor': payload, 'result': loads(r.content)}
+
+            print('Notice (set_monitor): on {} returned {}'.format(
+                path,
+                r.status_code
+            ))
+
+        except Exception as e:
+            print('Error (set_monitor): {}'.format(e))
+
+        return None
+
+    try:
+        if monitor_id:
+            r = session.put(
+                '{}/{}'.format(endpoint, path),
+                auth=awsauth,
+                data=dumps(payload),
+                headers=headers
+            )
+
+        else:
+            r = session.post(
+                '{}/{}'.format(endpoint, path),
+                auth=awsauth,
+                data=dumps(payload),
+                headers=headers
+            )
+
+        if r.ok:
+            print('Notice: monitor {}'.format(
+                '{} updated'.format(monitor_id) if monitor_id else 'created'
+            ))
+            return True
+
+        print('Notice (set_monitor): on {} returned {}'.format(
+            path,
+            r.status_code
+        ))
+
+    except Exception as e:
+        print('Error (set_monitor): {}'.format(e))
+        return None
+
+    return False
+
+
+def set_saved_objects(
+    endpoint,
+    awsauth,
+    objects=[],
+    overwrite=False,
+    headers=DASHBOARD_HEADERS
+):
+    '''
+
+    create multiple dashboards saved objects in a single request
+
+    @objects, list of saved objects, as follows:
+
+        [{
+            'type': 'index-pattern',
+            'id': 'logs',
+            'attributes': {'title': 'logs-*', 'timeFieldName': 'timestamp'}
+        }, {
+            'type': 'dashboard',
+            'id': 'logs',
+            'attributes': {'title': 'logs'}
+        }]
+
+    @overwrite, replace existing saved objects, otherwise existing saved
+        objects are reported as conflicts and left unchanged
+
+    '''
+
+    if objects:
+        path = '_dashboards/api/saved_objects/_bulk_create{}'.format(
+            '?overwrite=true' if overwrite else ''
+        )
+
+    else:
+        print('Error (set_saved_objects): objects not provided')
+        return False
+
+    try:
+        r = session.post(
+            '{}/{}'.format(endpoint, path),
+            auth=awsauth,
+            data=dumps(objects),
+            headers=headers
+        )
+
+        if r.ok:
+            errors = [x for x in loads(r.content).get('saved_objects', []) if 'error' in x]
+            conflicts = [x for x in errors if x['error'].get('statusCode') == 409]
+
+            if conflicts:
+                print('Notice (set_saved_objects): {} already exist'.format(
+                    ['{}/{}'.format(x['type'], x['id']) for x in conflicts]
+                ))
+
+            if len(errors) > len(conflicts):
+                print('Error (set_saved_objects): {}'.format(
+                    [x for x in errors if x not in conflicts]
+                ))
+                return False
+
+            print('Notice: {} saved objects configured'.format(len(objects) - len(errors)))
+            return True
+
+        print('Notice (set_saved_objects): on {} returned {}'.format(
+            path,
+            r.status_code
+        ))
+
+    except Exception as e:
+        print('Error (set_saved_objects): {}'.format(e))
+        return False
+
+    return False
+
+
+def set_saved_objects_import(
+    endpoint,
+    awsauth,
+    file_path,
+    overwrite=True,
+    create_new_copies=False,
+    headers=DASHBOARD_HEADERS
+):
+    '''
+
+    import dashboards saved objects from an ndjson file (i.e. created by
+    get_saved_objects_export), including references, in a single request
+
+    @overwrite, replace saved objects with conflicting ids
+    @create_new_copies, import saved objects with regenerated ids, which avoids
+        conflicts altogether (mutually exclusive with overwrite)
+
+    '''
+
+    if not file_path:
+        print('Error (set_saved_objects_import): file_path not provided')
+        return False
+
+    if create_new_copies:
+        path = '_dashboards/api/saved_objects/_import?createNewCopies=true'
+
+    else:
+        path = '_dashboards/api/saved_objects/_import{}'.format(
+            '?overwrite=true' if overwrite else ''
+        )
+
+    #
+    # multipart content-type (including boundary) is generated by requests
+    #
+    headers = {k: v for k, v in headers.items() if k.lower() != 'content-type'}
+
+    try:
+        with open(file_path, 'rb') as f:
+            r = session.post(
+                '{}/{}'.format(endpoint, path),
+                auth=awsauth,
+                files={'file': (os.path.basename(file_path), f, 'application/ndjson')},
+                headers=headers
+            )
+
+        if r.ok:
+            result = loads(r.content)
+
+            if result.get('success'):
+                print('Notice: {} saved objects imported'.format(result.get('successCount')))
+                return True
+
+            print('Error (set_saved_objects_import): {}'.format(result.get('errors')))
+            return False
+
+        print('Notice (set_saved_objects_import): on {} returned {}'.format(
+            path,
+            r.status_code
+        ))
+
+    except Exception as e:
+        print('Error (set_saved_objects_import): {}'.format(e))
+        return False
 
     return False
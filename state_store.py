@@ -0,0 +1,98 @@
+import os
+import json
+from codec import HEADERS
+from get_configuration import get_document
+from set_configuration import set_document
+from delete_configuration import delete_document_id
+
+
+class ClusterStateStore:
+    '''
+
+    persist job state as documents within an opensearch index, so long-running
+    jobs (i.e. remap_index_job) can resume across lambda invocations
+
+    @state_index, index storing one document per job key
+
+    '''
+
+    def __init__(
+        self,
+        endpoint,
+        awsauth,
+        state_index='opensearch_customization_state',
+        headers=HEADERS
+    ):
+        self.endpoint = endpoint
+        self.awsauth = awsauth
+        self.state_index = state_index
+        self.headers = headers
+
+    def get(self, key):
+        r = get_document(self.endpoint, self.awsauth, self.state_index, key, headers=self.headers)
+
+        if r and r.get('found'):
+            return r['_source']
+
+        return None
+
+    def set(self, key, state):
+        return set_document(
+            self.endpoint,
+            self.awsauth,
+            self.state_index,
+            state,
+            document_id=key,
+            refresh=True,
+            headers=self.headers
+        )
+
+    def delete(self, key):
+        return delete_document_id(
+            self.endpoint,
+            self.awsauth,
+            self.state_index,
+            key,
+            refresh=True,
+            headers=self.headers
+        )
+
+
+class FileStateStore:
+    '''
+
+    persist job state within a local json file, intended for tests, or local
+    execution outside lambda
+
+    '''
+
+    def __init__(self, file_path):
+        self.file_path = file_path
+
+    def load(self):
+        if not os.path.exists(self.file_path):
+            return {}
+
+        with open(self.file_path) as f:
+            return json.load(f)
+
+    def get(self, key):
+        return self.load().get(key)
+
+    def set(self, key, state):
+        states = self.load()
+        states[key] = state
+
+        with open(self.file_path, 'w') as f:
+            json.dump(states, f, indent=4)
+
+        return True
+
+    def delete(self, key):
+        states = self.load()
+        states.pop(key, None)
+
+        with open(self.file_path, 'w') as f:
+            json.dump(states, f, indent=4)
+
+        return True
@@ -0,0 +1,57 @@
+import os
+import sys
+import json
+import importlib
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+#
+# replayed requests are not verified, but signing requires credentials
+#
+os.environ.setdefault('AWS_ACCESS_KEY_ID', 'replay')
+os.environ.setdefault('AWS_SECRET_ACCESS_KEY', 'replay')
+os.environ.setdefault('TracingEnabled', 'false')
+
+from transport import set_replay, set_default
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+
+@pytest.fixture
+def replay():
+    adapter = set_replay(os.path.join(FIXTURES, 'create_replay.json'), latency_scale=0)
+    yield adapter
+    set_default()
+
+
+def test_create(replay):
+    '''
+
+    replay a Create (remap of a new index, and document deletion, each within
+    its own lease) without network access, where the lease owner is fixed so
+    the recorded lease is released
+
+    '''
+
+    with open(os.path.join(FIXTURES, 'create_event.json')) as f:
+        event = json.load(f)
+
+    event['LockOwner'] = 'replay'
+    handler = importlib.import_module('lambda').lambda_handler
+
+    assert handler(event, None) is True
+    assert replay.misses == 0
+    assert [(x['method'], x['path'].split('?')[0]) for x in replay.served] == [
+        ('PUT', '/opensearch_customization_lock/_doc/logs'),
+        ('POST', '/logs/_count'),
+        ('POST', '/logs/_refresh'),
+        ('POST', '/logs/_count'),
+        ('PUT', '/logs'),
+        ('GET', '/opensearch_customization_lock/_doc/logs'),
+        ('DELETE', '/opensearch_customization_lock/_doc/logs'),
+        ('PUT', '/opensearch_customization_lock/_doc/logs'),
+        ('POST', '/logs/_delete_by_query'),
+        ('GET', '/opensearch_customization_lock/_doc/logs'),
+        ('DELETE', '/opensearch_customization_lock/_doc/logs')
+    ]
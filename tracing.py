@@ -0,0 +1,108 @@
+import traceback
+from contextlib import contextmanager
+
+#
+# x-ray recorder: None unless tracing is enabled, and aws_xray_sdk available,
+#     so every function below is a no-op otherwise
+#
+recorder = None
+
+
+def set_tracing(enabled=True):
+    '''
+
+    enable x-ray tracing, where requests are patched once, so every request
+    is recorded as a generic http subsegment within the current step
+
+    '''
+
+    global recorder
+
+    if not enabled:
+        recorder = None
+        return False
+
+    if recorder:
+        return True
+
+    try:
+        from aws_xray_sdk.core import xray_recorder
+        from aws_xray_sdk.core import patch_all
+
+    except ImportError:
+        print('Notice (set_tracing): aws_xray_sdk not available, tracing disabled')
+        return False
+
+    patch_all()
+    recorder = xray_recorder
+
+    return True
+
+
+def get_subsegment(name=None):
+    '''
+
+    begin named subsegment, or get the current subsegment, where None is
+    returned outside a traced lambda invocation (i.e. command line)
+
+    '''
+
+    try:
+        return recorder.begin_subsegment(name) if name else recorder.current_subsegment()
+
+    except Exception:
+        return None
+
+
+@contextmanager
+def trace(name, executions=None, **annotations):
+    '''
+
+    record the enclosed step as a named subsegment
+
+    @executions, list of step results (i.e. {'set_dashboard': True}), where
+        the 'result' annotation is True if every result appended within the
+        step succeeded
+    @annotations, indexed annotations (i.e. index, endpoint)
+
+    '''
+
+    subsegment = get_subsegment(name) if recorder else None
+
+    if not subsegment:
+        yield None
+        return
+
+    start = len(executions) if executions is not None else 0
+
+    try:
+        for k, v in annotations.items():
+            if v is not None:
+                subsegment.put_annotation(k, v)
+
+        yield subsegment
+
+    except Exception as e:
+        subsegment.add_exception(e, traceback.extract_stack())
+        raise
+
+    finally:
+        if executions is not None and len(executions) > start:
+            subsegment.put_annotation('result', all(
+                list(x.values())[0] for x in executions[start:]
+            ))
+
+        recorder.end_subsegment()
+
+
+def put_metadata(key, value):
+    '''
+
+    attach metadata (i.e. document counts, task id) to the current subsegment
+
+    '''
+
+    subsegment = get_subsegment() if recorder else None
+
+    if subsegment:
+        subsegment.put_metadata(key, value)
@@ -0,0 +1,504 @@
+import os
+import time
+import json
+import threading
+import requests
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+#
+# administrative apis, limited as the 'admin' operation class
+#
+ADMIN_APIS = (
+    '_cat',
+    '_cluster',
+    '_nodes',
+    '_tasks',
+    '_settings',
+    '_reindex',
+    '_forcemerge',
+    '_shrink',
+    '_refresh',
+    '_index_template',
+    '_component_template',
+    '_snapshot'
+)
+
+#
+# read apis sent as POST (i.e. search with a request body)
+#
+READ_APIS = (
+    '_search',
+    '_count',
+    '_mget',
+    '_msearch',
+    '_bulk_get',
+    '_field_caps',
+    '_async_search',
+    '_resolve'
+)
+
+
+def get_operation(method, path):
+    '''
+
+    classify request into an operation class: 'admin', 'read', or 'write'
+
+    '''
+
+    segments = path.strip('/').split('/')
+
+    if any(x in ADMIN_APIS for x in segments):
+        return 'admin'
+
+    if method in ('GET', 'HEAD') or any(x in READ_APIS for x in segments):
+        return 'read'
+
+    return 'write'
+
+
+class TokenBucket:
+    '''
+
+    token bucket refilled at 'rate' tokens per second, up to 'burst' tokens
+
+    '''
+
+    def __init__(self, rate, burst=None):
+        self.rate = rate
+        self.capacity = burst or max(1, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        '''
+
+        reserve one token, and return the seconds to wait until it is
+        available, so waiting callers are served in order
+
+        '''
+
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+
+            return -self.tokens / self.rate if self.tokens < 0 else 0
+
+
+class RateLimiter:
+    '''
+
+    limit requests per endpoint, and operation class, using a token bucket
+    and a concurrency cap, where the time spent waiting is recorded
+
+    @limits, object with the following structure, where operation classes
+        without a limit are not limited, and an endpoint host overrides the
+        limits of the specified operation classes
+
+        {
+            "read": {"rate": 20, "burst": 40, "concurrency": 8},
+            "write": {"rate": 5, "concurrency": 2},
+            "admin": {"rate": 1, "burst": 2, "concurrency": 1},
+            "search-small-domain.us-east-1.es.amazonaws.com": {
+                "read": {"rate": 5, "concurrency": 2}
+            }
+        }
+
+    '''
+
+    def __init__(self, limits=None):
+        self.set_limits(limits)
+
+    def set_limits(self, limits=None):
+        self.limits = limits or {}
+        self.buckets = {}
+        self.semaphores = {}
+        self.metrics = {}
+        self.lock = threading.Lock()
+
+    def get_limit(self, host, operation):
+        return self.limits.get(host, {}).get(operation) or self.limits.get(operation)
+
+    @contextmanager
+    def limit(self, host, operation):
+        limit = self.get_limit(host, operation)
+
+        if not limit:
+            yield
+            return
+
+        key = '{}/{}'.format(host, operation)
+
+        with self.lock:
+            if key not in self.buckets:
+                self.buckets[key] = TokenBucket(limit['rate'], limit.get('burst')) if limit.get('rate') else None
+                self.semaphores[key] = threading.BoundedSemaphore(limit['concurrency']) if limit.get('concurrency') else None
+                self.metrics[key] = {'requests': 0, 'wait': 0.0, 'max_wait': 0.0}
+
+            bucket = self.buckets[key]
+            semaphore = self.semaphores[key]
+            metrics = self.metrics[key]
+
+        start = time.perf_counter()
+
+        if bucket:
+            time.sleep(bucket.acquire())
+
+        if semaphore:
+            semaphore.acquire()
+
+        wait = time.perf_counter() - start
+
+        with self.lock:
+            metrics['requests'] += 1
+            metrics['wait'] += wait
+            metrics['max_wait'] = max(metrics['max_wait'], wait)
+
+        try:
+            yield
+
+        finally:
+            if semaphore:
+                semaphore.release()
+
+    def get_metrics(self):
+        '''
+
+        queue wait per endpoint, and operation class (seconds)
+
+        '''
+
+        with self.lock:
+            return {k: dict(v) for k, v in self.metrics.items()}
+
+
+class LimitedSession(requests.Session):
+    '''
+
+    session sending every request through the rate limiter, independent of
+    the mounted adapter (i.e. recording, or replay)
+
+    '''
+
+    def __init__(self, limiter):
+        super().__init__()
+        self.limiter = limiter
+        self.local = threading.local()
+
+    def send(self, request, **kwargs):
+        #
+        # redirects are sent within the limited request, so are not limited
+        #     again, which would exceed the concurrency cap
+        #
+        if getattr(self.local, 'limited', False):
+            return super().send(request, **kwargs)
+
+        parts = urlsplit(request.url)
+
+        with self.limiter.limit(parts.netloc, get_operation(request.method, parts.path)):
+            self.local.limited = True
+
+            try:
+                return super().send(request, **kwargs)
+
+            finally:
+                self.local.limited = False
+
+
+#
+# shared session: every helper request is sent through this session, so
+#     connections are reused, requests are rate limited (see RateLimits),
+#     and adapters can be mounted (i.e. replay)
+#
+limiter = RateLimiter(json.loads(os.getenv('RateLimits', '{}').strip() or '{}'))
+session = LimitedSession(limiter)
+
+#
+# sigv4, and session headers removed from recorded fixtures
+#
+SENSITIVE_HEADERS = (
+    'authorization',
+    'x-amz-date',
+    'x-amz-security-token',
+    'x-amz-content-sha256',
+    'cookie',
+    'set-cookie'
+)
+
+#
+# credential fields redacted from recorded request bodies (i.e. the
+#     source.remote username, and password of a remote _reindex)
+#
+SENSITIVE_FIELDS = (
+    'username',
+    'password',
+    'authorization',
+    'access_key',
+    'secret_key',
+    'session_token',
+    'api_key',
+    'token'
+)
+REDACTED = '********'
+
+
+def get_path(url):
+    '''
+
+    request path including query, without scheme and host, so fixtures
+    recorded against one endpoint can be replayed against any endpoint
+
+    '''
+
+    parts = urlsplit(url)
+
+    return '{}{}'.format(parts.path, '?{}'.format(parts.query) if parts.query else '')
+
+
+def get_headers(headers):
+    return {k: v for k, v in headers.items() if k.lower() not in SENSITIVE_HEADERS}
+
+
+def get_body(body):
+    if body is None:
+        return None
+
+    if isinstance(body, bytes):
+        return body.decode('utf-8', errors='replace')
+
+    return body if isinstance(body, str) else None
+
+
+def get_redacted(body):
+    '''
+
+    redact credential fields (see SENSITIVE_FIELDS) at any depth of a json
+    body, where other bodies (i.e. ndjson) are returned unchanged
+
+    '''
+
+    def redact(x):
+        if isinstance(x, dict):
+            return {k: REDACTED if k.lower() in SENSITIVE_FIELDS else redact(v) for k, v in x.items()}
+
+        if isinstance(x, list):
+            return [redact(y) for y in x]
+
+        return x
+
+    try:
+        payload = json.loads(body)
+
+    except (TypeError, ValueError):
+        return body
+
+    redacted = redact(payload)
+
+    return json.dumps(redacted) if redacted != payload else body
+
+
+class RecordingAdapter(HTTPAdapter):
+    '''
+
+    send requests over http, capturing every request and response, where
+    sigv4 headers are removed (see SENSITIVE_HEADERS), and credential body
+    fields are redacted (see SENSITIVE_FIELDS), so replay matches such
+    requests by method, and path
+
+    '''
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.records = []
+        self.lock = threading.Lock()
+
+    def send(self, request, **kwargs):
+        start = time.perf_counter()
+        response = super().send(request, **kwargs)
+        content = response.content
+
+        with self.lock:
+            self.records.append({
+                'method': request.method,
+                'path': get_path(request.url),
+                'headers': get_headers(request.headers),
+                'body': get_redacted(get_body(request.body)),
+                'status': response.status_code,
+                'reason': response.reason,
+                'response_headers': get_headers(response.headers),
+                'content': content.decode('utf-8', errors='replace'),
+                'elapsed': time.perf_counter() - start
+            })
+
+        return response
+
+
+class ReplayAdapter(BaseAdapter):
+    '''
+
+    serve recorded responses without network access, matching requests by
+    method, path, and body (or method, and path if the body differs), where
+    repeated requests (i.e. task long-polls) are served in recorded order
+
+    @latency_scale, sleep the recorded latency multiplied by specified scale,
+        where 0 replays without latency
+
+    '''
+
+    def __init__(self, records, latency_scale=1.0):
+        super().__init__()
+        self.latency_scale = latency_scale
+        self.records = list(records)
+        self.served = []
+        self.requests = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def get_record(self, method, path, body):
+        for match in (
+            lambda x: x['method'] == method and x['path'] == path and x['body'] == body,
+            lambda x: x['method'] == method and x['path'] == path
+        ):
+            record = next((x for x in self.records if match(x)), None)
+
+            if record:
+                #
+                # last matching record is kept, so extra polls reuse it
+                #
+                if len([x for x in self.records if match(x)]) > 1:
+                    self.records.remove(record)
+
+                return record
+
+        return None
+
+    def send(self, request, **kwargs):
+        path = get_path(request.url)
+
+        with self.lock:
+            self.requests += 1
+            record = self.get_record(request.method, path, get_body(request.body))
+
+            if record:
+                self.served.append(record)
+
+            else:
+                self.misses += 1
+                print('Notice (ReplayAdapter): no recorded response for {} {}'.format(
+                    request.method,
+                    path
+                ))
+
+        if record and self.latency_scale:
+            time.sleep(record['elapsed'] * self.latency_scale)
+
+        response = requests.Response()
+        response.status_code = record['status'] if record else 404
+        response.reason = record.get('reason', '') if record else 'Not Recorded'
+        response.headers = CaseInsensitiveDict(record['response_headers'] if record else {})
+        response._content = record['content'].encode('utf-8') if record else b'{}'
+        response.url = request.url
+        response.request = request
+        response.encoding = 'utf-8'
+
+        return response
+
+    def close(self):
+        pass
+
+
+def set_recording(**kwargs):
+    '''
+
+    record every request sent through the shared session
+
+    '''
+
+    adapter = RecordingAdapter(**kwargs)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+
+    return adapter
+
+
+def set_replay(file_path, latency_scale=1.0):
+    '''
+
+    replay requests sent through the shared session from fixture file
+
+    '''
+
+    with open(file_path) as f:
+        adapter = ReplayAdapter(json.load(f), latency_scale=latency_scale)
+
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+
+    return adapter
+
+
+def set_fixture(adapter, file_path):
+    '''
+
+    store requests captured by recording adapter as fixture file
+
+    '''
+
+    with open(file_path, 'w') as f:
+        json.dump(adapter.records, f, indent=4)
+
+    return len(adapter.records)
+
+
+def set_default():
+    '''
+
+    restore network transport on the shared session
+
+    '''
+
+    session.mount('http://', HTTPAdapter())
+    session.mount('https://', HTTPAdapter())
+
+
+def set_rate_limits(limits=None):
+    '''
+
+    replace rate limits on the shared session (see RateLimiter), where
+    unchanged limits keep the current buckets, and metrics (i.e. concurrent
+    invocations configured with the same limits)
+
+    '''
+
+    if (limits or {}) != limiter.limits:
+        limiter.set_limits(limits)
+
+    return limiter
+
+
+def get_rate_metrics(since=None):
+    '''
+
+    queue wait per endpoint, and operation class (see RateLimiter)
+
+    @since, metrics returned by an earlier call (i.e. at the start of an
+        invocation), where only the requests, and wait accrued since are
+        returned, since the shared limiter outlives an invocation (i.e. warm
+        lambda containers), and 'max_wait' is not reported
+
+    '''
+
+    metrics = limiter.get_metrics()
+
+    if since is None:
+        return metrics
+
+    return {k: {
+        'requests': v['requests'] - since.get(k, {}).get('requests', 0),
+        'wait': v['wait'] - since.get(k, {}).get('wait', 0.0)
+    } for k, v in metrics.items() if v['requests'] > since.get(k, {}).get('requests', 0)}